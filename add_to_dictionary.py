@@ -1,9 +1,11 @@
 import sys
 
+from dictionary import get_file_digest, update_cache
+
 DICTIONARY_FILE = "dictionary.txt"
 
 
-def add_word_to_dictionary(new_word: str) -> None:
+def add_word_to_dictionary(new_word: str, filename: str = DICTIONARY_FILE) -> None:
     if not new_word.isalpha():
         print("Word must contain only letters")
         sys.exit(1)
@@ -11,7 +13,7 @@ def add_word_to_dictionary(new_word: str) -> None:
     word: str = new_word.upper()
 
     try:
-        with open(DICTIONARY_FILE, "r") as f:
+        with open(filename, "r") as f:
             words = set(f.read().splitlines())
     except FileNotFoundError:
         raise FileNotFoundError("Dictionary file not found. Please create a dictionary.txt file.")
@@ -20,12 +22,16 @@ def add_word_to_dictionary(new_word: str) -> None:
         print(f"'{word}' is already in the dictionary.")
         return
 
+    previous_digest = get_file_digest(filename)
+
     words.add(word)
     sorted_words = sorted(words)
 
-    with open(DICTIONARY_FILE, "w") as f:
+    with open(filename, "w") as f:
         f.write("\n".join(sorted_words))
 
+    update_cache(filename, previous_digest, [word])
+
     print(f"Added '{word}' to the dictionary.")
 
 
@@ -0,0 +1,129 @@
+from typing import List, Optional, cast
+
+import numpy as np
+import numpy.typing as npt
+
+from board import Board
+from cell import Cell, Multiplier
+from tile import Tile
+from word import Word
+
+MULTIPLIERS: List[Optional[Multiplier]] = [None] + [Multiplier(value) for value in range(1, len(Multiplier) + 1)]
+
+
+class ArrayBoard(Board):
+    """Board stored as fixed-size arrays instead of a grid of Cell objects.
+
+    Letter codes (0 for an empty cell), tile scores, multiplier codes and occupancy live in
+    NumPy arrays. The cells touching a tile are derived from occupancy when the board is built
+    and updated per placed tile, so neighbour and emptiness checks are a single lookup. Clones
+    share all of this until one of them places a word (copy on write), which makes cloning
+    free. get_cell still returns Cell objects: views built from the arrays, replaced by the
+    placed cells as words are added.
+    """
+
+    @classmethod
+    def from_board(cls, board: Board) -> "ArrayBoard":
+        return cls(board.cells)
+
+    @property
+    def cells(self) -> List[List[Cell]]:
+        return [list(row) for row in self.views]
+
+    @cells.setter
+    def cells(self, cells: List[List[Cell]]) -> None:
+        if not cells:
+            raise ValueError("Board is empty")
+        for r, row in enumerate(cells):
+            if len(row) != len(cells[0]):
+                raise ValueError(f"Row {r} has incorrect length")
+
+        shape = (len(cells), len(cells[0]))
+        self.letters: npt.NDArray[np.uint32] = np.zeros(shape, dtype=np.uint32)
+        self.scores: npt.NDArray[np.int16] = np.zeros(shape, dtype=np.int16)
+        self.multipliers: npt.NDArray[np.uint8] = np.zeros(shape, dtype=np.uint8)
+        for r, row in enumerate(cells):
+            for c, cell in enumerate(row):
+                self.set_cell(r, c, cell)
+
+        self.views = [[self.make_cell(r, c) for c in range(shape[1])] for r in range(shape[0])]
+        self.shared = False
+        self.update_occupancy()
+
+    def set_cell(self, row: int, col: int, cell: Cell) -> None:
+        self.letters[row, col] = ord(cell.tile.letter) if cell.tile else 0
+        self.scores[row, col] = cell.tile.score if cell.tile else 0
+        self.multipliers[row, col] = cell.multiplier.value if cell.multiplier else 0
+
+    def update_occupancy(self) -> None:
+        self.occupied: npt.NDArray[np.bool_] = self.letters != 0
+
+        touching = self.occupied.copy()
+        touching[1:, :] |= self.occupied[:-1, :]
+        touching[:-1, :] |= self.occupied[1:, :]
+        touching[:, 1:] |= self.occupied[:, :-1]
+        touching[:, :-1] |= self.occupied[:, 1:]
+        self.touching = cast(List[List[bool]], touching.tolist())
+        self.empty = not self.occupied.any()
+
+    def validate_board(self) -> None:
+        if self.letters.size == 0:
+            raise ValueError("Board is empty")
+
+    def make_cell(self, row: int, col: int) -> Cell:
+        letter = int(self.letters[row, col])
+        tile = Tile(chr(letter), int(self.scores[row, col])) if letter else None
+        return Cell(row, col, tile, MULTIPLIERS[int(self.multipliers[row, col])])
+
+    def get_cell(self, row: int, col: int) -> Cell:
+        return self.views[row][col]
+
+    def get_row(self, row: int) -> List[Cell]:
+        return self.views[row]
+
+    def get_col(self, col: int) -> List[Cell]:
+        return [row[col] for row in self.views]
+
+    def is_board_empty(self) -> bool:
+        return self.empty
+
+    def cell_touches_tile(self, row: int, col: int) -> bool:
+        return self.touching[row][col]
+
+    def add_word(self, word: Word) -> None:
+        if not self.word_is_placable(word):
+            raise ValueError("Word is not placable")
+
+        if self.shared:
+            self.letters = self.letters.copy()
+            self.scores = self.scores.copy()
+            self.multipliers = self.multipliers.copy()
+            self.occupied = self.occupied.copy()
+            self.views = [list(row) for row in self.views]
+            self.touching = [list(row) for row in self.touching]
+            self.shared = False
+
+        placed = [cell for cell in word.cells if not self.occupied[cell.row, cell.col]]
+        for cell in placed:
+            self.set_cell(cell.row, cell.col, cell)
+            self.views[cell.row][cell.col] = cell
+            self.occupied[cell.row, cell.col] = True
+            for row, col in ((cell.row, cell.col), (cell.row - 1, cell.col), (cell.row + 1, cell.col)):
+                if 0 <= row < self.rows:
+                    self.touching[row][col] = True
+            for col in (cell.col - 1, cell.col + 1):
+                if 0 <= col < self.cols:
+                    self.touching[cell.row][col] = True
+        self.empty = False
+        self.record_placed(placed)
+
+    def clone(self) -> "ArrayBoard":
+        """Returns a board sharing this one's arrays and derived data; whichever places a word first copies them.
+
+        The attributes are copied directly rather than with copy.copy, which would go through
+        __getstate__ and drop the cross-checks.
+        """
+        board = object.__new__(type(self))
+        board.__dict__.update(self.__dict__)
+        self.shared = board.shared = True
+        return board
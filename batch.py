@@ -0,0 +1,149 @@
+import json
+import logging
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Deque, Dict, List, Optional, Set
+from parser import OcrBackend, Parser
+
+from array_board import ArrayBoard
+from board import Board
+from dictionary import Dictionary
+from game import Game, GenerationMode, moves_to_json
+from parallel_solver import create_executor, get_worker_dictionary, get_worker_line_moves
+from rack import Rack
+from tile_cache import TileCache
+
+SCREENSHOT_FILE = "screenshot.png"
+BOARD_FILE = "board.json"
+RACK_FILE = "rack.json"
+MOVES_FILE = "moves.json"
+MOVES_TO_SAVE = 10
+QUEUE_SIZE = 8
+
+
+def parse_screenshot(
+    screenshot_path: str,
+    model: Optional[str] = None,
+    ocr_backend: OcrBackend = OcrBackend.PYTESSERACT,
+    tile_cache_path: Optional[str] = None,
+    montage_ocr: bool = False,
+    reparse: bool = False,
+) -> None:
+    tile_cache = TileCache(tile_cache_path) if tile_cache_path is not None else None
+    try:
+        parser = Parser(ocr_backend, tile_cache=tile_cache, montage_ocr=montage_ocr)
+        board, rack = parser.parse_screenshot(os.path.join(screenshot_path, SCREENSHOT_FILE), model, reparse)
+    finally:
+        if tile_cache is not None:
+            tile_cache.close()
+    board.save_board_to_file(os.path.join(screenshot_path, BOARD_FILE))
+    rack.save_rack_to_file(os.path.join(screenshot_path, RACK_FILE))
+
+
+def solve_screenshot(
+    screenshot_path: str, mode: GenerationMode = GenerationMode.PATTERN, array_board: bool = False
+) -> int:
+    """Solves a parsed screenshot in a worker and writes its best moves next to it, returning the number saved."""
+    board_path = os.path.join(screenshot_path, BOARD_FILE)
+    board = ArrayBoard.load_board_from_file(board_path) if array_board else Board.load_board_from_file(board_path)
+    rack = Rack.load_rack_from_file(os.path.join(screenshot_path, RACK_FILE))
+
+    game = Game(get_worker_dictionary(), board, rack, mode, get_worker_line_moves())
+    game.validate_board()
+    moves = game.top_k(MOVES_TO_SAVE)
+
+    with open(os.path.join(screenshot_path, MOVES_FILE), "w") as file:
+        json.dump(moves_to_json(moves), file, indent=2)
+    return len(moves)
+
+
+def process_batch(
+    screenshot_dir: str,
+    dictionary: Dictionary,
+    screenshot_names: Optional[List[str]] = None,
+    model: Optional[str] = None,
+    reparse: bool = False,
+    mode: GenerationMode = GenerationMode.PATTERN,
+    array_board: bool = False,
+    ocr_workers: int = 1,
+    ocr_backend: OcrBackend = OcrBackend.PYTESSERACT,
+    tile_cache_path: Optional[str] = None,
+    montage_ocr: bool = False,
+    solve_workers: int = 1,
+    queue_size: int = QUEUE_SIZE,
+) -> Dict[str, bool]:
+    """Parses and solves many screenshots as a pipeline, returning whether each one was solved.
+
+    Screenshots are parsed on one process pool and solved on another, so OCR of the next
+    screenshots overlaps with solving the previous ones. Each stage holds at most queue_size
+    screenshots, including parsed ones waiting to be solved, so parsing never runs far ahead
+    of solving. Each screenshot's moves are written to its directory as soon as it is solved.
+    """
+    if screenshot_names is None:
+        screenshot_names = sorted(
+            name for name in os.listdir(screenshot_dir) if os.path.isdir(os.path.join(screenshot_dir, name))
+        )
+
+    to_parse: Deque[str] = deque()
+    to_solve: Deque[str] = deque()
+    for screenshot_name in screenshot_names:
+        screenshot_path = os.path.join(screenshot_dir, screenshot_name)
+        parsed = all(os.path.exists(os.path.join(screenshot_path, name)) for name in (BOARD_FILE, RACK_FILE))
+        if parsed and not reparse:
+            to_solve.append(screenshot_name)
+        else:
+            to_parse.append(screenshot_name)
+
+    results: Dict[str, bool] = {}
+    parsing: Set["Future[Any]"] = set()
+    solving: Set["Future[Any]"] = set()
+    names: Dict["Future[Any]", str] = {}
+
+    with ProcessPoolExecutor(ocr_workers) as ocr_executor, create_executor(dictionary, solve_workers) as solve_executor:
+        while to_parse or parsing or to_solve or solving:
+            while to_parse and len(parsing) + len(to_solve) < queue_size:
+                screenshot_name = to_parse.popleft()
+                logging.info(f"Parsing screenshot: {screenshot_name}")
+                parse_future = ocr_executor.submit(
+                    parse_screenshot,
+                    os.path.join(screenshot_dir, screenshot_name),
+                    model,
+                    ocr_backend,
+                    tile_cache_path,
+                    montage_ocr,
+                    reparse,
+                )
+                parsing.add(parse_future)
+                names[parse_future] = screenshot_name
+
+            while to_solve and len(solving) < queue_size:
+                screenshot_name = to_solve.popleft()
+                logging.info(f"Solving screenshot: {screenshot_name}")
+                solve_future = solve_executor.submit(
+                    solve_screenshot, os.path.join(screenshot_dir, screenshot_name), mode, array_board
+                )
+                solving.add(solve_future)
+                names[solve_future] = screenshot_name
+
+            done, _ = wait(parsing | solving, return_when=FIRST_COMPLETED)
+            for future in done:
+                screenshot_name = names.pop(future)
+                parsed = future in parsing
+                parsing.discard(future)
+                solving.discard(future)
+
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logging.error(f"Failed to process screenshot {screenshot_name}: {e}")
+                    results[screenshot_name] = False
+                    continue
+
+                if parsed:
+                    to_solve.append(screenshot_name)
+                else:
+                    logging.info(f"Solved screenshot {screenshot_name}: {result} moves")
+                    results[screenshot_name] = True
+
+    return results
@@ -0,0 +1,32 @@
+import logging
+import sys
+import time
+from parser import Parser
+
+import cv2
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+SCREENSHOT_FILE = "screenshots/example/screenshot.png"
+REPEATS = 20
+
+screenshot_path = sys.argv[1] if len(sys.argv) > 1 else SCREENSHOT_FILE
+screenshot = cv2.imread(screenshot_path)
+if screenshot is None:
+    raise ValueError(f"Image not found at {screenshot_path}")
+
+parser = Parser()
+
+start = time.perf_counter()
+for _ in range(REPEATS):
+    board_image, rack_image = parser.crop_board_and_rack_images(screenshot)
+crop_seconds = (time.perf_counter() - start) / REPEATS
+
+start = time.perf_counter()
+for _ in range(REPEATS):
+    board_tiles = parser.crop_tile_images(board_image)
+    rack_tiles = parser.crop_tile_images(rack_image)
+tiles_seconds = (time.perf_counter() - start) / REPEATS
+
+logging.info(f"crop_board_and_rack_images: {crop_seconds * 1000:.2f} ms")
+logging.info(f"crop_tile_images: {tiles_seconds * 1000:.2f} ms ({len(board_tiles)}x{len(board_tiles[0])} board tiles)")
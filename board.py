@@ -1,11 +1,16 @@
 import json
 from enum import Enum
-from typing import Any, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
 
 from cell import Cell, Multiplier
 from tile import Tile
 from word import Word
 
+if TYPE_CHECKING:
+    from cross_checks import CrossChecks
+
+Position = Tuple[int, int]
+
 
 class Direction(Enum):
     HORIZONTAL = 1
@@ -31,6 +36,13 @@ class BoardEncoder(json.JSONEncoder):
 
 
 class Board:
+    """A grid of cells, with data derived from its tiles computed on first use.
+
+    The anchors, board words and cross-checks are cached once read and kept up to date by
+    add_word. Cells may be assigned directly while a board is being set up, but not once any
+    derived data has been read, since the caches would then be stale.
+    """
+
     def __init__(
         self,
         cells: list[list[Cell]],
@@ -40,12 +52,28 @@ class Board:
         self.cols = len(cells[0])
         self.validate_board()
 
+        self.placed: List[Cell] = []
+        self.has_tiles = False
+        self.anchors: Optional[Set[Position]] = None
+        self.words: Optional[List[Word]] = None
+        self.cross_checks: Optional["CrossChecks"] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Leaves the cross-check cache out when pickling, since it refers to the dictionary."""
+        state = self.__dict__.copy()
+        state["cross_checks"] = None
+        return state
+
     @classmethod
     def load_board_from_file(cls, file_path: str) -> "Board":
         """Loads a board from a JSON file using a custom decoder."""
         with open(file_path, "r") as file:
             board_data = json.load(file)
 
+        return cls.from_json(board_data)
+
+    @classmethod
+    def from_json(cls, board_data: Any) -> "Board":
         board = [
             [
                 Cell(
@@ -108,20 +136,90 @@ class Board:
 
     def get_board_words(self) -> List[Word]:
         self.validate_board()
+        if self.words is not None:
+            return list(self.words)
 
         words: List[Word] = []
 
-        for row_idx in range(len(self.cells)):
+        for row_idx in range(self.rows):
             row = self.get_row(row_idx)
             row_words = self.get_words_from_series(row)
             words.extend(row_words)
 
-        for col_idx in range(len(self.cells[0])):
+        for col_idx in range(self.cols):
             col = self.get_col(col_idx)
             col_words = self.get_words_from_series(col)
             words.extend(col_words)
 
-        return words
+        self.words = words
+        return list(words)
+
+    def get_anchors(self) -> Set[Position]:
+        """Returns the empty cells touching a tile, or the centre of an empty board: the cells every move covers."""
+        if self.anchors is None:
+            if self.is_board_empty():
+                self.anchors = {(self.rows // 2, self.cols // 2)}
+            else:
+                self.anchors = {
+                    (row, col)
+                    for row in range(self.rows)
+                    for col in range(self.cols)
+                    if self.get_cell(row, col).tile is None and self.cell_touches_tile(row, col)
+                }
+        return self.anchors
+
+    def get_placed_since(self, version: int) -> List[Cell]:
+        """Returns the cells placed by add_word since the board had version placed cells, oldest first."""
+        return self.placed[version:]
+
+    def record_placed(self, placed: List[Cell]) -> None:
+        """Logs cells just placed by add_word and updates the anchors and words computed so far.
+
+        Derived data is replaced rather than changed in place, so clones sharing it are not affected.
+        Cross-checks catch up from the log when they are next used.
+        """
+        if not placed:
+            return
+        self.placed = self.placed + placed
+        self.has_tiles = True
+
+        if self.anchors is not None:
+            anchors = {
+                (row, col)
+                for row, col in self.anchors
+                if self.get_cell(row, col).tile is None and self.cell_touches_tile(row, col)
+            }
+            for cell in placed:
+                for row, col in ((cell.row - 1, cell.col), (cell.row + 1, cell.col)):
+                    if 0 <= row < self.rows and self.get_cell(row, col).tile is None:
+                        anchors.add((row, col))
+                for row, col in ((cell.row, cell.col - 1), (cell.row, cell.col + 1)):
+                    if 0 <= col < self.cols and self.get_cell(row, col).tile is None:
+                        anchors.add((row, col))
+            self.anchors = anchors
+
+        if self.words is not None:
+            new_words = self.get_words_through(placed)
+            new_positions: Dict[bool, Set[Position]] = {True: set(), False: set()}
+            for word in new_words:
+                horizontal = word.cells[0].row == word.cells[1].row
+                new_positions[horizontal].update((cell.row, cell.col) for cell in word.cells)
+
+            words = [
+                word
+                for word in self.words
+                if not any(
+                    (cell.row, cell.col) in new_positions[word.cells[0].row == word.cells[1].row] for cell in word.cells
+                )
+            ]
+            self.words = sorted(
+                words + new_words,
+                key=lambda word: (
+                    (0, word.cells[0].row, word.cells[0].col)
+                    if word.cells[0].row == word.cells[1].row
+                    else (1, word.cells[0].col, word.cells[0].row)
+                ),
+            )
 
     def get_series(self, row: int, col: int, to_place: int, direction: Direction) -> List[Cell]:
         series: List[Cell] = []
@@ -130,7 +228,7 @@ class Board:
         if direction == Direction.HORIZONTAL:
             for i in range(self.rows):
                 if i + col < self.cols:
-                    cell = self.cells[row][col + i]
+                    cell = self.get_cell(row, col + i)
                     if cell.tile is None and count >= to_place:
                         break
                     series.append(cell)
@@ -140,7 +238,7 @@ class Board:
         elif direction == Direction.VERTICAL:
             for i in range(self.rows):
                 if i + row < self.cols:
-                    cell = self.cells[row + i][col]
+                    cell = self.get_cell(row + i, col)
                     if cell.tile is None and count >= to_place:
                         break
                     series.append(cell)
@@ -160,14 +258,17 @@ class Board:
         middle = self.rows // 2, self.cols // 2
 
         for i in range(to_place):
-            series.append(self.cells[middle[0]][middle[1] + i])
+            series.append(self.get_cell(middle[0], middle[1] + i))
 
         return series
 
     def is_board_empty(self) -> bool:
+        if self.has_tiles:
+            return False
         for row in self.cells:
             for cell in row:
                 if cell.tile is not None:
+                    self.has_tiles = True
                     return False
         return True
 
@@ -192,13 +293,56 @@ class Board:
         if not self.word_is_placable(word):
             raise ValueError("Word is not placable")
 
-        for cell in word.cells:
-            board_cell = self.get_cell(cell.row, cell.col)
-            if board_cell.tile is None:
-                self.cells[cell.row][cell.col] = cell
+        placed = [cell for cell in word.cells if self.get_cell(cell.row, cell.col).tile is None]
+        for cell in placed:
+            self.cells[cell.row][cell.col] = cell
+        self.record_placed(placed)
+
+    def get_words_through(self, placed: List[Cell]) -> List[Word]:
+        """Returns the words that placing the cells would form, in get_board_words order, without changing the board.
+
+        Only the lines through the placed cells can change, so those are the only ones read.
+        """
+        placed_cells = {(cell.row, cell.col): cell for cell in placed}
+
+        def get_tile_cell(row: int, col: int) -> Optional[Cell]:
+            if not (0 <= row < self.rows and 0 <= col < self.cols):
+                return None
+            cell = placed_cells.get((row, col)) or self.get_cell(row, col)
+            return cell if cell.tile is not None else None
+
+        horizontal: Dict[Tuple[int, int], Word] = {}
+        vertical: Dict[Tuple[int, int], Word] = {}
+        for row, col in placed_cells:
+            for d_row, d_col, words in ((0, 1, horizontal), (1, 0, vertical)):
+                r, c = row, col
+                while get_tile_cell(r - d_row, c - d_col) is not None:
+                    r, c = r - d_row, c - d_col
+                if (r, c) in words:
+                    continue
+
+                start = r, c
+                cells: List[Cell] = []
+                cell = get_tile_cell(r, c)
+                while cell is not None:
+                    cells.append(cell)
+                    r, c = r + d_row, c + d_col
+                    cell = get_tile_cell(r, c)
+                if len(cells) > 1:
+                    words[start] = Word(cells)
+
+        return [horizontal[start] for start in sorted(horizontal)] + [
+            vertical[start] for start in sorted(vertical, key=lambda start: (start[1], start[0]))
+        ]
 
     def clone(self) -> "Board":
+        """Returns a board with its own grid, starting from this one's derived data, which add_word replaces."""
         new_board = Board([[cell for cell in row] for row in self.cells])
+        new_board.placed = self.placed
+        new_board.has_tiles = self.has_tiles
+        new_board.anchors = self.anchors
+        new_board.words = self.words
+        new_board.cross_checks = self.cross_checks
         return new_board
 
     def cell_touches_tile(self, row: int, col: int) -> bool:
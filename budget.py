@@ -0,0 +1,32 @@
+import threading
+import time
+from typing import Optional
+
+
+class Budget:
+    """A time limit and cancellation flag for lazy move searches.
+
+    Searches check expired between board lines or series, so a search stops within one
+    line's work of the deadline or of cancel being called, from any thread. stopped records
+    whether a search was cut short, i.e. whether its results are not exhaustive.
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.deadline = None if seconds is None else time.monotonic() + seconds
+        self.cancelled = threading.Event()
+        self.stopped = False
+
+    @classmethod
+    def until(cls, deadline: Optional[float]) -> "Budget":
+        """Returns a budget expiring at a time.monotonic() deadline, which other processes on the machine share."""
+        budget = cls()
+        budget.deadline = deadline
+        return budget
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    def expired(self) -> bool:
+        if self.cancelled.is_set() or (self.deadline is not None and time.monotonic() >= self.deadline):
+            self.stopped = True
+        return self.stopped
@@ -0,0 +1,18 @@
+import logging
+import sys
+
+from dictionary import Dictionary, get_cache_path
+
+DICTIONARY_FILE = "dictionary.txt"
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def build_dictionary_cache(filename: str) -> None:
+    """Builds the DAWG and GADDAG caches for a word list, skipping any that are already fresh."""
+    Dictionary(filename, gaddag=True)
+    logging.info(f"Dictionary cache is up to date: {get_cache_path(filename)}")
+
+
+if __name__ == "__main__":
+    build_dictionary_cache(sys.argv[1] if len(sys.argv) > 1 else DICTIONARY_FILE)
@@ -0,0 +1,136 @@
+import copy
+from typing import Dict, Optional, Set, Tuple
+
+from board import Board, Direction, Position
+from dawg import Dawg
+
+
+class CrossChecks:
+    """Per-board table of what each empty cell allows, computed once and cached on the board.
+
+    For a direction of play, a cell with tiles directly before or after it perpendicular to
+    that direction only accepts the letters completing a valid perpendicular word. Alongside
+    the letters, the partial score of that word is kept: the sum of its existing tiles' scores
+    and the product of their word multipliers, so a placed tile's cross-word is scored without
+    building it. Cells without perpendicular neighbours accept any letter and are left out.
+    version is the number of cells the board had placed when these were last brought up to date.
+    """
+
+    def __init__(self, board: Board, dawg: Dawg):
+        self.board = board
+        self.dawg = dawg
+        self.version = len(board.placed)
+        self.letters: Dict[Direction, Dict[Position, Set[str]]] = {}
+        self.scores: Dict[Direction, Dict[Position, Tuple[int, int]]] = {}
+        for direction in (Direction.HORIZONTAL, Direction.VERTICAL):
+            self.letters[direction], self.scores[direction] = self.compute(direction)
+
+    @classmethod
+    def for_board(cls, board: Board, dawg: Dawg) -> "CrossChecks":
+        """Returns the board's cached cross-checks, updating them for the cells placed since.
+
+        They are computed from scratch for a new board or dictionary. A clone starts from the
+        cross-checks of the board it was cloned from, which are copied rather than changed.
+        """
+        cross_checks = board.cross_checks
+        if cross_checks is None or cross_checks.dawg is not dawg:
+            cross_checks = cls(board, dawg)
+        elif cross_checks.board is not board or cross_checks.version < len(board.placed):
+            cross_checks = cross_checks.updated(board)
+        board.cross_checks = cross_checks
+        return cross_checks
+
+    def updated(self, board: Board) -> "CrossChecks":
+        """Returns a copy brought up to date with the cells placed on the board since this version.
+
+        A placed cell only changes the cells at either end of the runs of tiles through it, so
+        only those are computed again.
+        """
+        cross_checks = copy.copy(self)
+        cross_checks.board = board
+        cross_checks.version = len(board.placed)
+        cross_checks.letters, cross_checks.scores = {}, {}
+        placed = board.get_placed_since(self.version)
+
+        for direction in (Direction.HORIZONTAL, Direction.VERTICAL):
+            letters = cross_checks.letters[direction] = dict(self.letters[direction])
+            scores = cross_checks.scores[direction] = dict(self.scores[direction])
+            d_row, d_col = (1, 0) if direction == Direction.HORIZONTAL else (0, 1)
+
+            affected: Set[Position] = set()
+            for cell in placed:
+                letters.pop((cell.row, cell.col), None)
+                scores.pop((cell.row, cell.col), None)
+                for step in (-1, 1):
+                    row, col = cell.row, cell.col
+                    while 0 <= row < board.rows and 0 <= col < board.cols and board.get_cell(row, col).tile is not None:
+                        row, col = row + step * d_row, col + step * d_col
+                    if 0 <= row < board.rows and 0 <= col < board.cols:
+                        affected.add((row, col))
+
+            for row, col in affected:
+                entry = cross_checks.compute_cell(row, col, direction)
+                if entry is not None:
+                    letters[(row, col)], scores[(row, col)] = entry
+
+        return cross_checks
+
+    def get_cross_letters(self, row: int, col: int, direction: Direction) -> Tuple[str, str, int, int]:
+        """Returns the tiles directly before and after a cell perpendicular to the direction of play, with their score."""
+        d_row, d_col = (1, 0) if direction == Direction.HORIZONTAL else (0, 1)
+        score = 0
+        multiplier = 1
+
+        before = ""
+        r, c = row - d_row, col - d_col
+        while r >= 0 and c >= 0:
+            cell = self.board.get_cell(r, c)
+            if cell.tile is None:
+                break
+            before = cell.tile.letter + before
+            score += cell.tile.score * (cell.multiplier.letter_multiplier() if cell.multiplier else 1)
+            multiplier *= cell.multiplier.word_multiplier() if cell.multiplier else 1
+            r, c = r - d_row, c - d_col
+
+        after = ""
+        r, c = row + d_row, col + d_col
+        while r < self.board.rows and c < self.board.cols:
+            cell = self.board.get_cell(r, c)
+            if cell.tile is None:
+                break
+            after += cell.tile.letter
+            score += cell.tile.score * (cell.multiplier.letter_multiplier() if cell.multiplier else 1)
+            multiplier *= cell.multiplier.word_multiplier() if cell.multiplier else 1
+            r, c = r + d_row, c + d_col
+
+        return before, after, score, multiplier
+
+    def compute(self, direction: Direction) -> Tuple[Dict[Position, Set[str]], Dict[Position, Tuple[int, int]]]:
+        letters: Dict[Position, Set[str]] = {}
+        scores: Dict[Position, Tuple[int, int]] = {}
+
+        for row in range(self.board.rows):
+            for col in range(self.board.cols):
+                if self.board.get_cell(row, col).tile is not None:
+                    continue
+
+                entry = self.compute_cell(row, col, direction)
+                if entry is not None:
+                    letters[(row, col)], scores[(row, col)] = entry
+
+        return letters, scores
+
+    def compute_cell(self, row: int, col: int, direction: Direction) -> Optional[Tuple[Set[str], Tuple[int, int]]]:
+        """Returns an empty cell's allowed letters and partial cross-score, or None without perpendicular neighbours."""
+        before, after, score, multiplier = self.get_cross_letters(row, col, direction)
+        if not before and not after:
+            return None
+
+        allowed: Set[str] = set()
+        node = self.dawg.walk(self.dawg.root, before)
+        if node is not None:
+            for letter, child in self.dawg.children(node):
+                end = self.dawg.walk(child, after)
+                if end is not None and self.dawg.is_end_of_word(end):
+                    allowed.add(letter)
+        return allowed, (score, multiplier)
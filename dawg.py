@@ -0,0 +1,321 @@
+import mmap
+import os
+import re
+import struct
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar, Union
+
+from rack import BLANK
+
+MAGIC = b"WWCDAWG1"
+HEADER = struct.Struct("=8s32sIII")
+DAWG_EXTENSION = ".dawg"
+SEPARATOR = "+"
+
+Buffer = Union[bytes, mmap.mmap]
+DawgType = TypeVar("DawgType", bound="Dawg")
+
+
+class AutomatonBuilder:
+    """Builds a minimal acyclic automaton from sorted strings (Daciuk et al.'s incremental algorithm).
+
+    Nodes live in parallel lists while building; a node is frozen into the register as soon as
+    no later string can extend it, and replaced by an equivalent registered node if one exists.
+    """
+
+    def __init__(self) -> None:
+        self.children: List[Dict[str, int]] = []
+        self.terminal: List[bool] = []
+        self.register: Dict[Tuple[object, ...], int] = {}
+
+    def new_node(self) -> int:
+        self.children.append({})
+        self.terminal.append(False)
+        return len(self.children) - 1
+
+    def add_sorted(self, strings: Iterable[Tuple[str, Optional[int]]], terminal: bool = True) -> int:
+        """Adds strings in lexicographic order and returns the root of the minimized automaton.
+
+        Each string may carry a separator target: the node the string ends at gets an edge
+        labelled SEPARATOR pointing at that (already registered) node.
+        """
+        root = self.new_node()
+        stack: List[int] = [root]
+        previous = ""
+
+        for string, separator_target in strings:
+            common = 0
+            limit = min(len(string), len(previous))
+            while common < limit and string[common] == previous[common]:
+                common += 1
+
+            self.minimize(stack, previous, common)
+
+            node = stack[-1]
+            for letter in string[common:]:
+                child = self.new_node()
+                self.children[node][letter] = child
+                stack.append(child)
+                node = child
+
+            if terminal:
+                self.terminal[node] = True
+            if separator_target is not None:
+                self.children[node][SEPARATOR] = separator_target
+            previous = string
+
+        self.minimize(stack, previous, 0)
+        return root
+
+    def key(self, node: int) -> Tuple[object, ...]:
+        return (self.terminal[node],) + tuple(self.children[node].items())
+
+    def minimize(self, stack: List[int], previous: str, depth: int) -> None:
+        while len(stack) - 1 > depth:
+            node = stack.pop()
+            key = self.key(node)
+            existing = self.register.get(key)
+            if existing is None:
+                self.register[key] = node
+            else:
+                self.children[stack[-1]][previous[len(stack) - 1]] = existing
+
+    def thaw(self, dawg: "Dawg") -> int:
+        """Loads a frozen automaton back into the builder, registering all of its nodes, and returns its root."""
+        base = len(self.children)
+        for node in range(len(dawg)):
+            self.children.append({letter: base + child for letter, child in dawg.children(node)})
+            self.terminal.append(dawg.is_end_of_word(node))
+        for node in range(base + 1, len(self.children)):
+            self.register[self.key(node)] = node
+        return base
+
+    def add(self, root: int, word: str) -> None:
+        """Adds one word to a minimized automaton and keeps it minimal.
+
+        The nodes along the word's existing prefix may be shared with other words, so they are
+        cloned before the new suffix is attached, and the path is then minimized bottom up.
+        """
+        path = [root]
+        node = root
+        common = 0
+        while common < len(word) and word[common] in self.children[node]:
+            original = self.children[node][word[common]]
+            clone = self.new_node()
+            self.children[clone] = dict(self.children[original])
+            self.terminal[clone] = self.terminal[original]
+            self.children[node][word[common]] = clone
+            node = clone
+            path.append(node)
+            common += 1
+
+        for letter in word[common:]:
+            child = self.new_node()
+            self.children[node][letter] = child
+            self.children[node] = dict(sorted(self.children[node].items()))
+            node = child
+            path.append(node)
+        self.terminal[node] = True
+
+        for depth in range(len(path) - 1, 0, -1):
+            node = path[depth]
+            key = self.key(node)
+            existing = self.register.get(key)
+            if existing is None:
+                self.register[key] = node
+            elif existing != node:
+                self.children[path[depth - 1]][word[depth - 1]] = existing
+
+    def freeze(self, root: int, words: Iterable[str] = (), digest: bytes = b"") -> bytes:
+        """Renumbers the nodes reachable from root and packs them into the flat DAWG format.
+
+        The layout is a header, the edge offsets of every node, the edge targets, the start of
+        each word length section, the edge letters, a terminal flag per node and finally the
+        words themselves, newline terminated and grouped by length. Node 0 is the root.
+        """
+        index: Dict[int, int] = {root: 0}
+        order: List[int] = [root]
+        for node in order:
+            for child in self.children[node].values():
+                if child not in index:
+                    index[child] = len(order)
+                    order.append(child)
+
+        offsets = array("I", [0])
+        targets = array("I")
+        letters = bytearray()
+        terminal = bytearray()
+        for node in order:
+            for letter, child in sorted(self.children[node].items()):
+                letters.append(ord(letter))
+                targets.append(index[child])
+            offsets.append(len(targets))
+            terminal.append(self.terminal[node])
+
+        buckets: Dict[int, List[str]] = {}
+        for word in words:
+            buckets.setdefault(len(word), []).append(word)
+        max_length = max(buckets, default=0)
+
+        words_start = HEADER.size + 4 * (len(offsets) + len(targets) + max_length + 2) + len(letters) + len(terminal)
+        word_data = bytearray(b"\n")
+        length_starts = array("I")
+        for length in range(max_length + 1):
+            length_starts.append(words_start + len(word_data))
+            for word in buckets.get(length, []):
+                word_data += word.encode() + b"\n"
+        length_starts.append(words_start + len(word_data))
+
+        header = HEADER.pack(MAGIC, digest, len(order), len(targets), max_length)
+        return (
+            header
+            + offsets.tobytes()
+            + targets.tobytes()
+            + length_starts.tobytes()
+            + bytes(letters)
+            + bytes(terminal)
+            + bytes(word_data)
+        )
+
+
+class Dawg:
+    """Minimized DAWG stored as flat integer arrays, plus the words grouped by length.
+
+    The arrays are views over a single buffer, which is either built in memory or memory-mapped
+    from a file written by save(), so loading needs no parsing and processes mapping the same
+    file share one page-cached copy. Pattern lookups scan the word section of the same buffer.
+    The header can carry a digest of the source the DAWG was built from, used for caching.
+    """
+
+    def __init__(self, data: Buffer):
+        if len(data) < HEADER.size:
+            raise ValueError("Invalid DAWG data")
+        magic, digest, node_count, edge_count, max_length = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Invalid DAWG data")
+
+        self.data = data
+        self.digest: bytes = digest
+        self.max_length: int = max_length
+        view = memoryview(data)
+        position = HEADER.size
+
+        self.offsets = view[position : position + 4 * (node_count + 1)].cast("I")
+        position += 4 * (node_count + 1)
+        self.targets = view[position : position + 4 * edge_count].cast("I")
+        position += 4 * edge_count
+        self.length_starts = view[position : position + 4 * (max_length + 2)].cast("I")
+        position += 4 * (max_length + 2)
+        self.letters_start = position
+        position += edge_count
+        self.terminal = view[position : position + node_count]
+
+        self.root = 0
+
+    @classmethod
+    def from_words(cls, words: Iterable[str], digest: bytes = b"") -> "Dawg":
+        word_list = sorted(set(words))
+        builder = AutomatonBuilder()
+        root = builder.add_sorted((word, None) for word in word_list)
+        return cls(builder.freeze(root, word_list, digest))
+
+    @classmethod
+    def load(cls: Type[DawgType], filename: str) -> DawgType:
+        with open(filename, "rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def save(self, filename: str) -> None:
+        """Writes the DAWG to a temporary file first so readers never map a partial file."""
+        temp_filename = f"{filename}.{os.getpid()}.tmp"
+        with open(temp_filename, "wb") as file:
+            file.write(self.data)
+        os.replace(temp_filename, filename)
+
+    def extend(self, words: Iterable[str], digest: bytes = b"") -> "Dawg":
+        """Returns a copy of the DAWG with the words added, without rebuilding it from scratch."""
+        new_words = [word for word in set(words) if not self.search(word)]
+        builder = AutomatonBuilder()
+        root = builder.thaw(self)
+        for word in new_words:
+            builder.add(root, word)
+        return Dawg(builder.freeze(root, sorted(self.words() + new_words), digest))
+
+    def __len__(self) -> int:
+        return len(self.terminal)
+
+    def child(self, node: int, letter: str) -> Optional[int]:
+        start = self.letters_start + self.offsets[node]
+        end = self.letters_start + self.offsets[node + 1]
+        position = self.data.find(letter.encode(), start, end)
+        if position < 0:
+            return None
+        return self.targets[position - self.letters_start]
+
+    def children(self, node: int) -> Iterator[Tuple[str, int]]:
+        for position in range(self.offsets[node], self.offsets[node + 1]):
+            yield chr(self.data[self.letters_start + position]), self.targets[position]
+
+    def is_end_of_word(self, node: int) -> bool:
+        return self.terminal[node] == 1
+
+    def walk(self, node: Optional[int], letters: str) -> Optional[int]:
+        for letter in letters:
+            if node is None:
+                return None
+            node = self.child(node, letter)
+        return node
+
+    def search(self, word: str) -> bool:
+        node = self.walk(self.root, word)
+        return node is not None and self.is_end_of_word(node)
+
+    def search_with_pattern(self, pattern: str) -> List[str]:
+        length = len(pattern)
+        if length > self.max_length:
+            return []
+
+        regex = re.compile(b"^" + pattern.replace("-", ".").encode() + b"$", re.MULTILINE)
+        start, end = self.length_starts[length], self.length_starts[length + 1]
+        return [match.decode() for match in regex.findall(self.data, start, end)]
+
+    def search_with_rack(self, pattern: str, rack: Counter[str]) -> List[str]:
+        """Finds the words matching the pattern whose open squares the rack can fill.
+
+        The rack is a letter multiset where BLANK counts wildcard tiles; it is consumed while
+        descending, so branches the rack cannot supply are pruned instead of filtered later.
+        """
+        results: List[str] = []
+        self._match_rack(self.root, pattern, "", rack, results)
+        return results
+
+    def _match_rack(self, node: int, pattern: str, prefix: str, rack: Counter[str], results: List[str]) -> None:
+        depth = len(prefix)
+        if depth == len(pattern):
+            if self.is_end_of_word(node):
+                results.append(prefix)
+            return
+
+        p_char = pattern[depth]
+        if p_char != "-":
+            child = self.child(node, p_char)
+            if child is not None:
+                self._match_rack(child, pattern, prefix + p_char, rack, results)
+            return
+
+        for letter, child in self.children(node):
+            for rack_letter in (letter, BLANK):
+                if rack[rack_letter] > 0:
+                    rack[rack_letter] -= 1
+                    self._match_rack(child, pattern, prefix + letter, rack, results)
+                    rack[rack_letter] += 1
+                    break
+
+    def words(self, length: Optional[int] = None) -> List[str]:
+        if length is None:
+            start, end = self.length_starts[0], self.length_starts[self.max_length + 1]
+        elif length > self.max_length:
+            return []
+        else:
+            start, end = self.length_starts[length], self.length_starts[length + 1]
+        return self.data[start:end].decode().split()
@@ -1,65 +1,208 @@
-from typing import Dict, List, Optional
+import hashlib
+import logging
+import os
+from collections import Counter, OrderedDict
+from typing import Iterable, List, Optional, Tuple
 
+from dawg import DAWG_EXTENSION, Dawg
+from gaddag import Gaddag
+from pattern_index import PatternBackend, PatternIndex, create_pattern_index, filter_by_rack
 
-class TrieNode:
-    def __init__(self) -> None:
-        self.children: Dict[str, "TrieNode"] = {}
-        self.is_end_of_word: bool = False
+GADDAG_EXTENSION = ".gaddag"
+MATCHES_CACHE_SIZE = 4096
+
+
+def get_cache_path(filename: str, extension: str = DAWG_EXTENSION) -> str:
+    return os.path.splitext(filename)[0] + extension
+
+
+def get_file_digest(filename: str) -> bytes:
+    with open(filename, "rb") as file:
+        return hashlib.sha256(file.read()).digest()
+
+
+def load_cache(cache_path: str, digest: bytes) -> Optional[Dawg]:
+    """Returns the cached DAWG if it exists and was built from a source with the given digest."""
+    try:
+        dawg = Dawg.load(cache_path)
+    except (OSError, ValueError):
+        return None
+    if dawg.digest != digest:
+        return None
+    return dawg
+
+
+def update_cache(filename: str, previous_digest: bytes, words: Iterable[str]) -> None:
+    """Adds words to the cache of a dictionary file that has just been changed to include them.
+
+    The cached DAWG is extended in place of a full rebuild when it was built from the previous
+    contents; otherwise it is stale and removed. The GADDAG cache is always removed.
+    """
+    cache_path = get_cache_path(filename)
+    dawg = load_cache(cache_path, previous_digest)
+    if dawg is not None:
+        dawg.extend(words, get_file_digest(filename)).save(cache_path)
+    elif os.path.exists(cache_path):
+        os.remove(cache_path)
+
+    gaddag_path = get_cache_path(filename, GADDAG_EXTENSION)
+    if os.path.exists(gaddag_path):
+        os.remove(gaddag_path)
 
 
 class Dictionary:
-    def __init__(self, filename: Optional[str] = None) -> None:
-        self.root: TrieNode = TrieNode()
-        self.word_length_buckets: Dict[int, List[str]] = {}
+    def __init__(
+        self,
+        filename: Optional[str] = None,
+        gaddag: bool = False,
+        use_cache: bool = True,
+        pattern_backend: PatternBackend = PatternBackend.SCAN,
+    ) -> None:
+        self.dawg: Optional[Dawg] = None
+        self.pending: List[str] = []
+        self.gaddag: Optional[Gaddag] = None
+        self.pattern_backend = pattern_backend
+        self.pattern_index: Optional[PatternIndex] = None
+        self.matches: OrderedDict[str, List[str]] = OrderedDict()
+        self.use_cache = use_cache
+        self.cache_source: Optional[str] = None
         if filename:
             self.load_from_file(filename)
-
-        self.matches: Dict[str, List[str]] = {}
+        if gaddag:
+            self.build_gaddag()
 
     def load_from_file(self, filename: str) -> None:
+        if filename.endswith(DAWG_EXTENSION):
+            if self.dawg is not None:
+                self.pending.extend(self.dawg.words())
+            self.dawg = Dawg.load(filename)
+            self.gaddag = None
+            self.matches.clear()
+            return
+
+        if self.use_cache and self.dawg is None and not self.pending:
+            self.load_from_cache(filename)
+            return
+
         with open(filename, "r") as file:
             for line in file:
                 self.insert(line.strip())
 
+    def load_from_cache(self, filename: str) -> None:
+        """Loads the precompiled DAWG next to a word list, building and saving it first if it is stale."""
+        cache_path = get_cache_path(filename)
+        digest = get_file_digest(filename)
+
+        dawg = load_cache(cache_path, digest)
+        if dawg is None:
+            logging.info(f"Building dictionary cache: {cache_path}")
+            with open(filename, "r") as file:
+                dawg = Dawg.from_words((line.strip() for line in file), digest)
+            try:
+                dawg.save(cache_path)
+            except OSError as e:
+                logging.warning(f"Could not write dictionary cache: {e}")
+
+        self.dawg = dawg
+        self.cache_source = filename
+
+    def save_to_file(self, filename: str) -> None:
+        self.get_dawg().save(filename)
+
     def insert(self, word: str) -> None:
-        node: TrieNode = self.root
-        for char in word:
-            if char not in node.children:
-                node.children[char] = TrieNode()
-            node = node.children[char]
-        node.is_end_of_word = True
-
-        word_length: int = len(word)
-        if word_length not in self.word_length_buckets:
-            self.word_length_buckets[word_length] = []
-        self.word_length_buckets[word_length].append(word)
+        self.pending.append(word)
+        self.gaddag = None
+        self.matches.clear()
+        self.cache_source = None
+
+    def get_dawg(self) -> Dawg:
+        """Returns the DAWG, rebuilding it first if words were inserted since it was built."""
+        if self.dawg is None or self.pending:
+            words = self.pending + (self.dawg.words() if self.dawg is not None else [])
+            self.dawg = Dawg.from_words(words)
+            self.pending = []
+        return self.dawg
+
+    def build_gaddag(self) -> Gaddag:
+        if self.gaddag is not None:
+            return self.gaddag
+
+        if self.cache_source is None or self.dawg is None:
+            self.gaddag = Gaddag.from_words(self.get_dawg().words())
+            return self.gaddag
+
+        cache_path = get_cache_path(self.cache_source, GADDAG_EXTENSION)
+        try:
+            gaddag: Optional[Gaddag] = Gaddag.load(cache_path)
+        except (OSError, ValueError):
+            gaddag = None
+
+        if gaddag is None or gaddag.digest != self.dawg.digest:
+            logging.info(f"Building GADDAG cache: {cache_path}")
+            gaddag = Gaddag.from_words(self.dawg.words(), self.dawg.digest)
+            try:
+                gaddag.save(cache_path)
+            except OSError as e:
+                logging.warning(f"Could not write GADDAG cache: {e}")
+
+        self.gaddag = gaddag
+        return self.gaddag
 
     def search(self, word: str) -> bool:
-        node: TrieNode = self.root
-        for char in word:
-            if char not in node.children:
-                return False
-            node = node.children[char]
-        return node.is_end_of_word
+        return self.get_dawg().search(word)
+
+    def set_pattern_backend(self, pattern_backend: PatternBackend) -> None:
+        self.pattern_backend = pattern_backend
+        self.pattern_index = None
+        self.matches.clear()
+
+    def get_pattern_index(self) -> PatternIndex:
+        dawg = self.get_dawg()
+        if self.pattern_index is None or self.pattern_index.dawg is not dawg:
+            self.pattern_index = create_pattern_index(dawg, self.pattern_backend)
+        return self.pattern_index
 
     def search_with_pattern(self, pattern: str) -> List[str]:
         if pattern in self.matches:
+            self.matches.move_to_end(pattern)
             return self.matches[pattern]
 
-        pattern_length: int = len(pattern)
-        if pattern_length not in self.word_length_buckets:
-            return []
+        results = self.get_pattern_index().search_with_pattern(pattern)
+        self.cache_matches(pattern, results)
+        return results
+
+    def cache_matches(self, key: str, results: List[str]) -> None:
+        self.matches[key] = results
+        if len(self.matches) > MATCHES_CACHE_SIZE:
+            self.matches.popitem(last=False)
+
+    def search_with_patterns(self, patterns: List[str]) -> List[List[str]]:
+        """Searches many patterns at once, letting the pattern backend batch the ones not cached yet."""
+        missing = list(dict.fromkeys(pattern for pattern in patterns if pattern not in self.matches))
+        found = dict(zip(missing, self.get_pattern_index().search_with_patterns(missing)))
+        for pattern, results in found.items():
+            self.cache_matches(pattern, results)
+
+        return [found[pattern] if pattern in found else self.search_with_pattern(pattern) for pattern in patterns]
+
+    def search_with_rack(self, pattern: str, letters: Iterable[str]) -> List[str]:
+        """Finds the words matching the pattern that the rack letters can complete, '?' being a blank.
 
-        results: List[str] = []
-        for word in self.word_length_buckets[pattern_length]:
-            if self._match_pattern(word, pattern):
-                results.append(word)
+        The scan backend walks the DAWG, pruning the branches the rack cannot supply. The index
+        backends find the pattern's matches, cached whatever the rack, and keep the placeable ones.
+        """
+        rack: Counter[str] = Counter(letters)
+        key = f"{pattern}/{''.join(sorted(rack.elements()))}"
+        if key in self.matches:
+            self.matches.move_to_end(key)
+            return self.matches[key]
 
-        self.matches[pattern] = results
+        if self.pattern_backend == PatternBackend.SCAN:
+            results = self.get_dawg().search_with_rack(pattern, rack)
+        else:
+            results = filter_by_rack(pattern, self.search_with_pattern(pattern), rack)
+        self.cache_matches(key, results)
         return results
 
-    def _match_pattern(self, word: str, pattern: str) -> bool:
-        for w_char, p_char in zip(word, pattern):
-            if p_char != "-" and w_char != p_char:
-                return False
-        return True
+    def search_through_hook(self, hook: str, letters: Iterable[str]) -> List[Tuple[str, int]]:
+        return self.build_gaddag().search_through_hook(hook, letters)
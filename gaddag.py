@@ -0,0 +1,80 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dawg import SEPARATOR, AutomatonBuilder, Dawg
+from rack import BLANK
+
+
+class Gaddag(Dawg):
+    """GADDAG index over a word list.
+
+    Every word w = xy with x non-empty is stored as REV(x) + SEPARATOR + y, so a path starts at
+    any letter of the word, extends left back to the first letter, then right to the last.
+    The suffix halves after a separator are the states of the minimized forward DAWG, since
+    the words completing a prefix x are exactly that state's right language.
+    """
+
+    @classmethod
+    def from_words(cls, words: Iterable[str], digest: bytes = b"") -> "Gaddag":
+        word_list = sorted(set(words))
+        builder = AutomatonBuilder()
+
+        forward_root = builder.add_sorted((word, None) for word in word_list)
+
+        prefix_nodes: Dict[str, int] = {}
+        for word in word_list:
+            node = forward_root
+            for i, letter in enumerate(word):
+                node = builder.children[node][letter]
+                prefix_nodes.setdefault(word[: i + 1], node)
+
+        reversed_prefixes = sorted((prefix[::-1], node) for prefix, node in prefix_nodes.items())
+        root = builder.add_sorted(reversed_prefixes, terminal=False)
+
+        return cls(builder.freeze(root, digest=digest))
+
+    def search_through_hook(self, hook: str, letters: Iterable[str]) -> List[Tuple[str, int]]:
+        """Finds every word that passes through the hook letter using only the given rack letters.
+
+        Returns (word, hook index) pairs; a word containing the hook more than once appears once
+        per position. A '?' in the letters is a blank that can stand for any letter.
+        """
+        node = self.child(self.root, hook)
+        if node is None:
+            return []
+
+        rack: Counter[str] = Counter(letters)
+        results: List[Tuple[str, int]] = []
+        self.extend_left(node, hook, rack, results)
+        return results
+
+    def extend_left(self, node: int, prefix: str, rack: Counter[str], results: List[Tuple[str, int]]) -> None:
+        for letter, child in self.children(node):
+            if letter == SEPARATOR:
+                self.extend_right(child, prefix, "", rack, results)
+                continue
+            rack_letter = self.take(letter, rack)
+            if rack_letter is None:
+                continue
+            self.extend_left(child, letter + prefix, rack, results)
+            rack[rack_letter] += 1
+
+    def extend_right(
+        self, node: int, prefix: str, suffix: str, rack: Counter[str], results: List[Tuple[str, int]]
+    ) -> None:
+        if self.is_end_of_word(node):
+            results.append((prefix + suffix, len(prefix) - 1))
+
+        for letter, child in self.children(node):
+            rack_letter = self.take(letter, rack)
+            if rack_letter is None:
+                continue
+            self.extend_right(child, prefix, suffix + letter, rack, results)
+            rack[rack_letter] += 1
+
+    def take(self, letter: str, rack: Counter[str]) -> Optional[str]:
+        for rack_letter in (letter, BLANK):
+            if rack[rack_letter] > 0:
+                rack[rack_letter] -= 1
+                return rack_letter
+        return None
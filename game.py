@@ -1,47 +1,206 @@
-from typing import Dict, List, Optional, Set, Tuple
+import heapq
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from board import Board, Direction
+from budget import Budget
 from cell import Cell
+from cross_checks import CrossChecks
 from dictionary import Dictionary
-from rack import Rack
+from move_generator import LineMoveCache, MoveGenerator
+from pattern_index import PatternBackend
+from rack import BLANK, Rack
 from tile import Tile
 from word import Word
 
 
+PlacementKey = Tuple[Tuple[int, int, str, int], ...]
+
+
+def get_placement_key(placed: Iterable[Cell]) -> PlacementKey:
+    """Returns placed tiles as sorted (row, col, letter, score) tuples, which identify a move."""
+    return tuple(sorted({(cell.row, cell.col, cell.tile.letter, cell.tile.score) for cell in placed if cell.tile}))
+
+
+def get_direction(word: Word) -> Direction:
+    if len(word.cells) > 1 and word.cells[0].col == word.cells[1].col:
+        return Direction.VERTICAL
+    return Direction.HORIZONTAL
+
+
+class GenerationMode(Enum):
+    PATTERN = 1
+    ANCHOR = 2
+
+
+def moves_to_json(moves: List[Tuple[List[Word], int, int]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "words": [{"word": str(word), "cells": [cell.to_json() for cell in word.cells]} for word in words],
+            "score": score,
+            "placed_tiles": placed_tiles,
+        }
+        for words, score, placed_tiles in moves
+    ]
+
+
+def moves_from_json(moves_data: List[Dict[str, Any]]) -> List[Tuple[List[Word], int, int]]:
+    return [
+        (
+            [Word([Cell.from_json(cell) for cell in word["cells"]]) for word in move["words"]],
+            move["score"],
+            move["placed_tiles"],
+        )
+        for move in moves_data
+    ]
+
+
 class Game:
-    def __init__(self, dictionary: Dictionary, board: Board, rack: Rack):
+    def __init__(
+        self,
+        dictionary: Dictionary,
+        board: Board,
+        rack: Rack,
+        mode: GenerationMode = GenerationMode.PATTERN,
+        line_moves: Optional[LineMoveCache] = None,
+    ):
         self.dictionary = dictionary
         self.board = board
         self.rack = rack
+        self.mode = mode
+        # Pass the previous turn's cache to reuse the moves of the lines its move left unchanged.
+        self.line_moves = line_moves if line_moves is not None else LineMoveCache()
+
+        self.candidate_count = 0
+        self.duplicate_count = 0
 
     def get_possible_words(self) -> List[Word]:
-        valid_words: List[Word] = []
-        unusable_series: Set[str] = set()
+        return list(self.iter_possible_words())
+
+    def iter_possible_words(self, budget: Optional[Budget] = None) -> Iterator[Word]:
+        """Yields the candidate words as they are found, stopping early once the budget expires."""
+        return (word for _, words in self.iter_word_groups(budget) for word in words)
+
+    def get_placement_key(self, words: List[Word]) -> PlacementKey:
+        """Returns the key of the move placing the words' tiles that are not on the board yet."""
+        return get_placement_key(
+            cell for word in words for cell in word.cells if self.board.get_cell(cell.row, cell.col).tile is None
+        )
+
+    def iter_word_groups(
+        self, budget: Optional[Budget] = None, prioritized: bool = False
+    ) -> Iterator[Tuple[int, List[Word]]]:
+        """Yields the words of each board line or series, with its index in the usual generation order.
+
+        With prioritized, the lines or series whose empty squares carry the most valuable
+        multipliers are searched first, so a search cut short by its budget has usually seen
+        the highest scoring moves.
+        """
+        if self.mode == GenerationMode.ANCHOR:
+            lines = self.get_lines()
+            order = list(range(len(lines)))
+            if prioritized:
+                priorities = self.get_line_priorities(lines)
+                order.sort(key=lambda i: priorities[i], reverse=True)
+            return zip(order, self.iter_line_groups([lines[i] for i in order], budget))
+
+        series_list = self.get_all_series()
+        order = list(range(len(series_list)))
+        if prioritized:
+            order.sort(key=lambda i: self.get_premium(series_list[i]), reverse=True)
+        return zip(order, self.iter_series_groups([series_list[i] for i in order], budget))
 
+    def get_premium(self, cells: List[Cell]) -> Tuple[int, int]:
+        """Returns the product of word multipliers and the sum of letter multipliers of the empty cells."""
+        word_multiplier = 1
+        letter_multipliers = 0
+        for cell in cells:
+            if cell.tile is None and cell.multiplier is not None:
+                word_multiplier *= cell.multiplier.word_multiplier()
+                letter_multipliers += cell.multiplier.letter_multiplier()
+        return word_multiplier, letter_multipliers
+
+    def get_line_priorities(self, lines: List[Tuple[Direction, int]]) -> List[Tuple[int, int]]:
+        """Returns the premium of the empty cells within a rack's reach of each line's anchors."""
+        generator = MoveGenerator(self.dictionary, self.board, self.rack)
+        reach = len(self.rack.tiles)
+        priorities: List[Tuple[int, int]] = []
+        for direction, index in lines:
+            line = generator.get_line(index, direction)
+            anchors = [position for position, cell in enumerate(line) if (cell.row, cell.col) in generator.anchors]
+            priorities.append(
+                self.get_premium(
+                    [
+                        cell
+                        for position, cell in enumerate(line)
+                        if any(abs(position - anchor) < reach for anchor in anchors)
+                    ]
+                )
+            )
+        return priorities
+
+    def get_lines(self) -> List[Tuple[Direction, int]]:
+        rows = [(Direction.HORIZONTAL, row) for row in range(self.board.rows)]
+        return rows + [(Direction.VERTICAL, col) for col in range(self.board.cols)]
+
+    def get_possible_words_for_lines(self, lines: List[Tuple[Direction, int]]) -> List[Word]:
+        return [word for words in self.iter_line_groups(lines) for word in words]
+
+    def iter_line_groups(
+        self, lines: List[Tuple[Direction, int]], budget: Optional[Budget] = None
+    ) -> Iterator[List[Word]]:
+        generator = MoveGenerator(self.dictionary, self.board, self.rack)
+        for direction, index in lines:
+            if budget is not None and budget.expired():
+                return
+            words: List[Word] = []
+            generator.generate_line_cached(generator.get_line(index, direction), direction, words, self.line_moves)
+            yield words
+
+    def get_all_series(self) -> List[List[Cell]]:
+        series_list: List[List[Cell]] = []
         for series_length in range(len(self.rack.tiles), 0, -1):
-            if self.board.is_board_empty():
-                for word in self.find_words_for_series(
-                    self.board.get_empty_board_series(series_length), unusable_series
-                ):
-                    valid_words.append(word)
-            else:
-                for row in range(self.board.rows):
-                    for col in range(self.board.cols):
-                        if col + series_length <= self.board.cols:
-                            if col > 0 and str(self.board.get_cell(row, col - 1)) != "-":
-                                continue
-                            series = self.board.get_series(row, col, series_length, Direction.HORIZONTAL)
-                            for word in self.find_words_for_series(series, unusable_series):
-                                valid_words.append(word)
-
-                        if row + series_length <= self.board.rows:
-                            if row > 0 and str(self.board.get_cell(row - 1, col)) != "-":
-                                continue
-                            series = self.board.get_series(row, col, series_length, Direction.VERTICAL)
-                            for word in self.find_words_for_series(series, unusable_series):
-                                valid_words.append(word)
+            series_list.extend(self.get_series_for_length(series_length))
+        return series_list
 
-        return valid_words
+    def get_possible_words_for_series(self, series_list: List[List[Cell]]) -> List[Word]:
+        return [word for words in self.iter_series_groups(series_list) for word in words]
+
+    def iter_series_groups(
+        self, series_list: List[List[Cell]], budget: Optional[Budget] = None
+    ) -> Iterator[List[Word]]:
+        """Yields the words of each series. Index pattern backends first match all the series of a
+        length in one batch, which the rack searches then read from the dictionary's cache."""
+        unusable_series: Set[str] = set()
+        prefetched: Set[int] = set()
+        for series in series_list:
+            if budget is not None and budget.expired():
+                return
+            if self.dictionary.pattern_backend != PatternBackend.SCAN and len(series) not in prefetched:
+                prefetched.add(len(series))
+                self.dictionary.search_with_patterns(
+                    ["".join(str(cell) for cell in other) for other in series_list if len(other) == len(series)]
+                )
+            yield self.find_words_for_series(series, unusable_series)
+
+    def get_series_for_length(self, series_length: int) -> List[List[Cell]]:
+        if self.board.is_board_empty():
+            return [self.board.get_empty_board_series(series_length)]
+
+        series_list: List[List[Cell]] = []
+        for row in range(self.board.rows):
+            for col in range(self.board.cols):
+                if col + series_length <= self.board.cols:
+                    if col > 0 and str(self.board.get_cell(row, col - 1)) != "-":
+                        continue
+                    series_list.append(self.board.get_series(row, col, series_length, Direction.HORIZONTAL))
+
+                if row + series_length <= self.board.rows:
+                    if row > 0 and str(self.board.get_cell(row - 1, col)) != "-":
+                        continue
+                    series_list.append(self.board.get_series(row, col, series_length, Direction.VERTICAL))
+
+        return series_list
 
     def count_placed_tiles(self, words: List[Word]) -> int:
         unique_cells: List[Cell] = []
@@ -57,44 +216,276 @@ class Game:
 
         return placed_tiles_count
 
-    def get_scored_possible_words(self) -> List[Tuple[List[Word], int, int]]:
-        possible_words = self.get_possible_words()
-        scored_words: List[Tuple[List[Word], int, int]] = []
+    def get_scored_possible_words(self, incremental: bool = True) -> List[Tuple[List[Word], int, int]]:
+        scored_words = self.score_words(self.get_possible_words(), incremental)
+        return sorted(scored_words, key=lambda x: x[1], reverse=True)
+
+    def top_k(
+        self, k: int, bound: Optional[bool] = None, budget: Optional[Budget] = None, prioritized: bool = False
+    ) -> List[Tuple[List[Word], int, int]]:
+        """Returns the k best moves, ranked exactly as get_scored_possible_words ranks them.
+
+        Candidates stream through a heap of the k best so far, and placements already seen are
+        skipped. With bound, which defaults to on for the anchor generator only, candidates whose
+        score bound cannot beat a full heap are skipped before validation. With a budget, the
+        best moves found before it expired are returned.
+        """
+        if bound is None:
+            bound = self.mode == GenerationMode.ANCHOR
+        heap: List[Tuple[int, Tuple[int, int], Tuple[List[Word], int, int]]] = []
+        if k < 1:
+            return []
+
+        invalid_words = [word for word in self.board.get_board_words() if not self.dictionary.search(str(word))]
+        seen: Dict[PlacementKey, Tuple[int, int]] = {}
+        for group, words in self.iter_word_groups(budget, prioritized):
+            for offset, word in enumerate(words):
+                order = (-group, -offset)
+                self.candidate_count += 1
+                if bound and len(heap) == k and (self.get_score_bound(word), order) <= heap[0][:2]:
+                    continue
 
-        existing_words = self.board.get_board_words()
-        for word in possible_words:
-            board_copy = self.board.clone()
+                placed = self.get_placed_cells(word)
+                if placed is None:
+                    continue
 
-            try:
-                board_copy.add_word(word)
-            except ValueError:
+                key = get_placement_key(placed)
+                seen_order = seen.get(key)
+                if seen_order is not None:
+                    # A prioritized search can find a copy generated earlier in the usual order,
+                    # which takes the kept copy's place among moves with the same score.
+                    if order < seen_order or self.reorder_move(heap, seen_order, order):
+                        self.duplicate_count += 1
+                        continue
+                seen[key] = order
+
+                scored_word = self.score_placement(word, placed, invalid_words)
+                if scored_word is None:
+                    continue
+
+                entry = (scored_word[1], order, scored_word)
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
+
+        return [scored_word for _, _, scored_word in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
+
+    def reorder_move(
+        self,
+        heap: List[Tuple[int, Tuple[int, int], Tuple[List[Word], int, int]]],
+        order: Tuple[int, int],
+        new_order: Tuple[int, int],
+    ) -> bool:
+        """Gives the move kept in the heap with the order a new one, returning whether it was there."""
+        for i, (score, entry_order, scored_word) in enumerate(heap):
+            if entry_order == order:
+                heap[i] = (score, new_order, scored_word)
+                heapq.heapify(heap)
+                return True
+        return False
+
+    def solve_anytime(self, seconds: Optional[float] = None) -> Tuple[Optional[Tuple[List[Word], int, int]], bool]:
+        """Returns the best move found within the time limit and whether the search was exhaustive.
+
+        The most valuable lines or series are searched first. An exhaustive search returns the
+        same move as get_scored_possible_words; the move is None if none was found in time.
+        """
+        budget = Budget(seconds)
+        moves = self.top_k(1, budget=budget, prioritized=True)
+        return (moves[0] if moves else None), not budget.stopped
+
+    def get_score_bound(self, word: Word) -> int:
+        """Returns an upper bound of the word's score, exact when the placement is valid.
+
+        Only the word's own line and the board's cached cross-scores are read; nothing is
+        validated, so this is much cheaper than score_word.
+        """
+        direction = get_direction(word)
+        d_row, d_col = (0, 1) if direction == Direction.HORIZONTAL else (1, 0)
+        cross_scores = CrossChecks.for_board(self.board, self.dictionary.get_dawg()).scores[direction]
+
+        before: List[Cell] = []
+        row, col = word.cells[0].row - d_row, word.cells[0].col - d_col
+        while row >= 0 and col >= 0 and self.board.get_cell(row, col).tile is not None:
+            before.insert(0, self.board.get_cell(row, col))
+            row, col = row - d_row, col - d_col
+
+        after: List[Cell] = []
+        row, col = word.cells[-1].row + d_row, word.cells[-1].col + d_col
+        while row < self.board.rows and col < self.board.cols and self.board.get_cell(row, col).tile is not None:
+            after.append(self.board.get_cell(row, col))
+            row, col = row + d_row, col + d_col
+
+        score = Word(before + word.cells + after).get_score()
+        placed_tiles = 0
+        for cell in word.cells:
+            if self.board.get_cell(cell.row, cell.col).tile is not None:
                 continue
+            placed_tiles += 1
+            cross_score = cross_scores.get((cell.row, cell.col))
+            if cross_score is not None:
+                score += self.get_cross_word_score(cell, *cross_score)
+
+        if placed_tiles == 7:
+            score += 40
+        return score
+
+    def score_words(self, words: Iterable[Word], incremental: bool = True) -> List[Tuple[List[Word], int, int]]:
+        """Scores the words that can be placed, keeping their order."""
+        return list(self.iter_scored_words(words, incremental))
+
+    def iter_scored_possible_words(
+        self, budget: Optional[Budget] = None, incremental: bool = True
+    ) -> Iterator[Tuple[List[Word], int, int]]:
+        """Yields the moves as they are found and scored, in generation order, until the budget expires."""
+        return self.iter_scored_words(self.iter_possible_words(budget), incremental)
+
+    def iter_scored_words(
+        self, words: Iterable[Word], incremental: bool = True
+    ) -> Iterator[Tuple[List[Word], int, int]]:
+        """Scores the words in order, skipping placements that were already scored.
+
+        The same tiles on the same squares can be found more than once, e.g. a single tile from
+        both its row and its column. Duplicates are dropped after the cheap checks that find
+        the placed tiles and before any word is built or looked up; candidate_count and
+        duplicate_count count them.
+        """
+        seen: Set[PlacementKey] = set()
+        if incremental:
+            invalid_words = [word for word in self.board.get_board_words() if not self.dictionary.search(str(word))]
+            for word in words:
+                self.candidate_count += 1
+                placed = self.get_placed_cells(word)
+                if placed is None:
+                    continue
+                key = get_placement_key(placed)
+                if key in seen:
+                    self.duplicate_count += 1
+                    continue
+                seen.add(key)
+
+                scored_word = self.score_placement(word, placed, invalid_words)
+                if scored_word is not None:
+                    yield scored_word
+        else:
+            existing_words = self.board.get_board_words()
+            for word in words:
+                self.candidate_count += 1
+                key = self.get_placement_key([word])
+                if key in seen:
+                    self.duplicate_count += 1
+                    continue
+                seen.add(key)
+
+                scored_word = self.score_word_on_clone(word, existing_words)
+                if scored_word is not None:
+                    yield scored_word
 
-            all_words_after = board_copy.get_board_words()
-            new_words = [word for word in all_words_after if word not in existing_words]
+    def score_word(self, word: Word, invalid_words: List[Word]) -> Optional[Tuple[List[Word], int, int]]:
+        """Scores a placement from the lines through its new tiles only, leaving the board untouched.
 
-            total_score = 0
+        Gives the same result as score_word_on_clone. The board's cross-checks reject tiles that
+        form invalid perpendicular words before any word is built, and score those words from the
+        cached partial scores, so only the main word is looked up in the dictionary. invalid_words
+        are the words already on the board that are not in the dictionary; a placement is only
+        valid if it extends all of them.
+        """
+        placed = self.get_placed_cells(word)
+        if placed is None:
+            return None
+        return self.score_placement(word, placed, invalid_words)
 
-            for new_word in new_words:
+    def get_placed_cells(self, word: Word) -> Optional[List[Cell]]:
+        """Returns the cells the word places, or None if it does not fit the board or its cross-checks."""
+        try:
+            if not self.board.word_is_placable(word):
+                return None
+        except ValueError:
+            return None
+
+        cross_letters = CrossChecks.for_board(self.board, self.dictionary.get_dawg()).letters[get_direction(word)]
+        placed = [cell for cell in word.cells if self.board.get_cell(cell.row, cell.col).tile is None]
+        for cell in placed:
+            allowed = cross_letters.get((cell.row, cell.col))
+            if allowed is not None and cell.get_letter_string() not in allowed:
+                return None
+        return placed
+
+    def score_placement(
+        self, word: Word, placed: List[Cell], invalid_words: List[Word]
+    ) -> Optional[Tuple[List[Word], int, int]]:
+        """Validates and scores a word whose placed cells passed get_placed_cells."""
+        direction = get_direction(word)
+        cross_scores = CrossChecks.for_board(self.board, self.dictionary.get_dawg()).scores[direction]
+
+        positions = {(cell.row, cell.col): cell for cell in placed}
+        new_words = self.board.get_words_through(placed)
+
+        total_score = 0
+        used_positions: Set[Tuple[int, int]] = set()
+        for new_word in new_words:
+            word_positions = {(cell.row, cell.col) for cell in new_word.cells} & positions.keys()
+            used_positions |= word_positions
+
+            is_cross_word = (new_word.cells[0].row == new_word.cells[1].row) != (direction == Direction.HORIZONTAL)
+            if is_cross_word:
+                cell = positions[next(iter(word_positions))]
+                score, word_multiplier = cross_scores[(cell.row, cell.col)]
+                total_score += self.get_cross_word_score(cell, score, word_multiplier)
+            elif not self.dictionary.search(str(new_word)):
+                return None
+            else:
                 total_score += new_word.get_score()
-                if self.count_placed_tiles([new_word]) == 7:
-                    total_score += 40
 
-            try:
-                self.validate_board(board_copy)
-            except ValueError:
-                continue
+            if len(word_positions) == 7:
+                total_score += 40
 
-            scored_words.append((new_words, total_score, self.count_placed_tiles(new_words)))
+        for invalid_word in invalid_words:
+            if not any(all(cell in new_word.cells for cell in invalid_word.cells) for new_word in new_words):
+                return None
 
-        return sorted(scored_words, key=lambda x: x[1], reverse=True)
+        return new_words, total_score, len(used_positions)
+
+    def get_cross_word_score(self, cell: Cell, score: int, word_multiplier: int) -> int:
+        """Scores the perpendicular word through a placed cell from the partial score of its existing tiles."""
+        tile_score = cell.tile.score if cell.tile else 0
+        if cell.multiplier:
+            tile_score *= cell.multiplier.letter_multiplier()
+            word_multiplier *= cell.multiplier.word_multiplier()
+        return (score + tile_score) * word_multiplier
+
+    def score_word_on_clone(self, word: Word, existing_words: List[Word]) -> Optional[Tuple[List[Word], int, int]]:
+        board_copy = self.board.clone()
+
+        try:
+            board_copy.add_word(word)
+        except ValueError:
+            return None
+
+        all_words_after = board_copy.get_board_words()
+        new_words = [word for word in all_words_after if word not in existing_words]
+
+        total_score = 0
+
+        for new_word in new_words:
+            total_score += new_word.get_score()
+            if self.count_placed_tiles([new_word]) == 7:
+                total_score += 40
+
+        try:
+            self.validate_board(board_copy)
+        except ValueError:
+            return None
+
+        return new_words, total_score, self.count_placed_tiles(new_words)
 
     def find_words_for_series(self, series: List[Cell], unusable_series: Set[str]) -> List[Word]:
         valid_words: List[Word] = []
         series_str = "".join(str(cell) for cell in series)
 
-        for word in self.dictionary.search_with_pattern(series_str):
-            rack_dict = {tile.letter: tile.score for tile in self.rack.tiles}
+        for word in self.dictionary.search_with_rack(series_str, self.rack.get_letters()):
+            rack_tiles = list(self.rack.tiles)
             cells: List[Cell] = []
 
             if series_str + word in unusable_series:
@@ -102,27 +493,16 @@ class Game:
 
             for i, letter in enumerate(word):
                 series_letter_string = series[i].get_letter_string()
-                if letter not in rack_dict and series_letter_string != letter:
-                    if "?" in rack_dict:
-                        score = rack_dict.pop("?")
-                        cells.append(
-                            Cell(
-                                series[i].row,
-                                series[i].col,
-                                Tile(letter, score),
-                                series[i].multiplier,
-                            )
-                        )
-                        continue
-                    unusable_series.add(series_str + word)
-                    break
                 if series_letter_string != letter:
-                    score = rack_dict.pop(letter)
+                    tile = self.take_rack_tile(rack_tiles, letter)
+                    if tile is None:
+                        unusable_series.add(series_str + word)
+                        break
                     cells.append(
                         Cell(
                             series[i].row,
                             series[i].col,
-                            Tile(letter, score),
+                            Tile(letter, tile.score),
                             series[i].multiplier,
                         )
                     )
@@ -133,6 +513,15 @@ class Game:
 
         return valid_words
 
+    def take_rack_tile(self, rack_tiles: List[Tile], letter: str) -> Optional[Tile]:
+        """Removes the tile for a letter from the remaining rack tiles, falling back to a blank."""
+        for rack_letter in (letter, BLANK):
+            for tile in rack_tiles:
+                if tile.letter == rack_letter:
+                    rack_tiles.remove(tile)
+                    return tile
+        return None
+
     def validate_board(self, board: Optional[Board] = None) -> None:
         if board is None:
             board = self.board
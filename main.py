@@ -2,24 +2,41 @@ import argparse
 import logging
 import os
 from typing import Optional
-from parser import Parser
+from parser import OcrBackend, Parser
 
+from array_board import ArrayBoard
+from batch import process_batch
 from board import Board
 from dictionary import Dictionary
-from game import Game
+from game import Game, GenerationMode, moves_from_json, moves_to_json
+from move_generator import LineMoveCache
+from parallel_solver import ParallelSolver
+from pattern_index import PatternBackend
 from rack import Rack
+from result_cache import RESULT_CACHE_FILE, ResultCache
+from tile_cache import TILE_CACHE_FILE, TileCache
 
 DICTIONARY_FILE = "dictionary.txt"
 SCREENSHOT_DIR = "screenshots"
+MOVES_TO_PRINT = 5
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
-parser = Parser()
+ocr_parser = Parser()
 dictionary = Dictionary(DICTIONARY_FILE)
 
 
 def process(
-    screenshot_name: str, model: Optional[str] = None, solve: bool = False, reparse: bool = False, debug: bool = False
+    screenshot_name: str,
+    model: Optional[str] = None,
+    solve: bool = False,
+    reparse: bool = False,
+    debug: bool = False,
+    mode: GenerationMode = GenerationMode.PATTERN,
+    array_board: bool = False,
+    solver: Optional[ParallelSolver] = None,
+    cache: Optional[ResultCache] = None,
+    line_moves: Optional[LineMoveCache] = None,
 ) -> None:
     logging.info(f"Processing screenshot: {screenshot_name}")
 
@@ -29,17 +46,17 @@ def process(
 
     if not os.path.exists(board_path) or not os.path.exists(rack_path) or reparse:
         logging.info(f"Parsing screenshot: {screenshot_name} with model: {model or 'default'}")
-        board, rack = parser.parse_screenshot(os.path.join(screenshot_path, "screenshot.png"), model)
+        board, rack = ocr_parser.parse_screenshot(os.path.join(screenshot_path, "screenshot.png"), model, reparse)
 
         board.save_board_to_file(board_path)
         rack.save_rack_to_file(rack_path)
 
-    board = Board.load_board_from_file(board_path)
+    board = ArrayBoard.load_board_from_file(board_path) if array_board else Board.load_board_from_file(board_path)
     rack = Rack.load_rack_from_file(rack_path)
     board.save_board_to_file(board_path)
     rack.save_rack_to_file(rack_path)
 
-    game = Game(dictionary, board, rack)
+    game = Game(dictionary, board, rack, mode, line_moves)
 
     if debug:
         board.print_letters()
@@ -56,8 +73,21 @@ def process(
 
     if solve:
         logging.info("Solving board")
-        scored_possible_words = game.get_scored_possible_words()
-        print(scored_possible_words[:5])
+        cache_key = cache.get_key(board, rack, mode) if cache is not None else ""
+        cached_moves = cache.get(cache_key, MOVES_TO_PRINT) if cache is not None else None
+        if cached_moves is not None:
+            logging.info("Using cached moves")
+            scored_possible_words = moves_from_json(cached_moves)
+        elif solver is not None:
+            scored_possible_words = solver.get_scored_possible_words(board, rack, mode)[:MOVES_TO_PRINT]
+        else:
+            scored_possible_words = game.top_k(MOVES_TO_PRINT)
+            logging.info(
+                f"Found {game.candidate_count} candidate placements, {game.duplicate_count} of them duplicates"
+            )
+        if cache is not None and cached_moves is None:
+            cache.put(cache_key, moves_to_json(scored_possible_words), MOVES_TO_PRINT)
+        print(scored_possible_words)
         for word in scored_possible_words[0][0]:
             board.add_word(word)
         board.print_letters()
@@ -78,17 +108,113 @@ def main() -> None:
         "--model",
         help="Name to the tesseract model",
     )
+    parser.add_argument(
+        "--ocr-backend",
+        choices=[backend.name.lower() for backend in OcrBackend],
+        default=OcrBackend.PYTESSERACT.name.lower(),
+        help="How Tesseract is run: in process through libtesseract, or as a process per call through pytesseract",
+    )
+    parser.add_argument(
+        "--montage-ocr",
+        action="store_true",
+        help="Experimental: OCR the tiles in a few montages instead of one by one",
+    )
     parser.add_argument("--solve", action="store_true", help="Enable solving mode")
     parser.add_argument("--reparse", action="store_true", help="Reparse the screenshot(s)")
     parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    parser.add_argument(
+        "-g",
+        "--generator",
+        choices=[mode.name.lower() for mode in GenerationMode],
+        default=GenerationMode.PATTERN.name.lower(),
+        help="Move generation strategy used when solving",
+    )
+    parser.add_argument(
+        "-p",
+        "--pattern-backend",
+        choices=[backend.name.lower() for backend in PatternBackend],
+        default=PatternBackend.SCAN.name.lower(),
+        help="Dictionary pattern matching backend used by the pattern generator: scan walks the DAWG pruning by the "
+        "rack, bitset and numpy keep the rack's words among their index's matches",
+    )
+    parser.add_argument("--array-board", action="store_true", help="Store the board in NumPy arrays while solving")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes used when solving (0 for one per CPU)",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Parse and solve all screenshots as a pipeline, writing each one's moves to moves.json",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Solve without reading or writing cached moves")
+    parser.add_argument("--no-tile-cache", action="store_true", help="Parse without reading or writing cached tiles")
+    parser.add_argument("--ocr-workers", type=int, default=1, help="Number of worker processes parsing in batch mode")
 
     args = parser.parse_args()
+    mode = GenerationMode[args.generator.upper()]
+    dictionary.set_pattern_backend(PatternBackend[args.pattern_backend.upper()])
+    ocr_backend = OcrBackend[args.ocr_backend.upper()]
+
+    if args.batch:
+        process_batch(
+            SCREENSHOT_DIR,
+            dictionary,
+            model=args.model,
+            reparse=args.reparse,
+            mode=mode,
+            array_board=args.array_board,
+            ocr_workers=args.ocr_workers,
+            ocr_backend=ocr_backend,
+            tile_cache_path=None if args.no_tile_cache else TILE_CACHE_FILE,
+            montage_ocr=args.montage_ocr,
+            solve_workers=args.workers or os.cpu_count() or 1,
+        )
+        return
+
+    ocr_parser.ocr_backend = ocr_backend
+    ocr_parser.montage_ocr = args.montage_ocr
+    ocr_parser.tile_cache = None if args.no_tile_cache else TileCache(TILE_CACHE_FILE)
+    solver = ParallelSolver(dictionary, args.workers or None) if args.workers != 1 else None
+    cache = ResultCache(dictionary, RESULT_CACHE_FILE) if args.solve and not args.no_cache else None
+    line_moves = LineMoveCache()
 
-    if args.screenshot:
-        process(args.screenshot, args.model, args.solve, args.reparse, args.debug)
-    else:
-        for screenshot_name in os.listdir(SCREENSHOT_DIR):
-            process(screenshot_name, args.model, args.solve)
+    try:
+        if args.screenshot:
+            process(
+                args.screenshot,
+                args.model,
+                args.solve,
+                args.reparse,
+                args.debug,
+                mode,
+                args.array_board,
+                solver,
+                cache,
+                line_moves,
+            )
+        else:
+            for screenshot_name in os.listdir(SCREENSHOT_DIR):
+                process(
+                    screenshot_name,
+                    args.model,
+                    args.solve,
+                    mode=mode,
+                    array_board=args.array_board,
+                    solver=solver,
+                    cache=cache,
+                    line_moves=line_moves,
+                )
+    finally:
+        if solver is not None:
+            solver.close()
+        if cache is not None:
+            cache.close()
+        if ocr_parser.tile_cache is not None:
+            ocr_parser.tile_cache.close()
 
 
 if __name__ == "__main__":
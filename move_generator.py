@@ -0,0 +1,227 @@
+from collections import Counter, OrderedDict
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+from board import Board, Direction
+from cell import Cell
+from cross_checks import CrossChecks
+from dawg import Dawg
+from dictionary import Dictionary
+from rack import BLANK, Rack
+from tile import Tile
+from word import Word
+
+LineCrossChecks = Dict[Tuple[int, int], Set[str]]
+
+LINE_MOVES_CACHE_SIZE = 1024
+
+
+class LineMoveCache:
+    """The moves of board lines, keyed by MoveGenerator.generate_line_cached.
+
+    Entries are only valid for the DAWG they were generated from, so the cache empties itself
+    when it is used with another one. Beyond max_entries, the least recently used are evicted.
+    """
+
+    def __init__(self, max_entries: int = LINE_MOVES_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.dawg: Optional[Dawg] = None
+        self.moves: OrderedDict[Hashable, List[Word]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def get(self, dawg: Dawg, key: Hashable) -> Optional[List[Word]]:
+        if dawg is not self.dawg:
+            self.dawg = dawg
+            self.moves.clear()
+            return None
+
+        words = self.moves.get(key)
+        if words is not None:
+            self.moves.move_to_end(key)
+        return words
+
+    def put(self, key: Hashable, words: List[Word]) -> None:
+        self.moves[key] = words
+        if len(self.moves) > self.max_entries:
+            self.moves.popitem(last=False)
+
+
+class MoveGenerator:
+    """Appel-Jacobson style move generator.
+
+    Anchor squares and cross-check letter sets come from the board, which keeps them up to date
+    as words are placed, then the dictionary DAWG is walked from the rack so that only legal
+    placements are produced.
+    """
+
+    def __init__(self, dictionary: Dictionary, board: Board, rack: Rack):
+        self.dictionary = dictionary
+        self.dawg = dictionary.get_dawg()
+        self.board = board
+        self.rack = rack
+
+        self.rack_counts: Counter[str] = Counter(tile.letter for tile in rack.tiles)
+        self.tile_scores: Dict[str, int] = {}
+        for tile in rack.tiles:
+            self.tile_scores.setdefault(tile.letter, tile.score)
+
+        self.anchors = board.get_anchors()
+        self.cross_checks = CrossChecks.for_board(board, self.dawg).letters
+        self.rack_key = (tuple(sorted(self.rack_counts.items())), tuple(sorted(self.tile_scores.items())))
+
+    def get_line(self, index: int, direction: Direction) -> List[Cell]:
+        if direction == Direction.HORIZONTAL:
+            return self.board.get_row(index)
+        if direction == Direction.VERTICAL:
+            return self.board.get_col(index)
+        raise ValueError("Invalid direction")
+
+    def generate(self) -> List[Word]:
+        words: List[Word] = []
+        for direction in (Direction.HORIZONTAL, Direction.VERTICAL):
+            size = self.board.rows if direction == Direction.HORIZONTAL else self.board.cols
+            for index in range(size):
+                self.generate_line(self.get_line(index, direction), direction, words)
+        return words
+
+    def generate_line_cached(
+        self, line: List[Cell], direction: Direction, words: List[Word], cache: LineMoveCache
+    ) -> None:
+        """Adds the moves along a line like generate_line, reusing them from the cache.
+
+        The key holds everything the line's moves depend on: its cells, their cross-check
+        letters, which of them are anchors, and the rack's tiles in any order. Between turns
+        only the lines near the last move change, so the other lines come from the cache.
+        """
+        cross_checks = self.cross_checks[direction]
+        key = (
+            direction,
+            self.rack_key,
+            tuple(
+                (
+                    cell.row,
+                    cell.col,
+                    cell.tile.letter if cell.tile else None,
+                    cell.tile.score if cell.tile else None,
+                    cell.multiplier,
+                    frozenset(cross_checks[(cell.row, cell.col)]) if (cell.row, cell.col) in cross_checks else None,
+                    (cell.row, cell.col) in self.anchors,
+                )
+                for cell in line
+            ),
+        )
+
+        line_words = cache.get(self.dawg, key)
+        if line_words is None:
+            line_words = []
+            self.generate_line(line, direction, line_words)
+            cache.put(key, line_words)
+        words.extend(line_words)
+
+    def generate_line(self, line: List[Cell], direction: Direction, words: List[Word]) -> None:
+        cross_checks = self.cross_checks[direction]
+        last_anchor = -1
+
+        for position, cell in enumerate(line):
+            if (cell.row, cell.col) not in self.anchors:
+                continue
+
+            if position > 0 and line[position - 1].tile is not None:
+                start = position
+                while start > 0 and line[start - 1].tile is not None:
+                    start -= 1
+                prefix = "".join(cell.get_letter_string() for cell in line[start:position])
+                node = self.dawg.walk(self.dawg.root, prefix)
+                if node is not None:
+                    placed: List[Optional[Tile]] = [None] * (position - start)
+                    self.extend_right(line, cross_checks, start, position, position, placed, node, words)
+            else:
+                limit = min(position - last_anchor - 1, len(self.rack.tiles) - 1)
+                self.extend_left(line, cross_checks, position, [], self.dawg.root, limit, words)
+
+            last_anchor = position
+
+    def extend_left(
+        self,
+        line: List[Cell],
+        cross_checks: LineCrossChecks,
+        anchor: int,
+        placed: List[Optional[Tile]],
+        node: int,
+        limit: int,
+        words: List[Word],
+    ) -> None:
+        """Builds every rack prefix that fits in the free cells before the anchor, then extends each one right."""
+        self.extend_right(line, cross_checks, anchor - len(placed), anchor, anchor, placed, node, words)
+
+        if limit == 0:
+            return
+
+        for letter, child in self.dawg.children(node):
+            rack_letter = self.take_tile(letter)
+            if rack_letter is None:
+                continue
+            placed.append(Tile(letter, self.tile_scores[rack_letter]))
+            self.extend_left(line, cross_checks, anchor, placed, child, limit - 1, words)
+            placed.pop()
+            self.rack_counts[rack_letter] += 1
+
+    def extend_right(
+        self,
+        line: List[Cell],
+        cross_checks: LineCrossChecks,
+        start: int,
+        anchor: int,
+        position: int,
+        placed: List[Optional[Tile]],
+        node: int,
+        words: List[Word],
+    ) -> None:
+        if position < len(line):
+            board_tile = line[position].tile
+            if board_tile is not None:
+                child = self.dawg.child(node, board_tile.letter)
+                if child is not None:
+                    placed.append(None)
+                    self.extend_right(line, cross_checks, start, anchor, position + 1, placed, child, words)
+                    placed.pop()
+                return
+
+        if self.dawg.is_end_of_word(node) and position > anchor:
+            words.append(self.make_word(line, start, placed))
+
+        if position >= len(line):
+            return
+
+        cell = line[position]
+        allowed = cross_checks.get((cell.row, cell.col))
+
+        for letter, child in self.dawg.children(node):
+            if allowed is not None and letter not in allowed:
+                continue
+            rack_letter = self.take_tile(letter)
+            if rack_letter is None:
+                continue
+            placed.append(Tile(letter, self.tile_scores[rack_letter]))
+            self.extend_right(line, cross_checks, start, anchor, position + 1, placed, child, words)
+            placed.pop()
+            self.rack_counts[rack_letter] += 1
+
+    def take_tile(self, letter: str) -> Optional[str]:
+        """Removes a tile for the letter from the rack, falling back to a blank, and returns the rack letter used."""
+        for rack_letter in (letter, BLANK):
+            if self.rack_counts[rack_letter] > 0:
+                self.rack_counts[rack_letter] -= 1
+                return rack_letter
+        return None
+
+    def make_word(self, line: List[Cell], start: int, placed: List[Optional[Tile]]) -> Word:
+        cells: List[Cell] = []
+        for offset, tile in enumerate(placed):
+            board_cell = line[start + offset]
+            if tile is None:
+                cells.append(board_cell)
+            else:
+                cells.append(Cell(board_cell.row, board_cell.col, tile, board_cell.multiplier))
+        return Word(cells)
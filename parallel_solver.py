@@ -0,0 +1,137 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Set, Tuple, TypeVar
+
+from board import Board, Direction
+from cell import Cell
+from dictionary import Dictionary
+from game import Game, GenerationMode, PlacementKey
+from move_generator import LineMoveCache
+from rack import Rack
+from word import Word
+
+SHARDS_PER_WORKER = 4
+
+T = TypeVar("T")
+
+worker_dictionary: Optional[Dictionary] = None
+worker_line_moves = LineMoveCache()
+
+
+def set_worker_dictionary(dictionary: Dictionary) -> None:
+    global worker_dictionary, worker_line_moves
+    worker_dictionary = dictionary
+    worker_line_moves = LineMoveCache()
+
+
+def load_worker_dictionary(filename: str) -> None:
+    set_worker_dictionary(Dictionary(filename))
+
+
+def get_worker_dictionary() -> Dictionary:
+    if worker_dictionary is None:
+        raise RuntimeError("Worker dictionary is not set")
+    return worker_dictionary
+
+
+def get_worker_line_moves() -> LineMoveCache:
+    """Returns the line moves a worker keeps between solves, so the lines a move left unchanged are reused."""
+    return worker_line_moves
+
+
+def solve_lines(board: Board, rack: Rack, lines: List[Tuple[Direction, int]]) -> List[Tuple[List[Word], int, int]]:
+    """Generates and scores the anchor moves along some board lines, in serial order."""
+    game = Game(get_worker_dictionary(), board, rack, GenerationMode.ANCHOR, get_worker_line_moves())
+    return game.score_words(game.get_possible_words_for_lines(lines))
+
+
+def solve_series(board: Board, rack: Rack, series_list: List[List[Cell]]) -> List[Tuple[List[Word], int, int]]:
+    """Generates and scores the pattern moves for some series, in serial order."""
+    game = Game(get_worker_dictionary(), board, rack, GenerationMode.PATTERN)
+    return game.score_words(game.get_possible_words_for_series(series_list))
+
+
+def warm_up_worker() -> None:
+    get_worker_dictionary().get_dawg()
+
+
+def create_executor(dictionary: Dictionary, workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Creates a process pool whose workers can solve with the dictionary through get_worker_dictionary.
+
+    Workers are forked where the platform allows, inheriting the dictionary without pickling
+    it; otherwise each worker maps the dictionary's cached DAWG from disk. The workers are
+    started before returning, so they do not inherit files or sockets opened later.
+    """
+    dictionary.get_dawg()
+    if "fork" in multiprocessing.get_all_start_methods():
+        executor = ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=set_worker_dictionary,
+            initargs=(dictionary,),
+        )
+    elif dictionary.cache_source is not None:
+        executor = ProcessPoolExecutor(workers, initializer=load_worker_dictionary, initargs=(dictionary.cache_source,))
+    else:
+        raise ValueError("Parallel solving without fork needs a dictionary loaded from a file")
+
+    executor.submit(warm_up_worker).result()
+    return executor
+
+
+def split(items: Sequence[T], count: int) -> List[List[T]]:
+    """Splits items into at most count contiguous, evenly sized chunks."""
+    size = max(1, -(-len(items) // count))
+    return [list(items[i : i + size]) for i in range(0, len(items), size)]
+
+
+class ParallelSolver:
+    """Solves boards on a pool of worker processes.
+
+    The work of a solve is split into contiguous shards: the board lines for the anchor
+    generator, the series for the pattern generator. Each worker generates and scores its
+    shards, and the results are concatenated in shard order, dropping placements an earlier
+    shard already found, before the same stable sort as Game.get_scored_possible_words, so
+    the ranking is identical to the serial solver.
+    """
+
+    def __init__(self, dictionary: Dictionary, workers: Optional[int] = None):
+        self.dictionary = dictionary
+        self.workers = workers or os.cpu_count() or 1
+
+        self.executor = create_executor(dictionary, self.workers)
+
+    def __enter__(self) -> "ParallelSolver":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown()
+
+    def get_scored_possible_words(
+        self, board: Board, rack: Rack, mode: GenerationMode = GenerationMode.PATTERN
+    ) -> List[Tuple[List[Word], int, int]]:
+        game = Game(self.dictionary, board, rack, mode)
+        shard_count = self.workers * SHARDS_PER_WORKER
+        if mode == GenerationMode.ANCHOR:
+            futures = [
+                self.executor.submit(solve_lines, board, rack, lines) for lines in split(game.get_lines(), shard_count)
+            ]
+        else:
+            futures = [
+                self.executor.submit(solve_series, board, rack, series_list)
+                for series_list in split(game.get_all_series(), shard_count)
+            ]
+
+        scored_words: List[Tuple[List[Word], int, int]] = []
+        seen: Set[PlacementKey] = set()
+        for future in futures:
+            for scored_word in future.result():
+                key = game.get_placement_key(scored_word[0])
+                if key not in seen:
+                    seen.add(key)
+                    scored_words.append(scored_word)
+        return sorted(scored_words, key=lambda x: x[1], reverse=True)
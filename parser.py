@@ -1,21 +1,339 @@
-from typing import List, Optional, Tuple
+import ctypes
+import ctypes.util
+import logging
+import os
+import shlex
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
 import cv2
 import numpy as np
+import numpy.typing as npt
 import pytesseract  # type: ignore[import-untyped]
 
 from board import Board
 from cell import Cell
 from rack import Rack
 from tile import Tile
+from tile_cache import TileCache
 
 OCR_CONFIG = "--psm 10 --oem 1"
+BATCH_OCR_CONFIG = "--psm 6 --oem 1"
+LETTER_WHITELIST = "-c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+SCORE_WHITELIST = "-c tessedit_char_whitelist=0123456789"
+MULTIPLIER_TEXTS = ["TW", "DL", "DW", "TL"]
+BLANK_TEXTS = ["", " ", "_"]
+CENTER_TEXT = "Ø"
+GLYPH_SIZE = 96
+GLYPH_PADDING = 24
+
+GLYPH_DATASET_DIR = os.path.join("dataset", "training")
+TEMPLATE_SIZE = 24
+BACKGROUND_TOLERANCE = 5
+MIN_GLYPH_SIMILARITY = 0.9
+DEFAULT_PAGE_SEG_MODE = 3
+DEFAULT_ENGINE_MODE = 3
+DEFAULT_LANGUAGE = "eng"
+TSV_COLUMNS = [
+    "level",
+    "page_num",
+    "block_num",
+    "par_num",
+    "line_num",
+    "word_num",
+    "left",
+    "top",
+    "width",
+    "height",
+    "conf",
+    "text",
+]
 
 CV2Image = cv2.typing.MatLike
 
 
+def get_path_version(path: str) -> str:
+    """Returns the modification time and size of a file or directory, or an empty string if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ""
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def get_dataset_version(directory: str) -> str:
+    """Returns the number, latest modification time and total size of a glyph dataset's images and texts."""
+    if not os.path.isdir(directory):
+        return ""
+    stats = [entry.stat() for entry in os.scandir(directory) if entry.name.endswith((".png", ".gt.txt"))]
+    latest = max((stat.st_mtime_ns for stat in stats), default=0)
+    return f"{len(stats):x}-{latest:x}-{sum(stat.st_size for stat in stats):x}"
+
+
+class OcrBackend(Enum):
+    PYTESSERACT = 1
+    LIBTESSERACT = 2
+
+
+def parse_ocr_config(config: str) -> Tuple[int, int, str, Dict[str, str]]:
+    """Returns the page segmentation mode, engine mode, language and -c variables of a tesseract config."""
+    page_seg_mode, engine_mode, language = DEFAULT_PAGE_SEG_MODE, DEFAULT_ENGINE_MODE, DEFAULT_LANGUAGE
+    variables: Dict[str, str] = {}
+
+    args = shlex.split(config)
+    for option, value in zip(args, args[1:]):
+        if option == "--psm":
+            page_seg_mode = int(value)
+        elif option == "--oem":
+            engine_mode = int(value)
+        elif option == "-l":
+            language = value
+        elif option == "-c":
+            name, _, variable = value.partition("=")
+            variables[name] = variable
+
+    return page_seg_mode, engine_mode, language, variables
+
+
+class OcrEngine:
+    """Runs Tesseract through pytesseract, which starts a tesseract process for every call."""
+
+    def image_to_string(self, image: CV2Image, config: str) -> str:
+        text: str = pytesseract.image_to_string(image, config=config)
+        return text
+
+    def image_to_data(self, image: CV2Image, config: str) -> Dict[str, List[Any]]:
+        """Returns the recognized words with their boxes, by TSV column."""
+        data: Dict[str, List[Any]] = pytesseract.image_to_data(
+            image, config=config, output_type=pytesseract.Output.DICT
+        )
+        return data
+
+
+class LibTesseractEngine(OcrEngine):
+    """Runs Tesseract in this process through the libtesseract C API.
+
+    An API handle is initialised once per language and engine mode, then reused for every
+    image, so a model is loaded once per process instead of once per call. The page
+    segmentation mode and -c variables come from the same configs pytesseract takes, and
+    string variables a call does not set are put back to the values they had before.
+    """
+
+    def __init__(self, library: ctypes.CDLL):
+        self.library = library
+        library.TessBaseAPICreate.restype = ctypes.c_void_p
+        library.TessBaseAPIInit2.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+        library.TessBaseAPISetPageSegMode.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        library.TessBaseAPISetVariable.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p]
+        library.TessBaseAPIGetStringVariable.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+        library.TessBaseAPIGetStringVariable.restype = ctypes.c_char_p
+        library.TessBaseAPISetImage.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+        ]
+        library.TessBaseAPIGetUTF8Text.argtypes = [ctypes.c_void_p]
+        library.TessBaseAPIGetUTF8Text.restype = ctypes.c_void_p
+        library.TessBaseAPIGetTsvText.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        library.TessBaseAPIGetTsvText.restype = ctypes.c_void_p
+        library.TessDeleteText.argtypes = [ctypes.c_void_p]
+        library.TessBaseAPIClear.argtypes = [ctypes.c_void_p]
+        library.TessBaseAPIDelete.argtypes = [ctypes.c_void_p]
+
+        self.apis: Dict[Tuple[str, int], int] = {}
+        self.defaults: Dict[Tuple[str, int], Dict[str, Optional[bytes]]] = {}
+
+    @classmethod
+    def load(cls) -> Optional["LibTesseractEngine"]:
+        """Returns an engine on the system's libtesseract, or None if it cannot be loaded."""
+        path = ctypes.util.find_library("tesseract")
+        if path is None:
+            return None
+        try:
+            return cls(ctypes.CDLL(path))
+        except (OSError, AttributeError):
+            return None
+
+    def close(self) -> None:
+        for api in self.apis.values():
+            self.library.TessBaseAPIDelete(api)
+        self.apis.clear()
+        self.defaults.clear()
+
+    def get_api(self, language: str, engine_mode: int) -> int:
+        key = (language, engine_mode)
+        if key not in self.apis:
+            api = self.library.TessBaseAPICreate()
+            if self.library.TessBaseAPIInit2(api, None, language.encode(), engine_mode) != 0:
+                self.library.TessBaseAPIDelete(api)
+                raise RuntimeError(f"Tesseract could not load language {language}")
+            self.apis[key] = api
+            self.defaults[key] = {}
+        return self.apis[key]
+
+    def recognize(self, image: CV2Image, config: str, tsv: bool) -> str:
+        page_seg_mode, engine_mode, language, variables = parse_ocr_config(config)
+        api = self.get_api(language, engine_mode)
+        defaults = self.defaults[(language, engine_mode)]
+
+        for name, value in defaults.items():
+            if name not in variables and value is not None:
+                self.library.TessBaseAPISetVariable(api, name.encode(), value)
+        for name, variable in variables.items():
+            if name not in defaults:
+                defaults[name] = self.library.TessBaseAPIGetStringVariable(api, name.encode())
+            if not self.library.TessBaseAPISetVariable(api, name.encode(), variable.encode()):
+                raise ValueError(f"Unknown Tesseract variable: {name}")
+        self.library.TessBaseAPISetPageSegMode(api, page_seg_mode)
+
+        pixels = np.ascontiguousarray(image, dtype=np.uint8)
+        bytes_per_pixel = 1 if pixels.ndim == 2 else pixels.shape[2]
+        self.library.TessBaseAPISetImage(
+            api, pixels.ctypes.data, pixels.shape[1], pixels.shape[0], bytes_per_pixel, pixels.strides[0]
+        )
+        try:
+            text = self.library.TessBaseAPIGetTsvText(api, 0) if tsv else self.library.TessBaseAPIGetUTF8Text(api)
+            if text is None:
+                raise RuntimeError("Tesseract could not recognize the image")
+            try:
+                return ctypes.string_at(text).decode()
+            finally:
+                self.library.TessDeleteText(text)
+        finally:
+            self.library.TessBaseAPIClear(api)
+
+    def image_to_string(self, image: CV2Image, config: str) -> str:
+        return self.recognize(image, config, tsv=False)
+
+    def image_to_data(self, image: CV2Image, config: str) -> Dict[str, List[Any]]:
+        data: Dict[str, List[Any]] = {column: [] for column in TSV_COLUMNS}
+        for line in self.recognize(image, config, tsv=True).splitlines():
+            fields = line.split("\t")
+            if len(fields) < len(TSV_COLUMNS):
+                continue
+            for column, field in zip(TSV_COLUMNS, fields):
+                data[column].append(field if column == "text" else int(float(field)))
+        return data
+
+
+ocr_engines: Dict[OcrBackend, OcrEngine] = {}
+
+
+def get_ocr_engine(backend: OcrBackend) -> OcrEngine:
+    """Returns this process's engine for the backend, falling back to pytesseract without libtesseract."""
+    if backend not in ocr_engines:
+        engine: Optional[OcrEngine] = None
+        if backend == OcrBackend.LIBTESSERACT:
+            engine = LibTesseractEngine.load()
+            if engine is None:
+                logging.warning("libtesseract could not be loaded, falling back to pytesseract")
+        ocr_engines[backend] = engine or OcrEngine()
+    return ocr_engines[backend]
+
+
+class GlyphClassifier:
+    """Nearest-neighbour classifier over labelled glyph images.
+
+    Glyphs are downsampled to TEMPLATE_SIZE squares and normalised to zero mean and unit length,
+    so the dot product of two of them is their normalised cross-correlation. A batch of glyphs
+    is classified with one matrix product against every labelled example: each glyph takes the
+    label of the most similar example, or None when none is at least MIN_GLYPH_SIMILARITY alike.
+    """
+
+    def __init__(self, images: List[CV2Image], labels: List[str]):
+        self.labels = labels
+        self.templates = self.vectorize(images)
+
+    def vectorize(self, images: List[CV2Image]) -> npt.NDArray[np.float32]:
+        vectors = np.zeros((len(images), TEMPLATE_SIZE * TEMPLATE_SIZE), dtype=np.float32)
+        for index, image in enumerate(images):
+            vectors[index] = cv2.resize(image, (TEMPLATE_SIZE, TEMPLATE_SIZE), interpolation=cv2.INTER_AREA).ravel()
+        vectors -= vectors.mean(axis=1, keepdims=True)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.maximum(norms, 1e-6)
+        return vectors
+
+    def classify(self, images: List[CV2Image]) -> List[Optional[str]]:
+        if not self.labels:
+            return [None] * len(images)
+        if not images:
+            return []
+
+        similarities = self.vectorize(images) @ self.templates.T
+        best = similarities.argmax(axis=1)
+        return [
+            self.labels[example] if similarities[index, example] >= MIN_GLYPH_SIMILARITY else None
+            for index, example in enumerate(best)
+        ]
+
+
+class TileClassifier:
+    """Glyph classifiers for the three kinds of images prepare_dataset.py labels: whole tiles
+    (multipliers and the centre square), letters and scores."""
+
+    def __init__(self, tiles: GlyphClassifier, letters: GlyphClassifier, scores: GlyphClassifier):
+        self.tiles = tiles
+        self.letters = letters
+        self.scores = scores
+
+    @classmethod
+    def from_dataset(cls, directory: str = GLYPH_DATASET_DIR) -> "TileClassifier":
+        """Loads the images and ground truth texts written by prepare_dataset.py, if there are any."""
+        examples: Dict[str, Tuple[List[CV2Image], List[str]]] = {
+            kind: ([], []) for kind in ("tiles", "letters", "scores")
+        }
+        names = sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+
+        for name in names:
+            if not name.endswith(".gt.txt"):
+                continue
+            image = cv2.imread(os.path.join(directory, name[: -len(".gt.txt")] + ".png"), cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                continue
+            with open(os.path.join(directory, name)) as f:
+                label = f.read().strip()
+
+            if label in MULTIPLIER_TEXTS or label == CENTER_TEXT:
+                kind = "tiles"
+            elif label.isdigit():
+                kind = "scores"
+            else:
+                kind = "letters"
+            examples[kind][0].append(image)
+            examples[kind][1].append(label)
+
+        return cls(*(GlyphClassifier(*examples[kind]) for kind in ("tiles", "letters", "scores")))
+
+
+tile_classifiers: Dict[str, TileClassifier] = {}
+
+
+def get_tile_classifier(directory: str = GLYPH_DATASET_DIR) -> TileClassifier:
+    """Returns this process's classifier for a dataset directory, loading it on first use."""
+    if directory not in tile_classifiers:
+        tile_classifiers[directory] = TileClassifier.from_dataset(directory)
+    return tile_classifiers[directory]
+
+
 class Parser:
-    def __init__(self) -> None:
-        return
+    def __init__(
+        self,
+        ocr_backend: OcrBackend = OcrBackend.PYTESSERACT,
+        glyph_dataset: Optional[str] = GLYPH_DATASET_DIR,
+        tile_cache: Optional[TileCache] = None,
+        montage_ocr: bool = False,
+    ) -> None:
+        self.ocr_backend = ocr_backend
+        self.glyph_dataset = glyph_dataset
+        self.tile_cache = tile_cache
+        # Experimental: reads tiles in montages, which has not been checked against the trained model yet.
+        self.montage_ocr = montage_ocr
+
+    @property
+    def ocr_engine(self) -> OcrEngine:
+        return get_ocr_engine(self.ocr_backend)
 
     def crop_white_background(self, image: CV2Image, border_ratio: float = 0.1, min_border: int = 10) -> CV2Image:
         if len(image.shape) == 3:
@@ -95,14 +413,12 @@ class Parser:
         binarized_tile_image = self.binarize_image(tile_image)
         cropped_tile_image = self.crop_white_background(binarized_tile_image)
 
-        initial_ocr: str = pytesseract.image_to_string(cropped_tile_image, config=ocr_config).strip()
-        if not isinstance(initial_ocr, str):
-            raise ValueError("Internal pytesseract error")
+        initial_ocr = self.ocr_engine.image_to_string(cropped_tile_image, ocr_config).strip()
 
-        if initial_ocr in ["TW", "DL", "DW", "TL"]:
+        if initial_ocr in MULTIPLIER_TEXTS:
             return (initial_ocr, 0)
 
-        if initial_ocr in ["", " ", "_"]:
+        if initial_ocr in BLANK_TEXTS:
             return ("?", 0)
 
         letter_image, score_image = self.crop_letter_and_score_images(cv2.bitwise_not(binarized_tile_image))
@@ -113,26 +429,13 @@ class Parser:
         if np.all(letter_image == 255) and np.all(score_image == 255):
             return ("?", 0)
 
-        letter_text: str = (
-            pytesseract.image_to_string(
-                cropped_letter_image,
-                config=f"{ocr_config} tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZ",
-            )
-            .strip()
-            .upper()
-        )
-        if not isinstance(letter_text, str):
-            raise ValueError("Internal pytesseract error")
+        letter_text = self.ocr_engine.image_to_string(cropped_letter_image, f"{ocr_config} {LETTER_WHITELIST}")
+        letter_text = letter_text.strip().upper()
 
         if np.all(score_image == 255):
             return (letter_text, 0)
 
-        score_text: str = pytesseract.image_to_string(
-            cropped_score_image,
-            config=f"{ocr_config} tessedit_char_whitelist=0123456789",
-        ).strip()
-        if not isinstance(score_text, str):
-            raise ValueError("Internal pytesseract error")
+        score_text = self.ocr_engine.image_to_string(cropped_score_image, f"{ocr_config} {SCORE_WHITELIST}").strip()
 
         if score_text.isdigit():
             score_text_int = int(score_text)
@@ -141,6 +444,179 @@ class Parser:
 
         return (letter_text, score_text_int)
 
+    def build_montage(self, glyph_images: List[CV2Image]) -> CV2Image:
+        """Stacks glyph images on top of each other, each scaled into a white slot of the same height."""
+        slot = GLYPH_SIZE + 2 * GLYPH_PADDING
+        montage = np.full((slot * len(glyph_images), slot), 255, dtype=np.uint8)
+        for index, glyph_image in enumerate(glyph_images):
+            top = index * slot + GLYPH_PADDING
+            montage[top : top + GLYPH_SIZE, GLYPH_PADDING : GLYPH_PADDING + GLYPH_SIZE] = cv2.resize(
+                glyph_image, (GLYPH_SIZE, GLYPH_SIZE), interpolation=cv2.INTER_AREA
+            )
+        return montage
+
+    def read_glyphs(self, glyph_images: List[CV2Image], config: str) -> List[str]:
+        """OCRs square glyph images with a single Tesseract call, returning the text found in each."""
+        if not glyph_images:
+            return []
+
+        slot = GLYPH_SIZE + 2 * GLYPH_PADDING
+        data = self.ocr_engine.image_to_data(self.build_montage(glyph_images), config)
+        words: List[List[Tuple[int, str]]] = [[] for _ in glyph_images]
+        for text, left, top, height in zip(data["text"], data["left"], data["top"], data["height"]):
+            index = (top + height // 2) // slot
+            if text.strip() and 0 <= index < len(glyph_images):
+                words[index].append((left, text.strip()))
+
+        return ["".join(text for _, text in sorted(glyph_words)) for glyph_words in words]
+
+    def crop_glyph_images(self, binarized_tile_image: CV2Image) -> Optional[Tuple[CV2Image, Optional[CV2Image]]]:
+        """Returns a tile's letter and score glyphs, without a score if it has none, or None if it has neither."""
+        letter_image, score_image = self.crop_letter_and_score_images(cv2.bitwise_not(binarized_tile_image))
+        if np.all(letter_image == 255) and np.all(score_image == 255):
+            return None
+        if np.all(score_image == 255):
+            return self.crop_white_background(letter_image), None
+        return self.crop_white_background(letter_image), self.crop_white_background(score_image)
+
+    def get_parse_method(self, model: Optional[str] = None) -> str:
+        """Describes how tiles are parsed, including the versions of the model and glyph dataset, so that
+        tiles cached before any of them changed are parsed again."""
+        model_path = os.path.join(os.environ.get("TESSDATA_PREFIX", ""), f"{model or DEFAULT_LANGUAGE}.traineddata")
+        method = [
+            self.ocr_backend.name.lower(),
+            "montage" if self.montage_ocr else "tile",
+            get_path_version(model_path),
+        ]
+        if self.glyph_dataset is not None:
+            method += ["classifier", get_dataset_version(self.glyph_dataset)]
+        return "/".join(method)
+
+    def parse_tiles(
+        self, tile_images: List[CV2Image], model: Optional[str] = None, reparse: bool = False
+    ) -> List[Tuple[str, int]]:
+        """Parses tiles, taking the ones seen before from the tile cache and parsing identical ones once.
+
+        With reparse, cached tiles are parsed again and replaced in the cache.
+        """
+        if self.tile_cache is None:
+            return self.classify_tiles(tile_images, model)
+
+        method = self.get_parse_method(model)
+        keys = [self.tile_cache.get_key(tile_image, model, method) for tile_image in tile_images]
+        parsed = {} if reparse else self.tile_cache.get_many(keys)
+        uncached: Dict[str, int] = {}
+        for index, key in enumerate(keys):
+            if key not in parsed:
+                uncached.setdefault(key, index)
+
+        if uncached:
+            new_tiles = [tile_images[index] for index in uncached.values()]
+            parsed_tiles = dict(zip(uncached, self.classify_tiles(new_tiles, model)))
+            self.tile_cache.put_many(parsed_tiles)
+            parsed.update(parsed_tiles)
+        return [parsed[key] for key in keys]
+
+    def classify_tiles(self, tile_images: List[CV2Image], model: Optional[str] = None) -> List[Tuple[str, int]]:
+        """Parses tiles with the glyph classifier, OCRing only the tiles it is not confident about."""
+        if not tile_images:
+            return []
+        if self.glyph_dataset is None:
+            return self.ocr_tiles(tile_images, model)
+        classifier = get_tile_classifier(self.glyph_dataset)
+
+        binarized_tile_images = [self.binarize_image(tile_image) for tile_image in tile_images]
+        tile_labels = classifier.tiles.classify([self.crop_white_background(image) for image in binarized_tile_images])
+
+        results: List[Optional[Tuple[str, int]]] = [None] * len(tile_images)
+        letter_indices: List[int] = []
+        letter_images: List[CV2Image] = []
+        score_indices: List[int] = []
+        score_images: List[CV2Image] = []
+        for index, (label, binarized_tile_image) in enumerate(zip(tile_labels, binarized_tile_images)):
+            if label is not None:
+                results[index] = (label, 0)
+                continue
+
+            glyph_images = self.crop_glyph_images(binarized_tile_image)
+            if glyph_images is None:
+                results[index] = ("?", 0)
+                continue
+
+            letter_indices.append(index)
+            letter_images.append(glyph_images[0])
+            if glyph_images[1] is not None:
+                score_indices.append(index)
+                score_images.append(glyph_images[1])
+
+        scores = dict(zip(score_indices, classifier.scores.classify(score_images)))
+        for index, letter in zip(letter_indices, classifier.letters.classify(letter_images)):
+            score = scores.get(index, "0")
+            if letter is not None and score is not None:
+                results[index] = (letter, int(score))
+
+        unclassified = [index for index, result in enumerate(results) if result is None]
+        if unclassified:
+            ocr_results = self.ocr_tiles([tile_images[index] for index in unclassified], model)
+            for index, result in zip(unclassified, ocr_results):
+                results[index] = result
+
+        return [result or ("?", 0) for result in results]
+
+    def ocr_tiles(self, tile_images: List[CV2Image], model: Optional[str] = None) -> List[Tuple[str, int]]:
+        """Parses tiles with Tesseract, one at a time with parse_tile unless montage_ocr is set."""
+        if self.montage_ocr:
+            return self.ocr_tile_montages(tile_images, model)
+        return [self.parse_tile(tile_image, model) for tile_image in tile_images]
+
+    def ocr_tile_montages(self, tile_images: List[CV2Image], model: Optional[str] = None) -> List[Tuple[str, int]]:
+        """Parses tiles like parse_tile, with one Tesseract call for all the tiles, one for their letters
+        and one for their scores instead of up to three per tile. Tiles whose letter the montage pass
+        does not read are parsed on their own with parse_tile."""
+        ocr_config = BATCH_OCR_CONFIG
+        if model:
+            ocr_config += f" -l {model}"
+
+        binarized_tile_images = [self.binarize_image(tile_image) for tile_image in tile_images]
+        initial_ocr = self.read_glyphs(
+            [self.crop_white_background(image) for image in binarized_tile_images], ocr_config
+        )
+
+        results: List[Tuple[str, int]] = [("?", 0)] * len(tile_images)
+        letter_indices: List[int] = []
+        letter_images: List[CV2Image] = []
+        score_indices: List[int] = []
+        score_images: List[CV2Image] = []
+        for index, (text, binarized_tile_image) in enumerate(zip(initial_ocr, binarized_tile_images)):
+            if text in MULTIPLIER_TEXTS:
+                results[index] = (text, 0)
+                continue
+            if text in BLANK_TEXTS:
+                continue
+
+            glyph_images = self.crop_glyph_images(binarized_tile_image)
+            if glyph_images is None:
+                continue
+
+            letter_indices.append(index)
+            letter_images.append(glyph_images[0])
+            if glyph_images[1] is not None:
+                score_indices.append(index)
+                score_images.append(glyph_images[1])
+
+        unread: List[int] = []
+        for index, text in zip(letter_indices, self.read_glyphs(letter_images, f"{ocr_config} {LETTER_WHITELIST}")):
+            results[index] = (text.upper(), 0)
+            if not text:
+                unread.append(index)
+        for index, text in zip(score_indices, self.read_glyphs(score_images, f"{ocr_config} {SCORE_WHITELIST}")):
+            results[index] = (results[index][0], int(text) if text.isdigit() else 0)
+
+        for index in unread:
+            results[index] = self.parse_tile(tile_images[index], model)
+
+        return results
+
     def is_tile_empty(self, tile_image: CV2Image) -> bool:
         cropped_tile_image = tile_image[
             int(tile_image.shape[0] * 0.25) : int(tile_image.shape[0] * 0.75),
@@ -153,26 +629,23 @@ class Parser:
         return False
 
     def crop_tile_images(self, image: CV2Image) -> List[List[CV2Image]]:
-        background_color = image[0, 0]
-
-        bg_rows = [i for i in range(image.shape[0]) if np.allclose(image[i, :], background_color, atol=5)]
+        background_color = np.atleast_1d(image[0, 0]).astype(np.int16)
 
-        bg_cols = [j for j in range(image.shape[1]) if np.allclose(image[:, j], background_color, atol=5)]
+        is_background = cv2.inRange(
+            image,
+            np.clip(background_color - BACKGROUND_TOLERANCE, 0, 255),
+            np.clip(background_color + BACKGROUND_TOLERANCE, 0, 255),
+        )
+        bg_rows = is_background.min(axis=1) > 0
+        bg_cols = is_background.min(axis=0) > 0
 
-        def get_ranges(indices: List[int], max_index: int) -> List[List[int]]:
-            ranges: List[List[int]] = []
-            prev = -2
-            for idx in range(max_index):
-                if idx not in indices:
-                    if idx != prev + 1:
-                        ranges.append([idx, idx])
-                    else:
-                        ranges[-1][1] = idx
-                    prev = idx
-            return ranges
+        def get_ranges(is_background: npt.NDArray[np.bool_]) -> List[List[int]]:
+            """Returns the first and last index of each run of non-background rows or columns."""
+            edges = np.flatnonzero(np.diff(np.concatenate(([True], is_background, [True])).astype(np.int8)))
+            return [[int(start), int(end) - 1] for start, end in zip(edges[::2], edges[1::2])]
 
-        row_ranges = get_ranges(bg_rows, image.shape[0])
-        col_ranges = get_ranges(bg_cols, image.shape[1])
+        row_ranges = get_ranges(bg_rows)
+        col_ranges = get_ranges(bg_cols)
 
         tiles: List[List[CV2Image]] = []
         for r_start, r_end in row_ranges:
@@ -193,18 +666,15 @@ class Parser:
         header_color = screenshot[0, 0]
         board_background_color = screenshot[screenshot.shape[0] // 2, 0]
 
-        on_background = False
-        sections: List[int] = []
-        for i in range(len(screenshot)):
-            pixel_color = screenshot[i, 0]
-            is_background = np.all(pixel_color == board_background_color) or np.all(pixel_color == header_color)
-            if on_background and not is_background:
-                on_background = False
-                sections.append(i)
-            elif not on_background and is_background:
-                on_background = True
-                sections.append(i)
+        first_column = screenshot[:, 0]
+        is_header = first_column == header_color
+        is_board_background = first_column == board_background_color
+        if first_column.ndim == 2:
+            is_header = is_header.all(axis=1)
+            is_board_background = is_board_background.all(axis=1)
 
+        is_background = np.concatenate(([False], is_header | is_board_background)).astype(np.int8)
+        sections = [int(section) for section in np.flatnonzero(np.diff(is_background))]
         sections.append(len(screenshot))
 
         board = screenshot[sections[2] : sections[3], :]
@@ -223,26 +693,45 @@ class Parser:
 
         return board, rack
 
-    def parse_screenshot(self, image_path: str, model: Optional[str] = None) -> Tuple[Board, Rack]:
+    def parse_screenshot(
+        self, image_path: str, model: Optional[str] = None, reparse: bool = False
+    ) -> Tuple[Board, Rack]:
         screenshot = cv2.imread(image_path)
 
         if screenshot is None:
             raise ValueError(f"Image not found at {image_path}")
 
+        return self.parse_screenshot_image(screenshot, model, reparse)
+
+    def parse_screenshot_image(
+        self, screenshot: CV2Image, model: Optional[str] = None, reparse: bool = False
+    ) -> Tuple[Board, Rack]:
         board_image, rack_image = self.crop_board_and_rack_images(screenshot)
         board_cell_images = self.crop_tile_images(board_image)
         rack_tile_images = self.crop_tile_images(rack_image)
 
+        board_positions = [
+            (row_idx, col_idx)
+            for row_idx, row in enumerate(board_cell_images)
+            for col_idx, cell in enumerate(row)
+            if not self.is_tile_empty(cell)
+        ]
+        rack_images = [cell for cell in rack_tile_images[0] if not self.is_tile_empty(cell)]
+        parsed = self.parse_tiles(
+            [board_cell_images[row][col] for row, col in board_positions] + rack_images, model, reparse
+        )
+        parsed_cells = dict(zip(board_positions, parsed))
+
         board_cells: List[List[Cell]] = []
 
         for row_idx, _ in enumerate(board_cell_images):
             board_row: List[Cell] = []
-            for col_idx, cell in enumerate(board_cell_images[row_idx]):
-                if self.is_tile_empty(cell):
+            for col_idx, _ in enumerate(board_cell_images[row_idx]):
+                if (row_idx, col_idx) not in parsed_cells:
                     board_row.append(Cell(row_idx, col_idx))
                     continue
 
-                letter, score = self.parse_tile(cell, model)
+                letter, score = parsed_cells[(row_idx, col_idx)]
                 board_row.append(Cell.from_parsed_cell(letter, score, row_idx, col_idx))
             board_cells.append(board_row)
 
@@ -250,10 +739,7 @@ class Parser:
 
         rack_tiles: List[Tile] = []
 
-        for cell in rack_tile_images[0]:
-            if self.is_tile_empty(cell):
-                continue
-            letter, score = self.parse_tile(cell, model)
+        for letter, score in parsed[len(board_positions) :]:
             if letter:
                 rack_tiles.append(Tile(letter, score))
 
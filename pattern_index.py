@@ -0,0 +1,157 @@
+from collections import Counter
+from enum import Enum
+from typing import Dict, List, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from dawg import Dawg
+from rack import BLANK
+
+WILDCARD = ord("-")
+NUMPY_BATCH_CELLS = 1 << 24
+
+BitsetLengthIndex = Tuple[List[str], List[Dict[str, int]], int]
+NumpyLengthIndex = Tuple["npt.NDArray[np.object_]", "npt.NDArray[np.uint8]"]
+
+
+def filter_by_rack(pattern: str, words: List[str], rack: Counter[str]) -> List[str]:
+    """Keeps the words matching the pattern whose open squares the rack can fill, BLANK counting wildcard tiles."""
+    open_squares = [index for index, letter in enumerate(pattern) if letter == "-"]
+    results: List[str] = []
+    for word in words:
+        needed = Counter(word[index] for index in open_squares)
+        if sum(max(0, count - rack[letter]) for letter, count in needed.items()) <= rack[BLANK]:
+            results.append(word)
+    return results
+
+
+class PatternBackend(Enum):
+    SCAN = 1
+    BITSET = 2
+    NUMPY = 3
+
+
+class PatternIndex:
+    """Scans the DAWG's words for patterns; subclasses build faster indices on top of it."""
+
+    def __init__(self, dawg: Dawg):
+        self.dawg = dawg
+
+    def search_with_pattern(self, pattern: str) -> List[str]:
+        return self.dawg.search_with_pattern(pattern)
+
+    def search_with_patterns(self, patterns: List[str]) -> List[List[str]]:
+        return [self.search_with_pattern(pattern) for pattern in patterns]
+
+
+class BitsetPatternIndex(PatternIndex):
+    """Positional letter bitsets over the words of each length.
+
+    Bit i of the bitset for (length, position, letter) is set when the i-th word of that length
+    has the letter at that position, so a pattern resolves by intersecting one bitset per fixed
+    letter. Lengths are indexed on first use.
+    """
+
+    def __init__(self, dawg: Dawg):
+        super().__init__(dawg)
+        self.lengths: Dict[int, BitsetLengthIndex] = {}
+
+    def get_length_index(self, length: int) -> BitsetLengthIndex:
+        if length not in self.lengths:
+            words = self.dawg.words(length)
+            positions: List[Dict[str, int]] = []
+            for position in range(length):
+                column = "".join(word[position] for word in reversed(words))
+                letters = set(column)
+                bitsets: Dict[str, int] = {}
+                for letter in letters:
+                    table = str.maketrans({other: "1" if other == letter else "0" for other in letters})
+                    bitsets[letter] = int(column.translate(table), 2)
+                positions.append(bitsets)
+            self.lengths[length] = (words, positions, (1 << len(words)) - 1)
+        return self.lengths[length]
+
+    def search_with_pattern(self, pattern: str) -> List[str]:
+        words, positions, mask = self.get_length_index(len(pattern))
+        if not words:
+            return []
+
+        all_words = mask
+        for position, p_char in enumerate(pattern):
+            if p_char != "-":
+                mask &= positions[position].get(p_char, 0)
+                if not mask:
+                    return []
+
+        if mask == all_words:
+            return list(words)
+
+        bits = format(mask, "b")[::-1]
+        results: List[str] = []
+        index = bits.find("1")
+        while index >= 0:
+            results.append(words[index])
+            index = bits.find("1", index + 1)
+        return results
+
+
+class NumpyPatternIndex(PatternIndex):
+    """Words of each length as a contiguous uint8 matrix (words x length), matched column by column.
+
+    Patterns of the same length are matched together, each column comparing every word against
+    every pattern in one vectorized operation.
+    """
+
+    def __init__(self, dawg: Dawg):
+        super().__init__(dawg)
+        self.lengths: Dict[int, NumpyLengthIndex] = {}
+
+    def get_length_index(self, length: int) -> NumpyLengthIndex:
+        if length not in self.lengths:
+            words = self.dawg.words(length)
+            matrix = np.frombuffer("".join(words).encode(), dtype=np.uint8).reshape(len(words), length)
+            self.lengths[length] = (np.array(words, dtype=object), matrix)
+        return self.lengths[length]
+
+    def search_with_pattern(self, pattern: str) -> List[str]:
+        return self.search_with_patterns([pattern])[0]
+
+    def search_with_patterns(self, patterns: List[str]) -> List[List[str]]:
+        results: List[List[str]] = [[] for _ in patterns]
+
+        by_length: Dict[int, List[int]] = {}
+        for i, pattern in enumerate(patterns):
+            by_length.setdefault(len(pattern), []).append(i)
+
+        for length, indices in by_length.items():
+            words, matrix = self.get_length_index(length)
+            if len(words) == 0:
+                continue
+
+            batch_size = max(1, NUMPY_BATCH_CELLS // len(words))
+            for start in range(0, len(indices), batch_size):
+                batch = indices[start : start + batch_size]
+                pattern_matrix = np.frombuffer("".join(patterns[i] for i in batch).encode(), dtype=np.uint8)
+                pattern_matrix = pattern_matrix.reshape(len(batch), length)
+
+                matches = np.ones((len(batch), len(words)), dtype=bool)
+                for column in range(length):
+                    letters = pattern_matrix[:, column]
+                    fixed = letters != WILDCARD
+                    if not fixed.any():
+                        continue
+                    matches[fixed] &= matrix[:, column] == letters[fixed, None]
+
+                for i, row in zip(batch, matches):
+                    results[i] = words[row].tolist()
+
+        return results
+
+
+def create_pattern_index(dawg: Dawg, backend: PatternBackend) -> PatternIndex:
+    if backend == PatternBackend.BITSET:
+        return BitsetPatternIndex(dawg)
+    if backend == PatternBackend.NUMPY:
+        return NumpyPatternIndex(dawg)
+    return PatternIndex(dawg)
@@ -3,7 +3,7 @@ import os
 from typing import List, Tuple
 import uuid
 from collections import Counter, defaultdict
-from parser import CV2Image, Parser
+from parser import GLYPH_DATASET_DIR, CV2Image, Parser
 
 import cv2
 
@@ -12,7 +12,7 @@ from board import Board
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 SCREENSHOTS_DIR = "screenshots"
-DATASET_DIR = os.path.join("dataset", "training")
+DATASET_DIR = GLYPH_DATASET_DIR
 parser = Parser()
 
 letter_counts: Counter[str] = Counter()
@@ -1,8 +1,10 @@
 import json
-from typing import Any, List
+from typing import Any, Dict, List
 
 from tile import Tile
 
+BLANK = "?"
+
 
 class RackEncoder(json.JSONEncoder):
     def default(self, o: Any) -> Any:
@@ -30,6 +32,10 @@ class Rack:
         with open(file_path, "r") as file:
             rack_data = json.load(file)
 
+        return cls.from_json(rack_data)
+
+    @classmethod
+    def from_json(cls, rack_data: List[Dict[str, Any]]) -> "Rack":
         return cls([Tile(tile["letter"], tile["score"]) for tile in rack_data])
 
     def save_rack_to_file(self, file_path: str) -> None:
@@ -0,0 +1,74 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from board import Board
+from dictionary import Dictionary
+from game import GenerationMode
+from rack import Rack
+from sqlite_lru import SqliteLru
+
+RESULT_CACHE_FILE = "results.sqlite"
+MAX_CACHE_SIZE = 64 * 1024 * 1024
+
+
+def get_dictionary_digest(dictionary: Dictionary) -> bytes:
+    """Returns the digest of the word list the dictionary was built from, or of its DAWG if it has none."""
+    dawg = dictionary.get_dawg()
+    return dawg.digest or hashlib.sha256(dawg.data).digest()
+
+
+def get_position_key(board: Board, rack: Rack, mode: GenerationMode, dictionary_digest: bytes) -> str:
+    """Returns a hash of everything the moves depend on: the board cells, the rack's tiles in any
+    order, the move generator and the dictionary."""
+    position = {
+        "board": [[cell.to_json() for cell in board.get_row(row)] for row in range(board.rows)],
+        "rack": sorted((tile.letter, tile.score) for tile in rack.tiles),
+        "mode": mode.name,
+        "dictionary": dictionary_digest.hex(),
+    }
+    return hashlib.sha256(json.dumps(position, separators=(",", ":")).encode()).hexdigest()
+
+
+class ResultCache(SqliteLru):
+    """Ranked moves of solved positions in an SQLite file.
+
+    Entries hold the best count moves of a position in the moves_to_json format, or all of
+    them if count is None. When the stored moves exceed max_size bytes, the least recently
+    used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        dictionary: Dictionary,
+        path: str = RESULT_CACHE_FILE,
+        max_size: int = MAX_CACHE_SIZE,
+        timeout: float = 30,
+    ):
+        super().__init__(
+            path, "results", "moves TEXT NOT NULL, count INTEGER, size INTEGER NOT NULL", weight="size", timeout=timeout
+        )
+        self.dictionary_digest = get_dictionary_digest(dictionary)
+        self.max_size = max_size
+
+    def get_key(self, board: Board, rack: Rack, mode: GenerationMode) -> str:
+        return get_position_key(board, rack, mode, self.dictionary_digest)
+
+    def get(self, key: str, count: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+        """Returns the best count moves of a position, or all of them, if enough of them are stored."""
+        rows = self.select("moves, count", [key])
+        if not rows:
+            return None
+
+        moves: List[Dict[str, Any]] = json.loads(rows[0][1])
+        stored_count: Optional[int] = rows[0][2]
+        if stored_count is not None and len(moves) == stored_count and (count is None or count > stored_count):
+            return None
+
+        self.touch([key])
+        return moves if count is None else moves[:count]
+
+    def put(self, key: str, moves: List[Dict[str, Any]], count: Optional[int] = None) -> None:
+        """Stores the best count moves of a position, or all of them, then evicts to the size limit."""
+        data = json.dumps(moves, separators=(",", ":"))
+        self.insert("moves, count, size", [(key, data, count, len(data))], self.max_size)
@@ -0,0 +1,303 @@
+import argparse
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, TypeVar
+from urllib.parse import parse_qs, urlsplit
+from parser import Parser
+
+import cv2
+import numpy as np
+
+from board import Board
+from budget import Budget
+from dictionary import Dictionary
+from game import Game, GenerationMode, moves_to_json
+from parallel_solver import create_executor, get_worker_dictionary, get_worker_line_moves
+from rack import Rack
+from result_cache import RESULT_CACHE_FILE, ResultCache
+
+DICTIONARY_FILE = "dictionary.txt"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_MOVE_COUNT = 10
+MAX_BODY_SIZE = 32 * 1024 * 1024
+LATENCY_WINDOW = 1024
+CACHE_TIMEOUT = 1
+
+T = TypeVar("T")
+
+
+class RequestError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def solve(
+    board: Board, rack: Rack, mode: GenerationMode, count: int, deadline: Optional[float] = None
+) -> Dict[str, Any]:
+    """Returns the best moves, searching the most valuable squares first when there is a time.monotonic() deadline."""
+    game = Game(get_worker_dictionary(), board, rack, mode, get_worker_line_moves())
+    game.validate_board()
+    budget = Budget.until(deadline)
+    moves = game.top_k(count, budget=budget, prioritized=deadline is not None)
+    return {"moves": moves_to_json(moves), "exhaustive": not budget.stopped}
+
+
+def parse_image(image: bytes, model: Optional[str] = None) -> Tuple[Any, Any]:
+    """Parses an encoded screenshot in a worker, returning the board and rack in the board.json and rack.json formats."""
+    screenshot = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if screenshot is None:
+        raise ValueError("Screenshot could not be decoded")
+
+    board, rack = Parser().parse_screenshot_image(screenshot, model)
+    return [[cell.to_json() for cell in row] for row in board.cells], [tile.to_json() for tile in rack.tiles]
+
+
+class LatencyMetrics:
+    """Request counts, errors and latency percentiles per route over the most recent requests."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.latencies: Dict[str, Deque[float]] = {}
+        self.in_flight = 0
+
+    def record(self, route: str, seconds: float, error: bool) -> None:
+        self.counts[route] = self.counts.get(route, 0) + 1
+        self.errors[route] = self.errors.get(route, 0) + error
+        self.latencies.setdefault(route, deque(maxlen=self.window)).append(seconds)
+
+    def to_json(self) -> Dict[str, Any]:
+        routes: Dict[str, Any] = {}
+        for route, latencies in self.latencies.items():
+            milliseconds = np.array(latencies) * 1000
+            routes[route] = {
+                "count": self.counts[route],
+                "errors": self.errors[route],
+                "mean_ms": round(float(milliseconds.mean()), 3),
+                "p50_ms": round(float(np.percentile(milliseconds, 50)), 3),
+                "p95_ms": round(float(np.percentile(milliseconds, 95)), 3),
+                "p99_ms": round(float(np.percentile(milliseconds, 99)), 3),
+                "max_ms": round(float(milliseconds.max()), 3),
+            }
+        return {"in_flight": self.in_flight, "routes": routes}
+
+
+class SolveService:
+    """Local HTTP API for the solver, keeping the dictionary and a pool of solve workers warm.
+
+    POST /solve takes {"board": ..., "rack": ...} in the board.json and rack.json formats,
+    POST /solve/screenshot takes an image as the request body, and both accept generator and
+    count query parameters, and a budget in milliseconds after which the best moves found so
+    far are returned, with exhaustive saying whether the search finished. Parsing and solving
+    run on the process pool, so the event loop keeps serving requests, and positions found in
+    the result cache are answered without solving; GET /metrics reports request latencies.
+    """
+
+    def __init__(
+        self, executor: Executor, mode: GenerationMode = GenerationMode.PATTERN, cache: Optional[ResultCache] = None
+    ):
+        self.executor = executor
+        self.mode = mode
+        self.cache = cache
+        # The result cache's SQLite calls can wait on other processes' locks, so they run on a thread, one at a time.
+        self.cache_executor = ThreadPoolExecutor(1)
+        self.metrics = LatencyMetrics()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        start = time.perf_counter()
+        route = "invalid"
+        status = HTTPStatus.INTERNAL_SERVER_ERROR
+        self.metrics.in_flight += 1
+        try:
+            try:
+                method, target, body = await self.read_request(reader)
+                route = f"{method} {urlsplit(target).path}"
+                status, response = await self.route(method, target, body)
+            except RequestError as e:
+                status, response = e.status, {"error": str(e)}
+            except Exception as e:
+                logging.exception(f"Request failed: {route}")
+                status, response = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+
+            self.write_response(writer, status, response)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            self.metrics.in_flight -= 1
+            self.metrics.record(route, time.perf_counter() - start, status >= HTTPStatus.BAD_REQUEST)
+
+    async def read_request(self, reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            method, target, _ = request_line
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Malformed Content-Length")
+        if length > MAX_BODY_SIZE:
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body is too large")
+
+        try:
+            body = await reader.readexactly(length) if length else b""
+        except asyncio.IncompleteReadError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Request body is shorter than its Content-Length")
+        return method.upper(), target, body
+
+    def write_response(self, writer: asyncio.StreamWriter, status: HTTPStatus, response: Any) -> None:
+        body = json.dumps(response).encode()
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode() + body
+        )
+
+    async def route(self, method: str, target: str, body: bytes) -> Tuple[HTTPStatus, Any]:
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+        if method == "GET" and url.path == "/health":
+            return HTTPStatus.OK, {"status": "ok"}
+        if method == "GET" and url.path == "/metrics":
+            return HTTPStatus.OK, self.metrics.to_json()
+        if method == "POST" and url.path == "/solve":
+            try:
+                request = json.loads(body)
+                board_data, rack_data = request["board"], request["rack"]
+            except (ValueError, KeyError, TypeError):
+                raise RequestError(HTTPStatus.BAD_REQUEST, "Expected a JSON object with board and rack")
+            return await self.solve_position(board_data, rack_data, query, self.get_deadline(query))
+        if method == "POST" and url.path == "/solve/screenshot":
+            if not body:
+                raise RequestError(HTTPStatus.BAD_REQUEST, "Expected a screenshot as the request body")
+            deadline = self.get_deadline(query)
+            board_data, rack_data = await self.run(parse_image, body, query.get("model"))
+            status, result = await self.solve_position(board_data, rack_data, query, deadline)
+            result["board"], result["rack"] = board_data, rack_data
+            return status, result
+
+        raise RequestError(HTTPStatus.NOT_FOUND, f"No route for {method} {url.path}")
+
+    async def solve_position(
+        self, board_data: Any, rack_data: Any, query: Dict[str, str], deadline: Optional[float] = None
+    ) -> Tuple[HTTPStatus, Any]:
+        """Solves a position, stopping at the deadline, which was set when the request arrived so that
+        waiting for a worker and parsing the screenshot count against the budget too."""
+        mode, count = self.get_mode(query), self.get_count(query)
+        try:
+            board, rack = Board.from_json(board_data), Rack.from_json(rack_data)
+        except (ValueError, KeyError, TypeError) as e:
+            raise RequestError(HTTPStatus.UNPROCESSABLE_ENTITY, str(e))
+
+        key = self.cache.get_key(board, rack, mode) if self.cache is not None else ""
+        moves = await self.run_cache(self.cache.get, key, count) if self.cache is not None else None
+        if moves is not None:
+            return HTTPStatus.OK, {"moves": moves, "exhaustive": True, "cached": True}
+
+        result = await self.run(solve, board, rack, mode, count, deadline)
+        if self.cache is not None and result["exhaustive"]:
+            await self.run_cache(self.cache.put, key, result["moves"], count)
+        result["cached"] = False
+        return HTTPStatus.OK, result
+
+    async def run_cache(self, function: Callable[..., Optional[T]], *args: Any) -> Optional[T]:
+        """Runs a result cache call on the cache thread, treating a cache locked for too long as a miss."""
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.cache_executor, function, *args)
+        except sqlite3.OperationalError as e:
+            logging.warning(f"Result cache call failed: {e}")
+            return None
+
+    async def run(self, function: Callable[..., T], *args: Any) -> T:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+        except (ValueError, KeyError, TypeError) as e:
+            raise RequestError(HTTPStatus.UNPROCESSABLE_ENTITY, str(e))
+
+    def get_mode(self, query: Dict[str, str]) -> GenerationMode:
+        generator = query.get("generator")
+        if generator is None:
+            return self.mode
+        try:
+            return GenerationMode[generator.upper()]
+        except KeyError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Unknown generator: {generator}")
+
+    def get_count(self, query: Dict[str, str]) -> int:
+        try:
+            count = int(query.get("count", DEFAULT_MOVE_COUNT))
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "count must be an integer")
+        if count < 1:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "count must be positive")
+        return count
+
+    def get_deadline(self, query: Dict[str, str]) -> Optional[float]:
+        """Returns the time.monotonic() deadline a budget query parameter in milliseconds sets from now."""
+        budget = query.get("budget")
+        if budget is None:
+            return None
+        try:
+            milliseconds = float(budget)
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "budget must be a number of milliseconds")
+        if milliseconds < 0:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "budget must not be negative")
+        return time.monotonic() + milliseconds / 1000
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        logging.info(f"Serving on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Words With Friends Solver service")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="Number of solve processes (0 for one per CPU)")
+    parser.add_argument(
+        "-g",
+        "--generator",
+        choices=[mode.name.lower() for mode in GenerationMode],
+        default=GenerationMode.PATTERN.name.lower(),
+        help="Default move generation strategy",
+    )
+    parser.add_argument("--cache", default=RESULT_CACHE_FILE, help="File caching the moves of solved positions")
+    parser.add_argument("--no-cache", action="store_true", help="Solve without reading or writing cached moves")
+    args = parser.parse_args()
+
+    dictionary = Dictionary(DICTIONARY_FILE)
+    with create_executor(dictionary, args.workers or None) as executor:
+        cache = None if args.no_cache else ResultCache(dictionary, args.cache, timeout=CACHE_TIMEOUT)
+        service = SolveService(executor, GenerationMode[args.generator.upper()], cache)
+        asyncio.run(service.serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
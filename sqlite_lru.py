@@ -0,0 +1,70 @@
+import sqlite3
+from typing import Any, List, Sequence, Tuple
+
+
+class SqliteLru:
+    """A table of keyed rows in an SQLite file, shared by processes using the same file.
+
+    Every row has a used counter, set to one more than the largest in the table when the row
+    is written or touched, so the rows with the smallest are the least recently used. Writes
+    evict those rows until the sum of the weight expression over the rest is within a limit.
+    The table can be used from a thread other than the one creating it, by one thread at a
+    time; calls wait up to timeout seconds for other processes' writes.
+    """
+
+    def __init__(self, path: str, table: str, columns: str, weight: str = "1", timeout: float = 30):
+        self.table = table
+        self.weight = weight
+        self.next_use = f"SELECT COALESCE(MAX(used), 0) + 1 FROM {table}"
+        self.connection = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self.connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, {columns}, used INTEGER NOT NULL)"
+        )
+        self.connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_used ON {table} (used)")
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def select(self, columns: str, keys: Sequence[str]) -> List[Tuple[Any, ...]]:
+        """Returns the key and columns of the stored rows among keys, without touching them."""
+        if not keys:
+            return []
+        placeholders = ", ".join("?" * len(keys))
+        return self.connection.execute(
+            f"SELECT key, {columns} FROM {self.table} WHERE key IN ({placeholders})", list(keys)
+        ).fetchall()
+
+    def touch(self, keys: Sequence[str]) -> None:
+        """Marks rows as the most recently used."""
+        if keys:
+            self.connection.execute(
+                f"UPDATE {self.table} SET used = ({self.next_use}) WHERE key IN ({', '.join('?' * len(keys))})",
+                list(keys),
+            )
+
+    def insert(self, columns: str, rows: Sequence[Tuple[Any, ...]], limit: int) -> None:
+        """Stores rows of a key and columns as the most recently used, then evicts to the limit."""
+        if not rows:
+            return
+
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            used = self.connection.execute(self.next_use).fetchone()[0]
+            placeholders = ", ".join("?" * (len(rows[0]) + 1))
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, {columns}, used) VALUES ({placeholders})",
+                [(*row, used) for row in rows],
+            )
+            self.evict(limit)
+
+    def evict(self, limit: int) -> None:
+        """Deletes the least recently used rows until the weight of the rest is within the limit."""
+        total = self.connection.execute(f"SELECT COALESCE(SUM({self.weight}), 0) FROM {self.table}").fetchone()[0]
+        if total <= limit:
+            return
+        self.connection.execute(
+            f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM (SELECT key, "
+            f"SUM({self.weight}) OVER (ORDER BY used DESC, key ROWS UNBOUNDED PRECEDING) AS kept FROM {self.table}) "
+            "WHERE kept > ?)",
+            (limit,),
+        )
@@ -0,0 +1,81 @@
+import unittest
+from array_board import ArrayBoard
+from board import Board
+from cell import Cell, Multiplier
+from dictionary import Dictionary
+from game import Game, GenerationMode
+from rack import Rack
+from tile import Tile
+from word import Word
+
+
+class TestArrayBoard(unittest.TestCase):
+    def setUp(self):
+        """Set up a board with CAT in the middle and its array-backed copy."""
+        cells = [[Cell(row=r, col=c) for c in range(15)] for r in range(15)]
+        cells[7][10] = Cell(7, 10, multiplier=Multiplier.DL)
+        cells[0][0] = Cell(0, 0, multiplier=Multiplier.TW)
+        self.board = Board(cells)
+        self.board.add_word(
+            Word(
+                [
+                    Cell(7, 7, Tile("C", 4)),
+                    Cell(7, 8, Tile("A", 1)),
+                    Cell(7, 9, Tile("T", 1)),
+                ]
+            )
+        )
+        self.array_board = ArrayBoard.from_board(self.board)
+
+    def test_cells_match_board(self):
+        """Test that get_cell returns the same cells as the list-based board."""
+        self.assertEqual(self.array_board.cells, self.board.cells)
+        self.assertEqual(self.array_board.get_cell(7, 8), Cell(7, 8, Tile("A", 1)))
+        self.assertEqual(self.array_board.get_cell(0, 0), Cell(0, 0, multiplier=Multiplier.TW))
+        self.assertEqual(self.array_board.get_col(8), self.board.get_col(8))
+
+    def test_invalid_board(self):
+        """Test that ragged boards are rejected."""
+        with self.assertRaises(ValueError):
+            ArrayBoard([[Cell(0, 0), Cell(0, 1)], [Cell(1, 0)]])
+
+    def test_neighbour_checks(self):
+        """Test that emptiness and touching checks match the list-based board."""
+        self.assertFalse(self.array_board.is_board_empty())
+        self.assertTrue(ArrayBoard([[Cell(row=r, col=c) for c in range(15)] for r in range(15)]).is_board_empty())
+        for row in range(15):
+            for col in range(15):
+                self.assertEqual(self.array_board.cell_touches_tile(row, col), self.board.cell_touches_tile(row, col))
+
+    def test_clone_is_copy_on_write(self):
+        """Test that placing a word on a clone leaves the original untouched, and the other way round."""
+        clone = self.array_board.clone()
+        self.assertIs(clone.letters, self.array_board.letters)
+
+        clone.add_word(Word([Cell(7, 10, Tile("S", 1), Multiplier.DL)]))
+        self.assertEqual(str(clone.get_board_words()[0]), "CATS")
+        self.assertEqual(str(self.array_board.get_board_words()[0]), "CAT")
+        self.assertTrue(clone.cell_touches_tile(7, 11))
+        self.assertFalse(self.array_board.cell_touches_tile(7, 11))
+
+        self.array_board.add_word(Word([Cell(6, 7, Tile("A", 1)), Cell(7, 7, Tile("C", 4))]))
+        self.assertIsNone(clone.get_cell(6, 7).tile)
+
+    def test_game_results_match_board(self):
+        """Test that solving on the array board gives the same moves as on the list-based board."""
+        dictionary = Dictionary()
+        for word in ["AT", "TA", "CAT", "CATS", "SCAT", "ACT", "BAT", "TAB", "TABS", "AB", "BA"]:
+            dictionary.insert(word)
+        rack = Rack([Tile("B", 4), Tile("A", 1), Tile("S", 1), Tile("T", 1)])
+
+        for mode in GenerationMode:
+            expected = Game(dictionary, self.board, rack, mode).get_scored_possible_words()
+            self.assertGreater(len(expected), 0)
+            self.assertEqual(Game(dictionary, self.array_board, rack, mode).get_scored_possible_words(), expected)
+            self.assertEqual(
+                Game(dictionary, self.array_board, rack, mode).get_scored_possible_words(incremental=False), expected
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
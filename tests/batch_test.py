@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+from batch import BOARD_FILE, MOVES_FILE, RACK_FILE, process_batch
+from cell import Cell
+from fixtures import make_cat_board, make_dictionary, make_empty_board
+from game import Game, moves_to_json
+from rack import Rack
+from tile import Tile
+from word import Word
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        """Set up a screenshot directory with parsed boards and racks."""
+        self.dictionary = make_dictionary()
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.screenshot_dir = self.temp_dir.name
+
+        self.board = make_cat_board()
+        self.racks = {
+            "first": Rack([Tile("B", 4), Tile("A", 1), Tile("S", 1)]),
+            "second": Rack([Tile("S", 1), Tile("T", 1)]),
+        }
+        for name, rack in self.racks.items():
+            self.save_screenshot(name, self.board, rack)
+
+    def save_screenshot(self, name, board, rack):
+        path = os.path.join(self.screenshot_dir, name)
+        os.makedirs(path)
+        board.save_board_to_file(os.path.join(path, BOARD_FILE))
+        rack.save_rack_to_file(os.path.join(path, RACK_FILE))
+
+    def load_moves(self, name):
+        with open(os.path.join(self.screenshot_dir, name, MOVES_FILE)) as file:
+            return json.load(file)
+
+    def test_solves_every_screenshot(self):
+        """Test that each screenshot's best moves are written next to it."""
+        results = process_batch(self.screenshot_dir, self.dictionary, solve_workers=2, queue_size=1)
+
+        self.assertEqual(results, {"first": True, "second": True})
+        for name, rack in self.racks.items():
+            expected = moves_to_json(Game(self.dictionary, self.board, rack).get_scored_possible_words()[:10])
+            self.assertEqual(self.load_moves(name), expected)
+
+    def test_failures_are_reported(self):
+        """Test that screenshots that cannot be parsed or solved are reported without stopping the batch."""
+        os.makedirs(os.path.join(self.screenshot_dir, "unparsed"))
+        invalid_board = make_empty_board()
+        invalid_board.add_word(Word([Cell(7, 7, Tile("X", 8)), Cell(7, 8, Tile("Q", 10))]))
+        self.save_screenshot("invalid", invalid_board, self.racks["first"])
+
+        results = process_batch(self.screenshot_dir, self.dictionary)
+
+        self.assertEqual(results, {"first": True, "second": True, "unparsed": False, "invalid": False})
+        self.assertFalse(os.path.exists(os.path.join(self.screenshot_dir, "invalid", MOVES_FILE)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -100,6 +100,18 @@ class TestBoard(unittest.TestCase):
         self.assertEqual(self.board.cells[7][8].tile.letter, "B")
         self.assertEqual(self.board.cells[7][9].tile.letter, "C")
 
+    def test_incremental_board_data(self):
+        """Test that anchors and board words kept up to date by add_word match a fresh board's."""
+        self.board.add_word(Word([self.cell_A, self.cell_B, self.cell_C]))
+        self.assertIn((7, 6), self.board.get_anchors())
+        self.board.get_board_words()
+        self.board.add_word(Word([Cell(6, 9, Tile("A", 1)), self.cell_C, Cell(8, 9, Tile("B", 3))]))
+        self.assertEqual(self.board.get_placed_since(3), [Cell(6, 9, Tile("A", 1)), Cell(8, 9, Tile("B", 3))])
+
+        fresh_board = Board(self.board.cells)
+        self.assertEqual(self.board.get_anchors(), fresh_board.get_anchors())
+        self.assertEqual(self.board.get_board_words(), fresh_board.get_board_words())
+
     def test_save_and_load_board(self):
         """Test saving and loading a board from a file."""
         file_path = "test_board.json"
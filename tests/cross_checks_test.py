@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import patch
+from array_board import ArrayBoard
+from board import Board, Direction
+from cell import Cell, Multiplier
+from cross_checks import CrossChecks
+from dawg import Dawg
+from tile import Tile
+from word import Word
+
+WORDS = ["AT", "TA", "CAT", "CAB", "BAT", "TAB", "AB", "BA"]
+
+
+class TestCrossChecks(unittest.TestCase):
+    def setUp(self):
+        """Set up a board with CAT in the middle, the A on a double word square."""
+        self.dawg = Dawg.from_words(WORDS)
+        self.board = Board([[Cell(row=r, col=c) for c in range(15)] for r in range(15)])
+        self.board.add_word(
+            Word(
+                [
+                    Cell(7, 7, Tile("C", 4)),
+                    Cell(7, 8, Tile("A", 1), Multiplier.DW),
+                    Cell(7, 9, Tile("T", 1)),
+                ]
+            )
+        )
+
+    def test_letters(self):
+        """Test that constrained cells only allow letters forming perpendicular words."""
+        cross_checks = CrossChecks.for_board(self.board, self.dawg)
+        self.assertEqual(cross_checks.letters[Direction.HORIZONTAL][(6, 8)], {"B", "T"})
+        self.assertEqual(cross_checks.letters[Direction.VERTICAL][(7, 6)], set())
+        self.assertNotIn((5, 8), cross_checks.letters[Direction.HORIZONTAL])
+
+    def test_scores(self):
+        """Test that the partial score covers the existing tiles and their word multipliers."""
+        cross_checks = CrossChecks.for_board(self.board, self.dawg)
+        self.assertEqual(cross_checks.scores[Direction.HORIZONTAL][(6, 8)], (1, 2))
+        self.assertEqual(cross_checks.scores[Direction.VERTICAL][(7, 10)], (6, 2))
+
+    def test_cached_on_board(self):
+        """Test that the cross-checks are computed once per board and dictionary."""
+        cross_checks = CrossChecks.for_board(self.board, self.dawg)
+        self.assertIs(CrossChecks.for_board(self.board, self.dawg), cross_checks)
+        self.assertIsNot(CrossChecks.for_board(self.board, Dawg.from_words(WORDS)), cross_checks)
+
+    def test_updated_by_add_word(self):
+        """Test that placing a word updates the cached cross-checks to match freshly computed ones."""
+        cross_checks = CrossChecks.for_board(self.board, self.dawg)
+        clone = self.board.clone()
+        self.board.add_word(Word([Cell(6, 8, Tile("T", 1)), Cell(6, 9, Tile("A", 1))]))
+
+        updated = CrossChecks.for_board(self.board, self.dawg)
+        self.assertIsNot(updated, cross_checks)
+        self.assertNotIn((6, 8), updated.letters[Direction.HORIZONTAL])
+        fresh = CrossChecks(Board(self.board.cells), self.dawg)
+        self.assertEqual(updated.letters, fresh.letters)
+        self.assertEqual(updated.scores, fresh.scores)
+        self.assertIn((6, 8), CrossChecks.for_board(clone, self.dawg).letters[Direction.HORIZONTAL])
+
+    def test_clone_reuses_cross_checks(self):
+        """Test that a clone starts from its board's cross-checks and updates a copy of them when a word is added."""
+        for board in (self.board, ArrayBoard.from_board(self.board)):
+            cross_checks = CrossChecks.for_board(board, self.dawg)
+            clone = board.clone()
+            self.assertIs(clone.cross_checks, cross_checks)
+
+            clone.add_word(Word([Cell(6, 8, Tile("T", 1)), Cell(6, 9, Tile("A", 1))]))
+            with patch.object(CrossChecks, "compute", side_effect=AssertionError("computed from scratch")):
+                updated = CrossChecks.for_board(clone, self.dawg)
+            self.assertIs(updated.board, clone)
+            fresh = CrossChecks(Board(clone.cells), self.dawg)
+            self.assertEqual(updated.letters, fresh.letters)
+            self.assertEqual(updated.scores, fresh.scores)
+            self.assertIs(CrossChecks.for_board(board, self.dawg), cross_checks)
+            self.assertIn((6, 8), cross_checks.letters[Direction.HORIZONTAL])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+from dawg import Dawg
+from dictionary import Dictionary
+
+WORDS = ["CAT", "CATS", "BAT", "BATS", "AT", "TA", "TAB", "SCAT", "ZA"]
+
+
+class TestDawg(unittest.TestCase):
+    def setUp(self):
+        """Set up a DAWG over a small word list."""
+        self.dawg = Dawg.from_words(WORDS)
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_search(self):
+        """Test that words and only words are found."""
+        for word in WORDS:
+            self.assertTrue(self.dawg.search(word))
+        self.assertFalse(self.dawg.search("CA"))
+        self.assertFalse(self.dawg.search("CATSS"))
+        self.assertFalse(self.dawg.search("DOG"))
+
+    def test_shares_suffixes(self):
+        """Test that equivalent suffixes are merged into shared nodes."""
+        cat = self.dawg.walk(self.dawg.root, "CA")
+        bat = self.dawg.walk(self.dawg.root, "BA")
+        self.assertEqual(cat, bat)
+
+    def test_search_with_pattern(self):
+        """Test matching fixed letters and wildcards in words of the pattern length."""
+        self.assertEqual(self.dawg.search_with_pattern("-AT"), ["BAT", "CAT"])
+        self.assertEqual(self.dawg.search_with_pattern("-A-S"), ["BATS", "CATS"])
+        self.assertEqual(self.dawg.search_with_pattern("--"), ["AT", "TA", "ZA"])
+        self.assertEqual(self.dawg.search_with_pattern("------"), [])
+
+    def test_search_with_rack(self):
+        """Test that pattern matches are pruned to what the rack can supply."""
+        self.assertEqual(self.dawg.search_with_rack("-AT", Counter("C")), ["CAT"])
+        self.assertEqual(self.dawg.search_with_rack("-AT", Counter("?")), ["BAT", "CAT"])
+        self.assertEqual(self.dawg.search_with_rack("--", Counter("AT")), ["AT", "TA"])
+        self.assertEqual(self.dawg.search_with_rack("---S", Counter("CT")), [])
+        self.assertEqual(self.dawg.search_with_rack("---S", Counter("CAT")), ["CATS"])
+
+    def test_words(self):
+        """Test listing all words and the words of one length."""
+        self.assertEqual(self.dawg.words(), ["AT", "TA", "ZA", "BAT", "CAT", "TAB", "BATS", "CATS", "SCAT"])
+        self.assertEqual(self.dawg.words(3), ["BAT", "CAT", "TAB"])
+        self.assertEqual(self.dawg.words(9), [])
+
+    def test_save_and_load(self):
+        """Test that a saved DAWG is memory-mapped back with the same contents."""
+        file_path = os.path.join(self.temp_dir.name, "words.dawg")
+        self.dawg.save(file_path)
+
+        loaded = Dawg.load(file_path)
+        self.assertEqual(len(loaded), len(self.dawg))
+        self.assertEqual(loaded.words(), self.dawg.words())
+        self.assertTrue(loaded.search("SCAT"))
+        self.assertEqual(loaded.search_with_pattern("T--"), ["TAB"])
+
+    def test_invalid_data(self):
+        """Test that data without the DAWG header is rejected."""
+        with self.assertRaises(ValueError):
+            Dawg(b"not a dawg file at all")
+
+    def test_dictionary_from_dawg_file(self):
+        """Test loading a dictionary from a saved DAWG file."""
+        dictionary = Dictionary()
+        for word in WORDS:
+            dictionary.insert(word)
+
+        file_path = os.path.join(self.temp_dir.name, "words.dawg")
+        dictionary.save_to_file(file_path)
+
+        loaded = Dictionary(file_path)
+        self.assertTrue(loaded.search("BATS"))
+        self.assertEqual(loaded.search_with_pattern("-AT"), ["BAT", "CAT"])
+
+        loaded.insert("CAB")
+        self.assertTrue(loaded.search("CAB"))
+        self.assertTrue(loaded.search("BATS"))
+
+
+if __name__ == "__main__":
+    unittest.main()
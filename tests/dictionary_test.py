@@ -0,0 +1,91 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from add_to_dictionary import add_word_to_dictionary
+from dawg import Dawg
+from dictionary import Dictionary, get_cache_path, get_file_digest
+
+WORDS = ["AT", "BAT", "BATS", "CAT", "CATS", "SCAT", "TA", "TAB"]
+
+
+class TestDictionaryCache(unittest.TestCase):
+    def setUp(self):
+        """Set up a word list in a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, "words.txt")
+        self.cache_path = get_cache_path(self.filename)
+        with open(self.filename, "w") as f:
+            f.write("\n".join(WORDS))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_cache_is_written(self):
+        """Test that loading a word list writes a cache tagged with its digest."""
+        dictionary = Dictionary(self.filename)
+        self.assertTrue(dictionary.search("SCAT"))
+        self.assertTrue(os.path.exists(self.cache_path))
+        self.assertEqual(Dawg.load(self.cache_path).digest, get_file_digest(self.filename))
+
+    def test_fresh_cache_is_reused(self):
+        """Test that a fresh cache is loaded instead of the word list."""
+        Dictionary(self.filename)
+        Dawg.from_words(["CACHED"], get_file_digest(self.filename)).save(self.cache_path)
+
+        dictionary = Dictionary(self.filename)
+        self.assertTrue(dictionary.search("CACHED"))
+        self.assertFalse(dictionary.search("CAT"))
+
+    def test_stale_cache_is_rebuilt(self):
+        """Test that changing the word list invalidates the cache."""
+        Dictionary(self.filename)
+        with open(self.filename, "a") as f:
+            f.write("\nZA")
+
+        dictionary = Dictionary(self.filename)
+        self.assertTrue(dictionary.search("ZA"))
+        self.assertTrue(Dawg.load(self.cache_path).search("ZA"))
+
+    def test_without_cache(self):
+        """Test that the cache can be disabled."""
+        dictionary = Dictionary(self.filename, use_cache=False)
+        self.assertTrue(dictionary.search("CAT"))
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def test_gaddag_cache(self):
+        """Test that the GADDAG is cached next to the word list."""
+        Dictionary(self.filename, gaddag=True)
+        gaddag_path = get_cache_path(self.filename, ".gaddag")
+        self.assertTrue(os.path.exists(gaddag_path))
+
+        dictionary = Dictionary(self.filename, gaddag=True)
+        self.assertIn(("CAT", 2), dictionary.search_through_hook("T", ["C", "A"]))
+
+    def test_extend_matches_full_build(self):
+        """Test that extending a DAWG gives the same minimal DAWG as building it from scratch."""
+        new_words = ["BA", "CAB", "CABS", "SCATS", "A", "TABS"]
+        extended = Dawg.from_words(WORDS).extend(new_words)
+        rebuilt = Dawg.from_words(WORDS + new_words)
+
+        self.assertEqual(extended.words(), rebuilt.words())
+        self.assertEqual(len(extended), len(rebuilt))
+        for word in WORDS + new_words:
+            self.assertTrue(extended.search(word))
+        self.assertFalse(extended.search("CA"))
+
+    def test_add_to_dictionary_updates_cache(self):
+        """Test that adding a word extends the cache rather than invalidating it."""
+        Dictionary(self.filename)
+        with redirect_stdout(io.StringIO()):
+            add_word_to_dictionary("cab", self.filename)
+
+        dawg = Dawg.load(self.cache_path)
+        self.assertEqual(dawg.digest, get_file_digest(self.filename))
+        self.assertTrue(dawg.search("CAB"))
+        self.assertTrue(Dictionary(self.filename).search("CAB"))
+
+
+if __name__ == "__main__":
+    unittest.main()
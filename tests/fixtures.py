@@ -0,0 +1,43 @@
+import cv2
+import numpy as np
+
+from board import Board
+from cell import Cell
+from dictionary import Dictionary
+from tile import Tile
+from word import Word
+
+WORDS = ["AT", "TA", "CAT", "CAB", "BAT", "TAB", "ACT", "SCAT", "CATS", "BATS", "TABS", "AB", "BA"]
+
+
+def make_dictionary(words=WORDS):
+    """Returns a dictionary of the small word list shared by the solver tests."""
+    dictionary = Dictionary()
+    for word in words:
+        dictionary.insert(word)
+    return dictionary
+
+
+def make_empty_board(multipliers=None):
+    """Returns an empty 15x15 board, with multipliers by (row, col)."""
+    multipliers = multipliers or {}
+    return Board([[Cell(row=r, col=c, multiplier=multipliers.get((r, c))) for c in range(15)] for r in range(15)])
+
+
+def make_cat_board(multipliers=None):
+    """Returns a board with CAT across the middle row, from the centre."""
+    board = make_empty_board(multipliers)
+    board.add_word(Word([Cell(7, 7, Tile("C", 4)), Cell(7, 8, Tile("A", 1)), Cell(7, 9, Tile("T", 1))]))
+    return board
+
+
+def make_tile(letter: str, score: int = 0) -> np.ndarray:
+    """Draws a tile with a letter, and a score in its top right corner unless it is zero."""
+    tile = np.full((165, 165, 3), (180, 220, 250), dtype=np.uint8)
+    if len(letter) > 1:
+        cv2.putText(tile, letter, (35, 100), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (40, 40, 40), 4)
+        return tile
+    cv2.putText(tile, letter, (35, 140), cv2.FONT_HERSHEY_SIMPLEX, 3, (40, 40, 40), 8)
+    if score:
+        cv2.putText(tile, str(score), (115, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (40, 40, 40), 3)
+    return tile
@@ -0,0 +1,68 @@
+import unittest
+from dictionary import Dictionary
+from gaddag import SEPARATOR, Gaddag
+
+WORDS = ["CARE", "CAR", "CAT", "CATS", "SCAT", "ACT", "ARC", "RACE", "AT", "TA"]
+
+
+class TestGaddag(unittest.TestCase):
+    def setUp(self):
+        """Set up a GADDAG over a small word list."""
+        self.gaddag = Gaddag.from_words(WORDS)
+
+    def accepts(self, string):
+        node = self.gaddag.root
+        for letter in string:
+            node = self.gaddag.child(node, letter)
+            if node is None:
+                return False
+        return self.gaddag.is_end_of_word(node)
+
+    def test_contains_every_split(self):
+        """Test that every word is stored once per split point."""
+        for word in WORDS:
+            for i in range(1, len(word) + 1):
+                self.assertTrue(self.accepts(word[:i][::-1] + SEPARATOR + word[i:]), word)
+
+    def test_rejects_unknown_paths(self):
+        """Test that strings that are not words are not accepted."""
+        self.assertFalse(self.accepts("TAC"))
+        self.assertFalse(self.accepts("TA" + SEPARATOR + "C"))
+        self.assertFalse(self.accepts("A" + SEPARATOR + "C"))
+
+    def test_search_through_hook(self):
+        """Test finding words through a hook letter with a rack."""
+        results = self.gaddag.search_through_hook("A", ["C", "T", "S"])
+        self.assertEqual(
+            sorted(results),
+            [("ACT", 0), ("AT", 0), ("CAT", 1), ("CATS", 1), ("SCAT", 2), ("TA", 1)],
+        )
+
+    def test_search_through_hook_respects_rack_counts(self):
+        """Test that rack letters are only used as often as they are held."""
+        results = self.gaddag.search_through_hook("R", ["A", "C"])
+        self.assertIn(("ARC", 1), results)
+        self.assertIn(("CAR", 2), results)
+        self.assertNotIn(("CARE", 2), results)
+
+    def test_search_through_hook_with_blank(self):
+        """Test that a blank can stand in for any letter."""
+        results = self.gaddag.search_through_hook("R", ["A", "C", "?"])
+        self.assertIn(("CARE", 2), results)
+        self.assertIn(("RACE", 0), results)
+
+    def test_dictionary_search_through_hook(self):
+        """Test that the dictionary builds its GADDAG once and reuses it."""
+        dictionary = Dictionary()
+        for word in WORDS:
+            dictionary.insert(word)
+
+        self.assertIsNone(dictionary.gaddag)
+        self.assertIn(("CAT", 2), dictionary.search_through_hook("T", ["C", "A"]))
+        gaddag = dictionary.gaddag
+        dictionary.search_through_hook("C", ["A", "T"])
+        self.assertIs(dictionary.gaddag, gaddag)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,12 @@
 import unittest
-from unittest.mock import MagicMock
-from game import Game
+from unittest.mock import MagicMock, patch
+from game import Game, GenerationMode
 from board import Board, Direction
+from budget import Budget
 from cell import Cell
 from dictionary import Dictionary
+from fixtures import make_cat_board, make_dictionary
+from pattern_index import PatternBackend
 from rack import Rack
 from tile import Tile
 from word import Word
@@ -11,10 +14,11 @@ from word import Word
 
 class TestGame(unittest.TestCase):
     def setUp(self):
-        """Set up a game with a mock dictionary, board, and rack."""
+        """Set up a game with a mock dictionary, board, and rack, and a real dictionary with CAT on a board."""
         self.dictionary = MagicMock()
         self.dictionary.search.return_value = True
         self.dictionary.search_with_pattern.return_value = ["CAT", "BAT"]
+        self.dictionary.search_with_rack.return_value = ["CAT", "BAT"]
 
         self.tile_A = Tile(letter="A", score=1)
         self.tile_B = Tile(letter="B", score=3)
@@ -32,6 +36,10 @@ class TestGame(unittest.TestCase):
 
         self.game = Game(dictionary=self.dictionary, board=self.board, rack=self.rack)
 
+        self.cat_dictionary = make_dictionary()
+        self.cat_board = make_cat_board()
+        self.cat_rack = Rack([Tile("B", 4), Tile("A", 1), Tile("S", 1), Tile("T", 1)])
+
     def test_game_initialization(self):
         """Test that the game initializes correctly."""
         self.assertEqual(self.game.board, self.board)
@@ -76,6 +84,32 @@ class TestGame(unittest.TestCase):
         valid_words = self.game.find_words_for_series(series, set())
         self.assertTrue(any(str(word) == "CAT" for word in valid_words))
 
+    def test_find_words_for_series_with_repeated_letters(self):
+        """Test that every tile of a repeated rack letter can be placed."""
+        dictionary = Dictionary()
+        for word in ["TATT", "TAT", "TA"]:
+            dictionary.insert(word)
+        rack = Rack([Tile("T", 1), Tile("T", 1), Tile("?", 0)])
+        game = Game(dictionary=dictionary, board=self.board, rack=rack)
+        series = [Cell(7, 7), self.cell_A, Cell(7, 9), Cell(7, 10)]
+
+        valid_words = game.find_words_for_series(series, set())
+        self.assertEqual([str(word) for word in valid_words], ["TATT"])
+        self.assertEqual([cell.tile.score for cell in valid_words[0].cells], [1, 1, 1, 0])
+
+    def test_find_words_for_series_with_blank_last_letter(self):
+        """Test that words whose last letter comes from a blank are found with every pattern backend."""
+        for backend in PatternBackend:
+            dictionary = Dictionary(pattern_backend=backend)
+            for word in ["CAT", "CATS"]:
+                dictionary.insert(word)
+            game = Game(dictionary=dictionary, board=self.board, rack=Rack([Tile("?", 0)]))
+            series = [self.cell_C, self.cell_A, self.cell_T, Cell(7, 10)]
+
+            valid_words = game.find_words_for_series(series, set())
+            self.assertEqual([str(word) for word in valid_words], ["CATS"], backend)
+            self.assertEqual(valid_words[0].cells[-1].tile, Tile("S", 0))
+
     def test_validate_board(self):
         """Test board validation against the dictionary."""
         word = Word([self.cell_C, self.cell_A, self.cell_T])
@@ -96,6 +130,86 @@ class TestGame(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.game.validate_board()
 
+    def test_top_k_matches_sorted_moves(self):
+        """Test that the top k moves, with and without the score bound, are the head of the full ranking."""
+        for mode in GenerationMode:
+            game = Game(self.cat_dictionary, self.cat_board, self.cat_rack, mode)
+            moves = game.get_scored_possible_words()
+            self.assertGreater(len(moves), 5)
+            for k in [0, 1, 5, len(moves) + 1]:
+                for bound in [False, True]:
+                    self.assertEqual(game.top_k(k, bound), moves[:k])
+
+    def test_score_bound(self):
+        """Test that the score bound is exact for valid placements."""
+        for mode in GenerationMode:
+            game = Game(self.cat_dictionary, self.cat_board, self.cat_rack, mode)
+            for word in game.get_possible_words():
+                scored_word = game.score_word(word, [])
+                if scored_word is not None:
+                    self.assertEqual(game.get_score_bound(word), scored_word[1])
+
+    def test_lazy_enumeration(self):
+        """Test that the lazy moves match the scored moves and an unlimited budget is exhaustive."""
+        for mode in GenerationMode:
+            game = Game(self.cat_dictionary, self.cat_board, self.cat_rack, mode)
+            budget = Budget()
+            self.assertEqual(list(game.iter_possible_words(budget)), game.get_possible_words())
+            self.assertEqual(list(game.iter_scored_possible_words()), game.score_words(game.get_possible_words()))
+            self.assertFalse(budget.stopped)
+
+    def test_budget_stops_enumeration(self):
+        """Test that an expired or cancelled budget stops the enumeration early."""
+        for mode in GenerationMode:
+            game = Game(self.cat_dictionary, self.cat_board, self.cat_rack, mode)
+            budget = Budget(0)
+            self.assertEqual(list(game.iter_possible_words(budget)), [])
+            self.assertTrue(budget.stopped)
+
+            budget = Budget()
+            moves = game.iter_scored_possible_words(budget)
+            first = next(moves)
+            budget.cancel()
+            self.assertLess(len([first, *moves]), len(game.get_scored_possible_words()))
+            self.assertTrue(budget.stopped)
+
+    def test_prioritized_search(self):
+        """Test that a prioritized search ranks like the usual order and anytime solving finds the best move."""
+        for mode in GenerationMode:
+            game = Game(self.cat_dictionary, self.cat_board, self.cat_rack, mode)
+            moves = game.get_scored_possible_words()
+            for bound in [False, True]:
+                self.assertEqual(game.top_k(5, bound, prioritized=True), moves[:5])
+            self.assertEqual(game.solve_anytime(), (moves[0], True))
+            self.assertEqual(game.solve_anytime(0), (None, False))
+
+    def test_duplicate_placements_are_scored_once(self):
+        """Test that a placement found from both its row and its column is scored once."""
+        for word in ["SAT", "AS", "SA", "TAS"]:
+            self.cat_dictionary.insert(word)
+        self.cat_board.add_word(Word([Cell(5, 9, Tile("S", 1)), Cell(6, 9, Tile("A", 1)), Cell(7, 9, Tile("T", 1))]))
+
+        for mode in GenerationMode:
+            game = Game(self.cat_dictionary, self.cat_board, self.cat_rack, mode)
+            moves = game.get_scored_possible_words()
+            keys = [game.get_placement_key(words) for words, _, _ in moves]
+            self.assertEqual(len(keys), len(set(keys)))
+            self.assertGreater(game.duplicate_count, 0)
+            self.assertEqual(game.get_scored_possible_words(incremental=False), moves)
+            self.assertEqual(game.top_k(len(moves)), moves)
+            self.assertEqual(game.top_k(len(moves), prioritized=True), moves)
+
+    def test_numpy_backend_batches_patterns(self):
+        """Test that the numpy backend matches the series of each length in one batch, finding the scan's words."""
+        expected = Game(self.cat_dictionary, self.cat_board, self.cat_rack).get_possible_words()
+        self.cat_dictionary.set_pattern_backend(PatternBackend.NUMPY)
+        index = self.cat_dictionary.get_pattern_index()
+        game = Game(self.cat_dictionary, self.cat_board, self.cat_rack)
+
+        with patch.object(index, "search_with_patterns", wraps=index.search_with_patterns) as search_with_patterns:
+            self.assertEqual(game.get_possible_words(), expected)
+        self.assertEqual(search_with_patterns.call_count, len({len(series) for series in game.get_all_series()}))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+from board import Direction
+from cell import Cell, Multiplier
+from fixtures import make_cat_board, make_dictionary, make_empty_board
+from game import Game, GenerationMode
+from move_generator import LineMoveCache, MoveGenerator
+from rack import Rack
+from tile import Tile
+from word import Word
+
+
+class TestMoveGenerator(unittest.TestCase):
+    def setUp(self):
+        """Set up a small dictionary and a board with CAT in the middle."""
+        self.dictionary = make_dictionary()
+
+        self.board = make_cat_board()
+
+        self.rack = Rack([Tile("B", 4), Tile("A", 1), Tile("S", 1), Tile("T", 1)])
+
+    def test_anchors_on_empty_board(self):
+        """Test that the centre is the only anchor on an empty board."""
+        empty_board = make_empty_board()
+        generator = MoveGenerator(self.dictionary, empty_board, self.rack)
+        self.assertEqual(generator.anchors, {(7, 7)})
+
+    def test_anchors_surround_tiles(self):
+        """Test that anchors are the empty cells touching a tile."""
+        generator = MoveGenerator(self.dictionary, self.board, self.rack)
+        self.assertIn((7, 6), generator.anchors)
+        self.assertIn((7, 10), generator.anchors)
+        self.assertIn((6, 8), generator.anchors)
+        self.assertNotIn((7, 7), generator.anchors)
+        self.assertNotIn((5, 8), generator.anchors)
+
+    def test_cross_checks(self):
+        """Test that cross-checks only allow letters forming perpendicular words."""
+        generator = MoveGenerator(self.dictionary, self.board, self.rack)
+        horizontal = generator.cross_checks[Direction.HORIZONTAL]
+
+        self.assertEqual(horizontal[(6, 8)], {"B", "T"})
+        self.assertEqual(horizontal[(8, 8)], {"T", "B"})
+        self.assertEqual(horizontal[(6, 7)], set())
+        self.assertNotIn((5, 8), horizontal)
+
+    def test_generated_words_are_valid(self):
+        """Test that every generated word is in the dictionary and placable."""
+        words = MoveGenerator(self.dictionary, self.board, self.rack).generate()
+        self.assertGreater(len(words), 0)
+        for word in words:
+            self.assertTrue(self.dictionary.search(str(word)))
+            self.assertTrue(self.board.word_is_placable(word))
+
+    def test_extends_existing_word(self):
+        """Test that words are built through tiles already on the board."""
+        words = MoveGenerator(self.dictionary, self.board, self.rack).generate()
+        self.assertIn("CATS", [str(word) for word in words])
+        self.assertIn("SCAT", [str(word) for word in words])
+
+    def test_rack_letters_used_once(self):
+        """Test that a rack letter cannot be placed more often than it is held."""
+        self.dictionary.insert("TATS")
+        rack = Rack([Tile("T", 1), Tile("S", 1)])
+        words = MoveGenerator(self.dictionary, self.board, rack).generate()
+        self.assertNotIn("TATS", [str(word) for word in words])
+
+    def test_blank_tile(self):
+        """Test that a blank can stand in for any letter and scores as the blank."""
+        rack = Rack([Tile("?", 0)])
+        words = MoveGenerator(self.dictionary, self.board, rack).generate()
+        cats = [word for word in words if str(word) == "CATS"]
+        self.assertEqual(len(cats), 1)
+        self.assertEqual(cats[0].cells[-1].tile, Tile("S", 0))
+
+    def test_matches_pattern_generator(self):
+        """Test that the anchor mode scores every move found by the pattern mode."""
+        pattern_game = Game(self.dictionary, self.board, self.rack, GenerationMode.PATTERN)
+        anchor_game = Game(self.dictionary, self.board, self.rack, GenerationMode.ANCHOR)
+
+        def key(move):
+            words, score, placed = move
+            return (tuple(sorted(str(word) for word in words)), score, placed)
+
+        pattern_moves = {key(move) for move in pattern_game.get_scored_possible_words()}
+        anchor_moves = {key(move) for move in anchor_game.get_scored_possible_words()}
+
+        self.assertGreater(len(pattern_moves), 0)
+        self.assertTrue(pattern_moves.issubset(anchor_moves))
+
+    def test_incremental_scoring_matches_clone(self):
+        """Test that incremental scoring gives the same moves as scoring on a cloned board, bingo included."""
+        self.dictionary.insert("TABLETS")
+        board = make_cat_board({(1, 10): Multiplier.TW, (7, 10): Multiplier.DL, (8, 8): Multiplier.DW})
+        rack = Rack([Tile(letter, 1) for letter in "TABLETS"])
+        game = Game(self.dictionary, board, rack, GenerationMode.ANCHOR)
+
+        incremental = game.get_scored_possible_words()
+        cloned = game.get_scored_possible_words(incremental=False)
+
+        self.assertEqual(incremental, cloned)
+        bingo = [move for move in incremental if [str(word) for word in move[0]] == ["CATS", "TABLETS"]]
+        self.assertEqual(len(bingo), 1)
+        self.assertEqual(bingo[0][1:], (4 + 1 + 1 + 2 + 3 * (6 + 2) + 40, 7))
+
+    def test_line_moves_are_cached(self):
+        """Test that only the lines a move changed are generated again for the same rack."""
+        line_moves = LineMoveCache()
+        Game(self.dictionary, self.board, self.rack, GenerationMode.ANCHOR, line_moves).get_possible_words()
+        self.assertEqual(len(line_moves), 30)
+
+        self.board.add_word(Word([Cell(7, 10, Tile("S", 1))]))
+        game = Game(self.dictionary, self.board, self.rack, GenerationMode.ANCHOR, line_moves)
+        cached_words = game.get_possible_words()
+        # Rows 6 to 8, columns 10 and 11, and column 6, whose cross-check before CATS changed.
+        self.assertEqual(len(line_moves), 30 + 6)
+
+        shuffled_rack = Rack(list(reversed(self.rack.tiles)))
+        self.assertEqual(
+            Game(self.dictionary, self.board, shuffled_rack, GenerationMode.ANCHOR).get_possible_words(), cached_words
+        )
+
+    def test_line_moves_follow_dictionary(self):
+        """Test that cached line moves are dropped once the dictionary has changed."""
+        line_moves = LineMoveCache()
+        Game(self.dictionary, self.board, self.rack, GenerationMode.ANCHOR, line_moves).get_possible_words()
+
+        self.dictionary.insert("STAB")
+        words = Game(self.dictionary, self.board, self.rack, GenerationMode.ANCHOR, line_moves).get_possible_words()
+        self.assertEqual(
+            words, Game(self.dictionary, self.board, self.rack, GenerationMode.ANCHOR).get_possible_words()
+        )
+        self.assertIn("STAB", [str(word) for word in words])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from cell import Cell, Multiplier
+from fixtures import WORDS, make_cat_board, make_dictionary, make_empty_board
+from game import Game, GenerationMode
+from parallel_solver import ParallelSolver, get_worker_line_moves, set_worker_dictionary, solve_lines, split
+from rack import Rack
+from tile import Tile
+from word import Word
+
+
+class TestParallelSolver(unittest.TestCase):
+    def setUp(self):
+        """Set up a small dictionary, a board with CAT in the middle and a two worker solver."""
+        self.dictionary = make_dictionary(WORDS + ["STAB"])
+        self.board = make_cat_board({(6, 8): Multiplier.TL})
+        self.rack = Rack([Tile("B", 4), Tile("A", 1), Tile("S", 1), Tile("T", 1)])
+
+        self.solver = ParallelSolver(self.dictionary, workers=2)
+        self.addCleanup(self.solver.close)
+
+    def test_split(self):
+        """Test that items are split into contiguous chunks that keep their order."""
+        self.assertEqual(split(list(range(7)), 3), [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEqual(split([1, 2], 8), [[1], [2]])
+        self.assertEqual(split([], 4), [])
+
+    def test_matches_serial_solver(self):
+        """Test that both generators rank moves exactly like the serial solver."""
+        for mode in GenerationMode:
+            expected = Game(self.dictionary, self.board, self.rack, mode).get_scored_possible_words()
+            self.assertGreater(len(expected), 0)
+            self.assertEqual(self.solver.get_scored_possible_words(self.board, self.rack, mode), expected)
+
+    def test_empty_board(self):
+        """Test that the opening move is solved like the serial solver."""
+        board = make_empty_board()
+        for mode in GenerationMode:
+            expected = Game(self.dictionary, board, self.rack, mode).get_scored_possible_words()
+            self.assertEqual(self.solver.get_scored_possible_words(board, self.rack, mode), expected)
+
+    def test_worker_line_moves(self):
+        """Test that a worker's solves share its line moves, so only the lines a move changed are generated again."""
+        set_worker_dictionary(self.dictionary)
+        lines = Game(self.dictionary, self.board, self.rack, GenerationMode.ANCHOR).get_lines()
+        solve_lines(self.board, self.rack, lines)
+        self.assertEqual(len(get_worker_line_moves()), 30)
+
+        self.board.add_word(Word([Cell(7, 10, Tile("S", 1))]))
+        solve_lines(self.board, self.rack, lines)
+        self.assertEqual(len(get_worker_line_moves()), 30 + 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
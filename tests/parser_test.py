@@ -0,0 +1,278 @@
+import ctypes
+import os
+import tempfile
+import unittest
+from unittest.mock import ANY, MagicMock, patch
+from parser import (
+    GLYPH_PADDING,
+    GLYPH_SIZE,
+    LETTER_WHITELIST,
+    SCORE_WHITELIST,
+    LibTesseractEngine,
+    OcrBackend,
+    OcrEngine,
+    Parser,
+    get_ocr_engine,
+    parse_ocr_config,
+)
+
+import cv2
+import numpy as np
+
+from fixtures import make_tile
+from tile_cache import TileCache
+
+
+def make_screenshot() -> np.ndarray:
+    """Draws a screenshot with a header, a 5x5 board of 100 pixel tiles and a rack of 3 tiles, separated by bars."""
+    screenshot = np.full((1200, 540, 3), (120, 120, 120), dtype=np.uint8)
+    screenshot[:100] = (30, 30, 30)
+    screenshot[150:700] = screenshot[800:950] = (20, 20, 20)
+    for row in range(5):
+        for col in range(5):
+            screenshot[170 + row * 104 : 270 + row * 104, 10 + col * 104 : 110 + col * 104] = (50, 45, 40)
+    for col in range(3):
+        screenshot[810:880, 20 + col * 80 : 90 + col * 80] = (180, 220, 250)
+    return screenshot
+
+
+class FakeTesseractLibrary:
+    """Stands in for libtesseract, returning the given text from GetUTF8Text and GetTsvText."""
+
+    def __init__(self, text: str):
+        self.text = ctypes.create_string_buffer(text.encode())
+        self.variables = {b"tessedit_char_whitelist": b""}
+        self.TessBaseAPICreate = MagicMock(return_value=1)
+        self.TessBaseAPIInit2 = MagicMock(return_value=0)
+        self.TessBaseAPISetPageSegMode = MagicMock()
+        self.TessBaseAPISetVariable = MagicMock(side_effect=self.set_variable)
+        self.TessBaseAPIGetStringVariable = MagicMock(side_effect=lambda api, name: self.variables.get(name))
+        self.TessBaseAPISetImage = MagicMock()
+        self.TessBaseAPIGetUTF8Text = MagicMock(return_value=ctypes.addressof(self.text))
+        self.TessBaseAPIGetTsvText = MagicMock(return_value=ctypes.addressof(self.text))
+        self.TessDeleteText = MagicMock()
+        self.TessBaseAPIClear = MagicMock()
+        self.TessBaseAPIDelete = MagicMock()
+
+    def set_variable(self, api: int, name: bytes, value: bytes) -> bool:
+        if name not in self.variables:
+            return False
+        self.variables[name] = value
+        return True
+
+
+class TestParser(unittest.TestCase):
+    def setUp(self):
+        """Set up a glyph dataset like prepare_dataset.py writes, from tiles of A, B, C and DL."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.parser = Parser(glyph_dataset=self.temp_dir.name)
+
+        examples = []
+        for letter, score in (("A", 1), ("B", 4), ("C", 4)):
+            binarized_tile_image = self.parser.binarize_image(make_tile(letter, score))
+            letter_image, score_image = self.parser.crop_glyph_images(binarized_tile_image)
+            examples += [(letter_image, letter), (score_image, str(score))]
+        examples.append((self.parser.crop_white_background(self.parser.binarize_image(make_tile("DL"))), "DL"))
+
+        for index, (image, text) in enumerate(examples):
+            cv2.imwrite(os.path.join(self.temp_dir.name, f"{text}_{index}.png"), image)
+            with open(os.path.join(self.temp_dir.name, f"{text}_{index}.gt.txt"), "w") as f:
+                f.write(text)
+
+    def test_classified_tiles(self):
+        """Test that tiles matching the dataset's glyphs are parsed without OCR."""
+        tiles = [make_tile("B", 4), make_tile("DL"), make_tile("A", 1), make_tile("C", 4)]
+        with patch.object(Parser, "ocr_tiles") as ocr_tiles:
+            self.assertEqual(self.parser.parse_tiles(tiles), [("B", 4), ("DL", 0), ("A", 1), ("C", 4)])
+        ocr_tiles.assert_not_called()
+
+    def test_unclassified_tiles_are_ocred(self):
+        """Test that only the tiles unlike any glyph in the dataset are OCRed."""
+        tiles = [make_tile("A", 1), make_tile("W", 10), make_tile("B", 4)]
+        with patch.object(Parser, "ocr_tiles", return_value=[("W", 10)]) as ocr_tiles:
+            self.assertEqual(self.parser.parse_tiles(tiles), [("A", 1), ("W", 10), ("B", 4)])
+        self.assertEqual(len(ocr_tiles.call_args.args[0]), 1)
+        self.assertTrue(np.array_equal(ocr_tiles.call_args.args[0][0], tiles[1]))
+
+    def test_crop_board_and_rack_images(self):
+        """Test that the board and rack are cropped from the background sections of the first column."""
+        screenshot = make_screenshot()
+        board_image, rack_image = self.parser.crop_board_and_rack_images(screenshot)
+        self.assertTrue(np.array_equal(board_image, screenshot[150:700]))
+        self.assertTrue(np.array_equal(rack_image, screenshot[805:882, 5:534]))
+
+    def test_crop_tile_images(self):
+        """Test that tiles are cropped between the background rows and columns, and resized."""
+        board_image, rack_image = self.parser.crop_board_and_rack_images(make_screenshot())
+        board_tiles = self.parser.crop_tile_images(board_image)
+        self.assertEqual((len(board_tiles), len(board_tiles[0])), (5, 5))
+        self.assertEqual(board_tiles[4][4].shape, (165, 165, 3))
+        self.assertTrue(np.all(board_tiles[2][3] == (50, 45, 40)))
+
+        rack_tiles = self.parser.crop_tile_images(rack_image)
+        self.assertEqual((len(rack_tiles), len(rack_tiles[0])), (1, 3))
+        gray_tiles = self.parser.crop_tile_images(cv2.cvtColor(board_image, cv2.COLOR_BGR2GRAY))
+        self.assertEqual((len(gray_tiles), len(gray_tiles[0])), (5, 5))
+
+    def test_montage_slots(self):
+        """Test that the words read from a montage go to the slot they lie in, ignoring blank and stray words."""
+        slot = GLYPH_SIZE + 2 * GLYPH_PADDING
+        words = [("T", 30, 28), ("W", 70, 30), ("X", 30, 3 * slot + 28), (" ", 30, slot + 28), ("7", 30, 2 * slot + 30)]
+        data = {
+            "text": [text for text, _, _ in words],
+            "left": [left for _, left, _ in words],
+            "top": [top for _, _, top in words],
+            "height": [80] * len(words),
+        }
+        glyph_images = [np.full((50, 50), 255, dtype=np.uint8)] * 3
+
+        with patch.object(OcrEngine, "image_to_data", return_value=data) as image_to_data:
+            self.assertEqual(self.parser.read_glyphs(glyph_images, ""), ["TW", "", "7"])
+        self.assertEqual(image_to_data.call_args.args[0].shape, (3 * slot, slot))
+
+    def test_ocr_tiles(self):
+        """Test that each montage OCR pass is mapped back to its tile, and a letter it misses is read on its own."""
+        slot = GLYPH_SIZE + 2 * GLYPH_PADDING
+        texts = {
+            "": ["A", "TW", "B"],
+            LETTER_WHITELIST: ["a", ""],
+            SCORE_WHITELIST: ["1", "4"],
+        }
+
+        def image_to_data(image, config):
+            whitelist = next(
+                (whitelist for whitelist in (LETTER_WHITELIST, SCORE_WHITELIST) if whitelist in config), ""
+            )
+            pass_texts = texts[whitelist] + ["?"]
+            return {
+                "text": pass_texts,
+                "left": [30] * len(pass_texts),
+                "top": [index * slot + 30 for index in range(len(pass_texts))],
+                "height": [80] * len(pass_texts),
+            }
+
+        tiles = [make_tile("A", 1), make_tile("DL"), make_tile("B", 4), make_tile("")]
+        with patch.object(OcrEngine, "image_to_data", side_effect=image_to_data), patch.object(
+            Parser, "parse_tile", return_value=("B", 4)
+        ) as parse_tile:
+            self.assertEqual(self.parser.ocr_tile_montages(tiles), [("A", 1), ("TW", 0), ("B", 4), ("?", 0)])
+        parse_tile.assert_called_once()
+        self.assertIs(parse_tile.call_args.args[0], tiles[2])
+
+    def test_montage_ocr_is_opt_in(self):
+        """Test that tiles are OCRed one at a time unless montage OCR is enabled."""
+        tiles = [make_tile("A", 1), make_tile("B", 4)]
+        with patch.object(Parser, "parse_tile", return_value=("A", 1)) as parse_tile, patch.object(
+            Parser, "ocr_tile_montages", return_value=[("A", 1), ("B", 4)]
+        ) as ocr_tile_montages:
+            self.assertEqual(self.parser.ocr_tiles(tiles), [("A", 1), ("A", 1)])
+            self.assertEqual(parse_tile.call_count, 2)
+            ocr_tile_montages.assert_not_called()
+
+            self.parser.montage_ocr = True
+            self.assertEqual(self.parser.ocr_tiles(tiles), [("A", 1), ("B", 4)])
+            self.assertEqual(parse_tile.call_count, 2)
+
+    def test_parse_ocr_config(self):
+        """Test that a tesseract config is split into its modes, language and -c variables."""
+        self.assertEqual(
+            parse_ocr_config("--psm 6 --oem 1 -l words-with-cheaters -c tessedit_char_whitelist=0123456789"),
+            (6, 1, "words-with-cheaters", {"tessedit_char_whitelist": "0123456789"}),
+        )
+        self.assertEqual(parse_ocr_config(""), (3, 3, "eng", {}))
+
+    def test_ocr_engine_fallback(self):
+        """Test that the libtesseract backend falls back to pytesseract when the library cannot be loaded."""
+        with patch.dict("parser.ocr_engines", clear=True), patch("ctypes.util.find_library", return_value=None):
+            with self.assertLogs(level="WARNING"):
+                engine = get_ocr_engine(OcrBackend.LIBTESSERACT)
+            self.assertIs(type(engine), OcrEngine)
+            self.assertIs(get_ocr_engine(OcrBackend.LIBTESSERACT), engine)
+
+    def test_lib_tesseract_image_to_data(self):
+        """Test that libtesseract's TSV is parsed into columns like pytesseract's, skipping short lines."""
+        library = FakeTesseractLibrary(
+            "1\t1\t0\t0\t0\t0\t0\t0\t144\t288\t-1\t\n"
+            "5\t1\t1\t1\t1\t1\t30\t28\t40\t80\t96.5\tTW\n"
+            "5\t1\t1\t1\t2\t1\t30\t172\n"
+        )
+        engine = LibTesseractEngine(library)
+        data = engine.image_to_data(np.full((288, 144), 255, dtype=np.uint8), "--psm 6 --oem 1 -l words")
+
+        self.assertEqual(data["text"], ["", "TW"])
+        self.assertEqual(data["top"], [0, 28])
+        self.assertEqual(data["conf"], [-1, 96])
+        library.TessBaseAPIInit2.assert_called_once_with(1, None, b"words", 1)
+        library.TessBaseAPISetPageSegMode.assert_called_once_with(1, 6)
+        library.TessBaseAPISetImage.assert_called_once_with(1, ANY, 144, 288, 1, 144)
+        library.TessDeleteText.assert_called_once_with(ctypes.addressof(library.text))
+        library.TessBaseAPIClear.assert_called_once_with(1)
+
+    def test_lib_tesseract_variables(self):
+        """Test that one API is kept per language, and variables a call does not set are restored."""
+        library = FakeTesseractLibrary("A\n")
+        engine = LibTesseractEngine(library)
+        image = np.full((10, 10), 255, dtype=np.uint8)
+
+        self.assertEqual(engine.image_to_string(image, "--psm 10 -c tessedit_char_whitelist=AB"), "A\n")
+        self.assertEqual(library.variables[b"tessedit_char_whitelist"], b"AB")
+        engine.image_to_string(image, "--psm 10")
+        self.assertEqual(library.variables[b"tessedit_char_whitelist"], b"")
+        library.TessBaseAPICreate.assert_called_once()
+
+        with self.assertRaises(ValueError):
+            engine.image_to_string(image, "-c unknown_variable=1")
+        library.TessBaseAPIInit2.return_value = -1
+        with self.assertRaises(RuntimeError):
+            engine.image_to_string(image, "-l missing")
+        library.TessBaseAPIDelete.assert_called_once()
+
+    def test_cached_tiles(self):
+        """Test that identical tiles are parsed once and tiles seen before are taken from the tile cache."""
+        self.parser.tile_cache = TileCache(os.path.join(self.temp_dir.name, "tiles.sqlite"))
+        self.addCleanup(self.parser.tile_cache.close)
+        tiles = [make_tile("A", 1), make_tile("W", 10), make_tile("A", 1)]
+
+        with patch.object(Parser, "ocr_tiles", return_value=[("W", 10)]) as ocr_tiles:
+            self.assertEqual(self.parser.parse_tiles(tiles), [("A", 1), ("W", 10), ("A", 1)])
+            self.assertEqual(
+                self.parser.parse_tiles(tiles + [make_tile("B", 4)]), [("A", 1), ("W", 10), ("A", 1), ("B", 4)]
+            )
+        ocr_tiles.assert_called_once()
+
+        with patch.object(Parser, "classify_tiles") as classify_tiles:
+            self.assertEqual(self.parser.parse_tiles(tiles), [("A", 1), ("W", 10), ("A", 1)])
+        classify_tiles.assert_not_called()
+
+        with patch.object(Parser, "ocr_tiles", return_value=[("M", 10)]):
+            self.assertEqual(self.parser.parse_tiles(tiles, reparse=True), [("A", 1), ("M", 10), ("A", 1)])
+        self.assertEqual(self.parser.parse_tiles(tiles), [("A", 1), ("M", 10), ("A", 1)])
+
+    def test_parse_method(self):
+        """Test that the parse method changes with the OCR backend, montage OCR, the model and the glyph dataset."""
+        tessdata = tempfile.TemporaryDirectory()
+        self.addCleanup(tessdata.cleanup)
+        model_path = os.path.join(tessdata.name, "words.traineddata")
+        with open(model_path, "w") as f:
+            f.write("model")
+
+        with patch.dict(os.environ, {"TESSDATA_PREFIX": tessdata.name}):
+            methods = [self.parser.get_parse_method("words")]
+            os.utime(model_path, ns=(0, 0))
+            methods.append(self.parser.get_parse_method("words"))
+            self.parser.montage_ocr = True
+            methods.append(self.parser.get_parse_method("words"))
+            self.parser.ocr_backend = OcrBackend.LIBTESSERACT
+            methods.append(self.parser.get_parse_method("words"))
+            with open(os.path.join(self.temp_dir.name, "Z_99.gt.txt"), "w") as f:
+                f.write("Z")
+            methods.append(self.parser.get_parse_method("words"))
+            self.parser.glyph_dataset = None
+            methods.append(self.parser.get_parse_method("words"))
+            self.assertEqual(self.parser.get_parse_method("words"), methods[-1])
+        self.assertEqual(len(set(methods)), len(methods))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import itertools
+import unittest
+from collections import Counter
+from unittest.mock import patch
+from dawg import Dawg
+from dictionary import Dictionary
+from pattern_index import BitsetPatternIndex, NumpyPatternIndex, PatternBackend, PatternIndex, filter_by_rack
+
+WORDS = ["AT", "TA", "ZA", "BAT", "CAT", "TAB", "TAT", "BATS", "CATS", "SCAT", "TABS"]
+
+
+class TestPatternIndex(unittest.TestCase):
+    def setUp(self):
+        """Set up pattern indices over a small DAWG."""
+        self.dawg = Dawg.from_words(WORDS)
+        self.index = BitsetPatternIndex(self.dawg)
+        self.numpy_index = NumpyPatternIndex(self.dawg)
+
+    def test_search_with_pattern(self):
+        """Test intersecting the bitsets of the fixed letters."""
+        self.assertEqual(self.index.search_with_pattern("-AT"), ["BAT", "CAT", "TAT"])
+        self.assertEqual(self.index.search_with_pattern("T-T"), ["TAT"])
+        self.assertEqual(self.index.search_with_pattern("--"), ["AT", "TA", "ZA"])
+        self.assertEqual(self.index.search_with_pattern("-X-"), [])
+        self.assertEqual(self.index.search_with_pattern("-------"), [])
+
+    def test_matches_scanning(self):
+        """Test that every pattern gives the same result as scanning the words."""
+        scan_index = PatternIndex(self.dawg)
+        for length in range(2, 5):
+            for pattern in itertools.product("-ABCST", repeat=length):
+                pattern = "".join(pattern)
+                expected = scan_index.search_with_pattern(pattern)
+                self.assertEqual(self.index.search_with_pattern(pattern), expected, pattern)
+                self.assertEqual(self.numpy_index.search_with_pattern(pattern), expected, pattern)
+
+    def test_numpy_batch(self):
+        """Test matching a batch of patterns of mixed lengths in one call."""
+        patterns = ["-AT", "--", "T--S", "-AT", "Q-", "---------"]
+        self.assertEqual(
+            self.numpy_index.search_with_patterns(patterns),
+            [self.index.search_with_pattern(pattern) for pattern in patterns],
+        )
+
+    def test_lengths_indexed_on_demand(self):
+        """Test that only the lengths that were searched are indexed."""
+        self.index.search_with_pattern("-A-")
+        self.assertEqual(list(self.index.lengths), [3])
+
+    def test_dictionary_matches_cache_is_bounded(self):
+        """Test that the dictionary keeps only the most recently used patterns."""
+        dictionary = Dictionary()
+        for word in WORDS:
+            dictionary.insert(word)
+
+        with patch("dictionary.MATCHES_CACHE_SIZE", 2):
+            dictionary.search_with_pattern("-AT")
+            dictionary.search_with_pattern("--")
+            dictionary.search_with_pattern("-AT")
+            dictionary.search_with_pattern("T---")
+
+        self.assertEqual(list(dictionary.matches), ["-AT", "T---"])
+
+    def test_dictionary_search_with_patterns(self):
+        """Test that batched dictionary searches fill the matches cache for every backend."""
+        for backend in PatternBackend:
+            dictionary = Dictionary(pattern_backend=backend)
+            for word in WORDS:
+                dictionary.insert(word)
+
+            results = dictionary.search_with_patterns(["-AT", "T-", "-AT"])
+            self.assertEqual(results, [["BAT", "CAT", "TAT"], ["TA"], ["BAT", "CAT", "TAT"]])
+            self.assertEqual(list(dictionary.matches), ["-AT", "T-"])
+
+    def test_filter_by_rack(self):
+        """Test that only words whose open squares the rack can fill are kept, blanks filling any letter."""
+        words = self.index.search_with_pattern("-A-")
+        self.assertEqual(filter_by_rack("-A-", words, Counter("BT")), ["BAT", "TAB"])
+        self.assertEqual(filter_by_rack("-A-", words, Counter("T")), [])
+        self.assertEqual(filter_by_rack("-A-", words, Counter("T?")), ["BAT", "CAT", "TAB", "TAT"])
+        self.assertEqual(filter_by_rack("CAT", ["CAT"], Counter()), ["CAT"])
+
+    def test_dictionary_search_with_rack(self):
+        """Test that every backend finds the same placeable words as the rack-pruned DAWG descent."""
+        for backend in PatternBackend:
+            dictionary = Dictionary(pattern_backend=backend)
+            for word in WORDS:
+                dictionary.insert(word)
+
+            for pattern in itertools.product("-ABCST", repeat=3):
+                pattern = "".join(pattern)
+                for letters in ("BT", "TT?", "?", "SCAT"):
+                    expected = self.dawg.search_with_rack(pattern, Counter(letters))
+                    self.assertEqual(dictionary.search_with_rack(pattern, letters), expected, (backend, pattern))
+
+
+if __name__ == "__main__":
+    unittest.main()
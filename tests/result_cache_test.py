@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+import unittest
+from board import Board
+from cell import Cell
+from fixtures import make_cat_board, make_dictionary
+from game import Game, GenerationMode, moves_from_json, moves_to_json
+from rack import Rack
+from result_cache import ResultCache
+from tile import Tile
+from word import Word
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        """Set up a cache file, a board with CAT in the middle and its moves."""
+        self.dictionary = make_dictionary()
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = os.path.join(self.temp_dir.name, "results.sqlite")
+        self.cache = ResultCache(self.dictionary, self.path)
+        self.addCleanup(self.cache.close)
+
+        self.board = make_cat_board()
+        self.rack = Rack([Tile("B", 4), Tile("A", 1), Tile("S", 1)])
+        self.moves = Game(self.dictionary, self.board, self.rack).get_scored_possible_words()
+
+    def test_moves_round_trip(self):
+        """Test that stored moves are read back as the same moves, from another connection too."""
+        key = self.cache.get_key(self.board, self.rack, GenerationMode.PATTERN)
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, moves_to_json(self.moves))
+
+        self.assertEqual(moves_from_json(self.cache.get(key)), self.moves)
+        other_cache = ResultCache(self.dictionary, self.path)
+        self.addCleanup(other_cache.close)
+        self.assertEqual(other_cache.get(key, 2), moves_to_json(self.moves[:2]))
+
+    def test_key(self):
+        """Test that the key ignores the rack order but not the tiles, board or generator."""
+        key = self.cache.get_key(self.board, self.rack, GenerationMode.PATTERN)
+        shuffled_rack = Rack(list(reversed(self.rack.tiles)))
+        self.assertEqual(self.cache.get_key(self.board, shuffled_rack, GenerationMode.PATTERN), key)
+        self.assertNotEqual(self.cache.get_key(self.board, self.rack, GenerationMode.ANCHOR), key)
+        self.assertNotEqual(self.cache.get_key(self.board, Rack(self.rack.tiles[:2]), GenerationMode.PATTERN), key)
+
+        board = Board.from_json([[cell.to_json() for cell in row] for row in self.board.cells])
+        self.assertEqual(self.cache.get_key(board, self.rack, GenerationMode.PATTERN), key)
+        board.add_word(Word([Cell(7, 10, Tile("S", 1))]))
+        self.assertNotEqual(self.cache.get_key(board, self.rack, GenerationMode.PATTERN), key)
+
+    def test_truncated_moves(self):
+        """Test that a stored top count only answers requests for as many moves or fewer."""
+        key = self.cache.get_key(self.board, self.rack, GenerationMode.PATTERN)
+        self.cache.put(key, moves_to_json(self.moves[:3]), 3)
+        self.assertEqual(self.cache.get(key, 3), moves_to_json(self.moves[:3]))
+        self.assertIsNone(self.cache.get(key, 4))
+        self.assertIsNone(self.cache.get(key))
+
+        self.cache.put(key, moves_to_json(self.moves), len(self.moves) + 5)
+        self.assertEqual(self.cache.get(key, len(self.moves) + 10), moves_to_json(self.moves))
+
+    def test_eviction(self):
+        """Test that the least recently used entries are evicted beyond the size limit."""
+        moves = moves_to_json(self.moves[:1])
+        self.cache.max_size = 2 * len(json.dumps(moves, separators=(",", ":")))
+        self.cache.put("first", moves)
+
+        self.cache.put("second", moves)
+        self.assertIsNotNone(self.cache.get("first"))
+        self.cache.put("third", moves)
+        self.assertIsNone(self.cache.get("second"))
+        self.assertIsNotNone(self.cache.get("first"))
+        self.assertIsNotNone(self.cache.get("third"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from board import BoardEncoder
+from cell import Cell
+from fixtures import make_cat_board, make_dictionary, make_empty_board
+from game import Game, GenerationMode, moves_to_json
+from parallel_solver import create_executor
+from rack import Rack
+from result_cache import ResultCache
+from service import SolveService
+from tile import Tile
+from word import Word
+
+
+class TestSolveService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """Set up a service with one solve worker and a board with CAT in the middle."""
+        self.dictionary = make_dictionary()
+
+        self.executor = create_executor(self.dictionary, 1)
+        self.addCleanup(self.executor.shutdown)
+        self.service = SolveService(self.executor)
+
+        self.board = make_cat_board()
+        self.rack = Rack([Tile("B", 4), Tile("A", 1), Tile("S", 1)])
+        self.request = {
+            "board": json.loads(json.dumps(self.board.cells, cls=BoardEncoder)),
+            "rack": [tile.to_json() for tile in self.rack.tiles],
+        }
+
+    async def asyncSetUp(self):
+        """Start the service on a free port."""
+        self.server = await asyncio.start_server(self.service.handle_connection, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        """Stop the service."""
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def fetch(self, method, target, body=b""):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(f"{method} {target} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode())
+        writer.write(body)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+
+        head, _, content = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(content)
+
+    async def test_solve(self):
+        """Test that a board and rack are solved like the serial solver."""
+        for mode in GenerationMode:
+            status, response = await self.fetch(
+                "POST", f"/solve?generator={mode.name.lower()}&count=3", json.dumps(self.request).encode()
+            )
+            moves = Game(self.dictionary, self.board, self.rack, mode).get_scored_possible_words()
+            self.assertEqual(status, 200)
+            self.assertEqual(response["moves"], moves_to_json(moves[:3]))
+            self.assertTrue(response["exhaustive"])
+
+    async def test_solve_with_budget(self):
+        """Test that a generous budget finds the best moves and an expired one reports a partial search."""
+        body = json.dumps(self.request).encode()
+        moves = Game(self.dictionary, self.board, self.rack).get_scored_possible_words()
+        status, response = await self.fetch("POST", "/solve?budget=60000&count=3", body)
+        self.assertEqual(status, 200)
+        self.assertEqual(response["moves"], moves_to_json(moves[:3]))
+        self.assertTrue(response["exhaustive"])
+
+        status, response = await self.fetch("POST", "/solve?budget=0", body)
+        self.assertEqual(status, 200)
+        self.assertFalse(response["exhaustive"])
+        self.assertEqual((await self.fetch("POST", "/solve?budget=soon", body))[0], 400)
+
+    async def test_budget_counts_queueing(self):
+        """Test that the budget runs from the request's arrival, so time spent waiting for a busy worker counts."""
+        busy = self.executor.submit(time.sleep, 0.5)
+        status, response = await self.fetch("POST", "/solve?budget=50", json.dumps(self.request).encode())
+        self.assertTrue(busy.done())
+        self.assertEqual(status, 200)
+        self.assertEqual(response["moves"], [])
+        self.assertFalse(response["exhaustive"])
+
+    async def test_cached_solve(self):
+        """Test that a solved position is answered from the result cache, whatever the rack order."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.service.cache = ResultCache(self.dictionary, os.path.join(temp_dir.name, "results.sqlite"))
+        self.addCleanup(self.service.cache.close)
+
+        status, response = await self.fetch("POST", "/solve", json.dumps(self.request).encode())
+        self.assertEqual(status, 200)
+        self.assertFalse(response["cached"])
+
+        shuffled_request = dict(self.request, rack=list(reversed(self.request["rack"])))
+        status, cached_response = await self.fetch("POST", "/solve?count=2", json.dumps(shuffled_request).encode())
+        self.assertEqual(status, 200)
+        self.assertTrue(cached_response["cached"])
+        self.assertEqual(cached_response["moves"], response["moves"][:2])
+
+    async def test_locked_cache(self):
+        """Test that a result cache locked by another process does not block other requests and counts as a miss."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        path = os.path.join(temp_dir.name, "results.sqlite")
+        self.service.cache = ResultCache(self.dictionary, path, timeout=0.5)
+        self.addCleanup(self.service.cache.close)
+        other = sqlite3.connect(path, isolation_level=None)
+        self.addCleanup(other.close)
+        other.execute("BEGIN EXCLUSIVE")
+
+        with self.assertLogs(level="WARNING"):
+            solve = asyncio.ensure_future(self.fetch("POST", "/solve", json.dumps(self.request).encode()))
+            await asyncio.sleep(0.1)
+            start = time.monotonic()
+            self.assertEqual((await self.fetch("GET", "/health"))[0], 200)
+            self.assertLess(time.monotonic() - start, 0.3)
+            status, response = await solve
+        self.assertEqual(status, 200)
+        self.assertFalse(response["cached"])
+        self.assertEqual(len(response["moves"]), 10)
+        other.execute("ROLLBACK")
+
+    async def test_concurrent_requests(self):
+        """Test that concurrent requests are all answered."""
+        body = json.dumps(self.request).encode()
+        responses = await asyncio.gather(*(self.fetch("POST", "/solve", body) for _ in range(5)))
+        self.assertEqual([status for status, _ in responses], [200] * 5)
+
+    async def test_errors(self):
+        """Test that bad requests get error statuses without stopping the service."""
+        invalid_board = make_empty_board()
+        invalid_board.add_word(Word([Cell(7, 7, Tile("X", 8)), Cell(7, 8, Tile("Q", 10))]))
+        invalid_request = dict(self.request, board=json.loads(json.dumps(invalid_board.cells, cls=BoardEncoder)))
+
+        self.assertEqual((await self.fetch("POST", "/solve", b"not json"))[0], 400)
+        self.assertEqual(
+            (await self.fetch("POST", "/solve?generator=magic", json.dumps(self.request).encode()))[0], 400
+        )
+        self.assertEqual((await self.fetch("POST", "/solve", json.dumps(invalid_request).encode()))[0], 422)
+        self.assertEqual((await self.fetch("POST", "/solve/screenshot", b"not an image"))[0], 422)
+        self.assertEqual((await self.fetch("GET", "/missing"))[0], 404)
+        self.assertEqual((await self.fetch("GET", "/health"))[0], 200)
+
+    async def test_metrics(self):
+        """Test that request counts, errors and latencies are reported per route."""
+        await self.fetch("POST", "/solve", json.dumps(self.request).encode())
+        await self.fetch("POST", "/solve", b"not json")
+
+        status, metrics = await self.fetch("GET", "/metrics")
+        self.assertEqual(status, 200)
+        solve = metrics["routes"]["POST /solve"]
+        self.assertEqual(solve["count"], 2)
+        self.assertEqual(solve["errors"], 1)
+        self.assertGreater(solve["max_ms"], 0)
+        self.assertLessEqual(solve["p50_ms"], solve["max_ms"])
+        self.assertEqual(metrics["in_flight"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+
+from fixtures import make_tile
+from tile_cache import TileCache
+
+
+class TestTileCache(unittest.TestCase):
+    def setUp(self):
+        """Set up a tile cache file."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = os.path.join(self.temp_dir.name, "tiles.sqlite")
+        self.cache = TileCache(self.path)
+        self.addCleanup(self.cache.close)
+
+    def test_tiles_round_trip(self):
+        """Test that stored tiles are read back, from another connection too, and others are missing."""
+        key_a, key_b = self.cache.get_key(make_tile("A")), self.cache.get_key(make_tile("B"))
+        self.assertEqual(self.cache.get_many([key_a, key_b]), {})
+        self.cache.put_many({key_a: ("A", 1)})
+
+        self.assertEqual(self.cache.get_many([key_a, key_b]), {key_a: ("A", 1)})
+        other_cache = TileCache(self.path)
+        self.addCleanup(other_cache.close)
+        self.assertEqual(other_cache.get_many([key_a]), {key_a: ("A", 1)})
+
+    def test_key(self):
+        """Test that the key depends on the tile's image, the OCR model and the parse method."""
+        key = self.cache.get_key(make_tile("A"))
+        self.assertEqual(self.cache.get_key(make_tile("A")), key)
+        self.assertNotEqual(self.cache.get_key(make_tile("R")), key)
+        self.assertNotEqual(self.cache.get_key(make_tile("A"), "words-with-cheaters"), key)
+        self.assertNotEqual(self.cache.get_key(make_tile("A"), method="libtesseract"), key)
+
+    def test_eviction(self):
+        """Test that the least recently used tiles are evicted beyond the entry limit."""
+        self.cache.max_entries = 2
+        self.cache.put_many({"first": ("A", 1)})
+        self.cache.put_many({"second": ("B", 4)})
+        self.assertIn("first", self.cache.get_many(["first"]))
+        self.cache.put_many({"third": ("C", 4)})
+        self.assertEqual(set(self.cache.get_many(["first", "second", "third"])), {"first", "third"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from sqlite_lru import SqliteLru
+
+TILE_CACHE_FILE = "tiles.sqlite"
+MAX_TILE_CACHE_ENTRIES = 100_000
+TILE_HASH_SIZE = 32
+
+CV2Image = cv2.typing.MatLike
+
+
+def get_tile_hash(tile_image: CV2Image) -> str:
+    """Returns a difference hash of a tile: whether each pixel of its downsampled grayscale image
+    is brighter than the next one along its row, so identical looking tiles share a hash."""
+    if len(tile_image.shape) == 3:
+        tile_image = cv2.cvtColor(tile_image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(tile_image, (TILE_HASH_SIZE + 1, TILE_HASH_SIZE), interpolation=cv2.INTER_AREA)
+    return np.packbits(small[:, 1:] > small[:, :-1]).tobytes().hex()
+
+
+class TileCache(SqliteLru):
+    """Parsed tiles in an SQLite file.
+
+    Entries hold the letter and score of a tile, keyed by the hash of its image, the OCR
+    model and the method that read it. Beyond max_entries, the least recently used entries
+    are evicted.
+    """
+
+    def __init__(self, path: str = TILE_CACHE_FILE, max_entries: int = MAX_TILE_CACHE_ENTRIES):
+        super().__init__(path, "tiles", "letter TEXT NOT NULL, score INTEGER NOT NULL")
+        self.max_entries = max_entries
+
+    def get_key(self, tile_image: CV2Image, model: Optional[str] = None, method: str = "") -> str:
+        """Returns the key of a tile read with a model, by a parse method such as Parser.get_parse_method's."""
+        return f"{model or ''}:{method}:{get_tile_hash(tile_image)}"
+
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[str, int]]:
+        """Returns the letter and score of the tiles that are stored, by key."""
+        rows = self.select("letter, score", keys)
+        self.touch([key for key, _, _ in rows])
+        return {key: (letter, score) for key, letter, score in rows}
+
+    def put_many(self, tiles: Dict[str, Tuple[str, int]]) -> None:
+        """Stores the letter and score of tiles by key, then evicts to the entry limit."""
+        self.insert("letter, score", [(key, letter, score) for key, (letter, score) in tiles.items()], self.max_entries)